@@ -1,5 +1,6 @@
 """Global settings for Stormtrooper Voice Assistant."""
 
+import os
 from pathlib import Path
 from typing import Dict, Any
 from loguru import logger
@@ -20,6 +21,9 @@ class Settings:
         self.aws_profile = "trooper"
         self.aws_region = "us-east-1"
         
+        # Speech synthesis backend, 'polly' or 'local' for offline use
+        self.tts_backend = os.getenv("TROOPER_TTS_BACKEND", "polly")
+        
         # Audio settings
         self.sample_rate = 44100
         self.channels = 1
@@ -49,6 +53,7 @@ class Settings:
             "audio_responses_dir": str(self.audio_responses_dir),
             "aws_profile": self.aws_profile,
             "aws_region": self.aws_region,
+            "tts_backend": self.tts_backend,
             "sample_rate": self.sample_rate,
             "channels": self.channels,
         } 
\ No newline at end of file
@@ -5,6 +5,7 @@ import time
 from loguru import logger
 
 from src.audio.realtime import RealtimeStormtrooperTTS
+from src.audio.scheduler import RequestState
 from src.quotes import UrgencyLevel
 
 async def demo_basic_speech(tts: RealtimeStormtrooperTTS):
@@ -48,9 +49,8 @@ async def demo_interruption(tts: RealtimeStormtrooperTTS):
     logger.info("Interrupting with alert...")
     await tts.speak("Alert! Intruder detected!", UrgencyLevel.HIGH, context='alert')
     
-    try:
-        await task
-    except asyncio.CancelledError:
+    request = await task
+    if request is not None and request.state == RequestState.PREEMPTED:
         logger.info("Previous speech was interrupted as expected")
 
 async def main():
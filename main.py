@@ -4,7 +4,7 @@
 import os
 import sys
 import time
-import uuid
+from functools import cached_property
 from pathlib import Path
 import click
 from loguru import logger
@@ -20,38 +20,75 @@ logger.add("logs/trooper.log", rotation="1 day", retention="7 days", level="DEBU
 
 # Import project modules
 from src.ai.response_generator import ResponseGenerator
-from src.ai.polly_client import PollyClient
+from src.audio.tts import TTSBackend, get_tts_backend
+from src.aws import get_client_registry
 from src.ai.lex_client import LexClient
 from src.audio.player import AudioPlayer
 from src.audio.recorder import AudioRecorder
-from src.audio.effects import AudioEffects
+from src.audio.processor import process_and_play_text
 from src.motion.pir_handler import PIRHandler
 from src.movement.servo_controller import ServoController
 from config.settings import Settings
 from config.audio_effects import AudioEffectsConfig
 
 class TrooperAssistant:
-    """Main Stormtrooper Voice Assistant class."""
+    """Main Stormtrooper Voice Assistant class.
+    
+    Components are created on first use, so a command only pays for what it
+    touches: centering the head never builds AWS clients or opens the
+    audio device.
+    """
     
     def __init__(self):
         """Initialize the assistant."""
         # Load settings
         self.settings = Settings()
-        
-        # Initialize components
-        self.response_gen = ResponseGenerator()
-        self.polly = PollyClient()
-        self.lex = LexClient(
+        logger.info("Initialized Trooper Assistant")
+    
+    @cached_property
+    def response_gen(self) -> ResponseGenerator:
+        """Response generator."""
+        return ResponseGenerator()
+    
+    @cached_property
+    def polly(self) -> TTSBackend:
+        """Speech synthesis backend from settings, normally the shared Polly client."""
+        return get_tts_backend(self.settings.tts_backend)
+    
+    @cached_property
+    def lex(self) -> LexClient:
+        """Lex client, sharing the process-wide AWS client."""
+        return LexClient(
             bot_id=os.getenv('LEX_BOT_ID', ''),
             bot_alias_id=os.getenv('LEX_BOT_ALIAS_ID', '')
         )
-        self.player = AudioPlayer()
-        self.recorder = AudioRecorder()
-        self.effects = AudioEffects()
-        self.pir = PIRHandler(callback=self.handle_motion)
-        self.servo = ServoController()
-        
-        logger.info("Initialized Trooper Assistant")
+    
+    @cached_property
+    def player(self) -> AudioPlayer:
+        """Audio player."""
+        return AudioPlayer()
+    
+    @cached_property
+    def recorder(self) -> AudioRecorder:
+        """Audio recorder."""
+        return AudioRecorder()
+    
+    @cached_property
+    def pir(self) -> PIRHandler:
+        """Motion sensor handler."""
+        return PIRHandler(callback=self.handle_motion)
+    
+    @cached_property
+    def servo(self) -> ServoController:
+        """Head servo controller."""
+        return ServoController()
+    
+    def prewarm(self) -> None:
+        """Create the AWS clients in the background before they are needed."""
+        services = ['lexv2-runtime']
+        if self.settings.tts_backend == 'polly':
+            services.append('polly')
+        get_client_registry().prewarm(services)
     
     def handle_motion(self):
         """Handle motion detection event."""
@@ -59,22 +96,16 @@ class TrooperAssistant:
         response = self.response_gen.get_random_response()
         logger.info(f"Motion detected - Response: {response}")
         
-        # Generate speech
-        audio_path = self.polly.generate_speech(
-            response,
-            str(self.settings.audio_cache_dir / f"{uuid.uuid4()}.mp3")
-        )
-        
-        # Apply effects
-        processed_path = self.effects.process_file(audio_path)
-        
-        # Play audio
-        self.player.play_file(processed_path)
+        # Generate, process and play speech in memory, repeat phrases come from the Polly cache
+        process_and_play_text(response, polly=self.polly, player=self.player)
     
     def cleanup(self):
         """Clean up resources."""
-        self.pir.cleanup()
-        self.servo.cleanup()
+        # Only clean up components that were created
+        if 'pir' in self.__dict__:
+            self.pir.cleanup()
+        if 'servo' in self.__dict__:
+            self.servo.cleanup()
         logger.info("Cleaned up resources")
 
 @click.group()
@@ -87,6 +118,7 @@ def start():
     """Start the voice assistant."""
     try:
         assistant = TrooperAssistant()
+        assistant.prewarm()
         assistant.pir.start()
         logger.info("Started Trooper Assistant")
         
@@ -110,17 +142,8 @@ def speak(text: str):
     try:
         assistant = TrooperAssistant()
         
-        # Generate speech
-        audio_path = assistant.polly.generate_speech(
-            text,
-            str(assistant.settings.audio_cache_dir / f"{uuid.uuid4()}.mp3")
-        )
-        
-        # Apply effects
-        processed_path = assistant.effects.process_file(audio_path)
-        
-        # Play audio
-        assistant.player.play_file(processed_path)
+        # Generate, process and play speech in memory
+        process_and_play_text(text, polly=assistant.polly, player=assistant.player)
         
     except Exception as e:
         logger.error(f"Failed to generate speech: {str(e)}")
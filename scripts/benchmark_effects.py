@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark the Stormtrooper effect chain engines."""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Callable, List
+import numpy as np
+from loguru import logger
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.audio.chain import RenderContext
+from src.audio.effects import StormtrooperEffect, EffectParams
+from src.audio.resample import resample
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """Time a function, returning the best of several runs.
+
+    Args:
+        func: Function to time
+        repeat: Number of runs
+
+    Returns:
+        Best run time in milliseconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def benchmark_engines(durations: List[float], sample_rate: int, repeat: int) -> None:
+    """Compare the IIR and FFT EQ engines on synthetic clips.
+
+    Args:
+        durations: Clip durations in seconds
+        sample_rate: Sample rate (Hz)
+        repeat: Runs per measurement
+    """
+    rng = np.random.default_rng(0)
+    effects = {
+        engine: StormtrooperEffect(EffectParams(sample_rate=sample_rate, engine=engine))
+        for engine in ("iir", "fft")
+    }
+
+    # Warm up filter designs so only processing is measured
+    for effect in effects.values():
+        effect._apply_voice_eq(np.zeros(sample_rate, dtype=effect.dtype))
+
+    print(f"{'duration':>10} {'iir eq ms':>10} {'fft eq ms':>10} {'speedup':>8} {'iir full ms':>12} {'fft full ms':>12}")
+    for duration in durations:
+        clip = rng.standard_normal(int(duration * sample_rate)).astype(np.float32) * 0.3
+        eq = {name: time_call(lambda e=e, clip=clip: e._apply_voice_eq(clip), repeat) for name, e in effects.items()}
+        full = {name: time_call(lambda e=e, clip=clip: e._process_audio(clip), repeat) for name, e in effects.items()}
+        print(
+            f"{duration:>9.1f}s {eq['iir']:>10.1f} {eq['fft']:>10.1f} "
+            f"{eq['iir'] / eq['fft']:>7.2f}x {full['iir']:>12.1f} {full['fft']:>12.1f}"
+        )
+
+def benchmark_native_rate(durations: List[float], source_rate: int, output_rate: int, repeat: int) -> None:
+    """Compare upsampling before effects with native-rate processing.
+
+    Args:
+        durations: Clip durations in seconds
+        source_rate: Rate of the synthesized voice (Hz)
+        output_rate: Rate of the processed output (Hz)
+        repeat: Runs per measurement
+    """
+    rng = np.random.default_rng(0)
+    upsample_first = StormtrooperEffect(EffectParams(sample_rate=output_rate))
+    native = StormtrooperEffect(EffectParams(sample_rate=source_rate, output_rate=output_rate))
+    warmup = np.zeros(source_rate, dtype=np.float32)
+    warmup[0] = 1.0
+    upsample_first.process_array(resample(warmup, source_rate, output_rate), output_rate)
+    native.process_array(warmup, source_rate)
+
+    print(f"\n{'duration':>10} {'upsample-first ms':>18} {'native ms':>10} {'speedup':>8}")
+    for duration in durations:
+        clip = rng.standard_normal(int(duration * source_rate)).astype(np.float32) * 0.3
+        first = time_call(
+            lambda clip=clip: upsample_first.process_array(resample(clip, source_rate, output_rate), output_rate), repeat
+        )
+        direct = time_call(lambda clip=clip: native.process_array(clip, source_rate), repeat)
+        print(f"{duration:>9.1f}s {first:>18.1f} {direct:>10.1f} {first / direct:>7.2f}x")
+
+def report_stages(duration: float, sample_rate: int, engine: str, trace_memory: bool) -> None:
+    """Print the per-stage effect chain report for one synthetic clip.
+
+    Args:
+        duration: Clip duration in seconds
+        sample_rate: Sample rate (Hz)
+        engine: EQ engine to use
+        trace_memory: Whether to include bytes allocated per stage
+    """
+    effect = StormtrooperEffect(EffectParams(sample_rate=sample_rate, engine=engine))
+    effect.chain.trace_memory = trace_memory
+    clip = np.random.default_rng(0).standard_normal(int(duration * sample_rate)).astype(np.float32) * 0.3
+
+    # Warm up filter designs and the effect bank, then report a clean run
+    effect._process_audio(clip)
+    context = RenderContext(sample_rate)
+    effect._process_audio(clip, context)
+    print(f"\n{engine} engine, {duration:g}s clip at {sample_rate} Hz:")
+    print(context.report.format())
+
+def main():
+    """Run the effect engine benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the Stormtrooper effect chain engines.")
+    parser.add_argument("--durations", type=float, nargs="+", default=[1, 5, 15, 30, 60], help="Clip durations in seconds")
+    parser.add_argument("--sample-rate", type=int, default=44100, help="Sample rate in Hz (default: 44100)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement, best is reported (default: 5)")
+    parser.add_argument("--native", type=int, metavar="RATE",
+                        help="Also compare upsampling before effects with processing at RATE and upsampling once")
+    parser.add_argument("--report", action="store_true", help="Also print a per-stage report for the longest clip")
+    parser.add_argument("--trace-memory", action="store_true", help="Include bytes allocated per stage in the report")
+    args = parser.parse_args()
+
+    logger.remove()
+    benchmark_engines(args.durations, args.sample_rate, args.repeat)
+    if args.native:
+        benchmark_native_rate(args.durations, args.native, args.sample_rate, args.repeat)
+    if args.report:
+        for engine in ("iir", "fft"):
+            report_stages(max(args.durations), args.sample_rate, engine, args.trace_memory)
+
+if __name__ == "__main__":
+    main()
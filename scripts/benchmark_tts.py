@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Benchmark the TTS, effect and playback pipeline, offline by default.
+
+Uses the local TTS backend with a simulated latency and synthesis speed, so
+it runs without AWS. Set --backend polly to measure the real service.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import List
+import numpy as np
+from loguru import logger
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.audio.effects import StormtrooperEffect, EffectParams, effect_seed
+from src.audio.polly_batch import SynthesisRequest
+from src.audio.tts import TTSBackend, create_tts_backend
+
+LINES = [
+    "Stop right there!",
+    "Move along. Move along.",
+    "These aren't the droids we're looking for.",
+    "Halt! Identify yourself.",
+    "Intruder alert! All units to the detention level.",
+    "We have them now. Close the blast doors.",
+]
+
+def to_float(pcm: bytes) -> np.ndarray:
+    """Convert 16-bit PCM to float32 samples."""
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+def benchmark_pipeline(backend: TTSBackend, lines: List[str], output_rate: int) -> None:
+    """Time the processor's in-memory and streaming paths without playback.
+
+    Args:
+        backend: TTS backend
+        lines: Lines to synthesize
+        output_rate: Effect output rate (Hz)
+    """
+    effect = StormtrooperEffect(EffectParams(output_rate=output_rate))
+    effect.process_array(to_float(backend.generate_speech("Warm up")), backend.sample_rate)
+
+    print(f"{'line':<32} {'audio s':>8} {'tts ms':>8} {'fx ms':>7} {'whole ms':>9} {'stream ttfa ms':>15} {'stream ms':>10}")
+    for text in lines:
+        # Whole response, then effects, as process_and_play_text does
+        start = time.perf_counter()
+        audio = to_float(backend.generate_speech(text, urgency='medium'))
+        tts_ms = (time.perf_counter() - start) * 1000
+        processed = effect.process_array(audio, backend.sample_rate, seed=effect_seed(text, 'medium'))
+        whole_ms = (time.perf_counter() - start) * 1000
+
+        # Chunks through the block effect, as the streaming path does
+        start = time.perf_counter()
+        stream = effect.stream(backend.sample_rate, seed=effect_seed(text, 'medium'))
+        first_ms = None
+        for _ in stream.process(to_float(pcm) for pcm in backend.generate_speech_stream(text)):
+            if first_ms is None:
+                first_ms = (time.perf_counter() - start) * 1000
+        stream_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"{text[:32]:<32} {len(processed) / output_rate:>8.2f} {tts_ms:>8.1f} {whole_ms - tts_ms:>7.1f} "
+            f"{whole_ms:>9.1f} {first_ms or 0.0:>15.1f} {stream_ms:>10.1f}"
+        )
+
+def benchmark_batch(backend: TTSBackend, count: int, workers: List[int], rate: float) -> None:
+    """Time batch synthesis as the generation scripts run it.
+
+    Args:
+        backend: TTS backend
+        count: Lines per batch
+        workers: Worker counts to compare
+        rate: Maximum requests per second
+    """
+    print(f"\n{'workers':>8} {'lines':>6} {'seconds':>8} {'lines/s':>8} {'failed':>7}")
+    for n in workers:
+        # Unique text per run so a caching backend cannot serve earlier runs
+        requests = [SynthesisRequest(f"{LINES[i % len(LINES)]} Unit {n}-{i}.") for i in range(count)]
+        start = time.perf_counter()
+        results = backend.synthesize_many(requests, max_workers=n, rate=rate)
+        elapsed = time.perf_counter() - start
+        failed = sum(1 for result in results if not result.ok)
+        print(f"{n:>8} {count:>6} {elapsed:>8.2f} {count / elapsed:>8.1f} {failed:>7}")
+
+def benchmark_playback(backend: TTSBackend, lines: List[str]) -> None:
+    """Time the processor and realtime TTS end to end on the audio device.
+
+    Args:
+        backend: TTS backend
+        lines: Lines to speak
+    """
+    from src.audio.processor import process_and_play_text
+    from src.audio.realtime import RealtimeStormtrooperTTS
+
+    print(f"\n{'line':<32} {'processor ms':>13} {'streaming ms':>13} {'realtime ms':>12}")
+    tts = RealtimeStormtrooperTTS(backend=backend)
+    try:
+        for text in lines:
+            start = time.perf_counter()
+            process_and_play_text(text, polly=backend, player=tts.player)
+            whole_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            process_and_play_text(text, polly=backend, player=tts.player, stream=True)
+            stream_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            asyncio.run(tts.speak(text))
+            realtime_ms = (time.perf_counter() - start) * 1000
+            print(f"{text[:32]:<32} {whole_ms:>13.0f} {stream_ms:>13.0f} {realtime_ms:>12.0f}")
+    finally:
+        tts.close()
+
+def main():
+    """Run the TTS pipeline benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the TTS, effect and playback pipeline.")
+    parser.add_argument("--backend", default="local", help="TTS backend, local or polly (default: local)")
+    parser.add_argument("--latency", type=float, default=0.15, help="Local backend latency in seconds (default: 0.15)")
+    parser.add_argument("--speed", type=float, default=20.0,
+                        help="Local backend speed in seconds of audio per second (default: 20)")
+    parser.add_argument("--output-rate", type=int, default=44100, help="Effect output rate in Hz (default: 44100)")
+    parser.add_argument("--batch", type=int, default=24, help="Lines per batch run, 0 to skip (default: 24)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="Batch worker counts (default: 1 4 8)")
+    parser.add_argument("--rate", type=float, default=20.0, help="Batch requests per second (default: 20)")
+    parser.add_argument("--play", action="store_true", help="Also time playback on the audio device")
+    args = parser.parse_args()
+
+    logger.remove()
+    backend = create_tts_backend(args.backend, max_pool_connections=max(10, *args.workers),
+                                 latency=args.latency, speed=args.speed)
+    benchmark_pipeline(backend, LINES, args.output_rate)
+    if args.batch:
+        benchmark_batch(backend, args.batch, args.workers, args.rate)
+    if args.play:
+        benchmark_playback(backend, LINES)
+
+if __name__ == "__main__":
+    main()
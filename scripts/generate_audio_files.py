@@ -1,6 +1,7 @@
 """Script to generate audio file structure for Stormtrooper quotes."""
 
 import sys
+import argparse
 from pathlib import Path
 from typing import List, Dict, Set, Tuple
 from loguru import logger
@@ -11,7 +12,8 @@ if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
 from src.quotes import QuoteManager, Quote
-from src.audio.effects import StormtrooperEffect
+from src.audio.effects import StormtrooperEffect, EffectParams
+from src.audio.render import RenderJob, render_files, resolve_jobs
 from src.audio.utils import generate_filename
 
 def check_directories(root_dir: Path) -> Tuple[List[Path], List[Path]]:
@@ -105,33 +107,31 @@ def check_audio_files(required_files: Dict[Path, Quote]) -> Tuple[Dict[Path, Quo
     
     return existing, missing
 
-def process_audio_files(files_to_process: Dict[Path, Quote], effect: StormtrooperEffect) -> None:
+def process_audio_files(files_to_process: Dict[Path, Quote], effect: StormtrooperEffect, jobs: int = 1) -> None:
     """Process audio files with Stormtrooper effect.
     
     Args:
         files_to_process: Dictionary mapping file paths to quotes
-        effect: StormtrooperEffect instance
+        effect: StormtrooperEffect instance used when rendering in this process
+        jobs: Number of worker processes
     """
+    render_jobs = []
     for filepath, quote in files_to_process.items():
         if filepath.exists():
-            try:
-                # Process the file with appropriate urgency
-                processed_file = effect.process_file(
-                    filepath,
-                    urgency=quote.urgency
-                )
-                logger.info(f"Processed: {filepath.name} -> {Path(processed_file).name}")
-            except Exception as e:
-                logger.error(f"Failed to process {filepath.name}: {str(e)}")
+            # Process the file with appropriate urgency
+            render_jobs.append(RenderJob(filepath, urgency=quote.urgency))
         else:
             logger.warning(f"Cannot process missing file: {filepath.name}")
+            
+    render_files(render_jobs, n_jobs=jobs, params=effect.params, effect=effect)
 
-def generate_audio_files(root_dir: Path, dry_run: bool = False) -> None:
+def generate_audio_files(root_dir: Path, dry_run: bool = False, jobs: int = 1) -> None:
     """Generate audio file structure.
     
     Args:
         root_dir: Project root directory
         dry_run: If True, only check what needs to be done without making changes
+        jobs: Number of worker processes for effect rendering
     """
     # Check directory structure
     existing_dirs, missing_dirs = check_directories(root_dir)
@@ -139,7 +139,8 @@ def generate_audio_files(root_dir: Path, dry_run: bool = False) -> None:
     # Initialize components
     quotes_file = root_dir / "config" / "quotes.yaml"
     quote_manager = QuoteManager(quotes_file)
-    effect = StormtrooperEffect()
+    # Voice stages run at the raw file rate, output is upsampled once to 44.1kHz
+    effect = StormtrooperEffect(EffectParams(output_rate=44100))
     
     # Get required files
     required_files = get_required_files(quote_manager, root_dir)
@@ -159,7 +160,7 @@ def generate_audio_files(root_dir: Path, dry_run: bool = False) -> None:
     # Process existing files
     if existing_files:
         logger.info(f"Processing {len(existing_files)} existing audio files")
-        process_audio_files(existing_files, effect)
+        process_audio_files(existing_files, effect, jobs)
     
     # Report missing files that need to be created
     if missing_files:
@@ -175,6 +176,10 @@ def generate_audio_files(root_dir: Path, dry_run: bool = False) -> None:
 
 def main():
     """Run the audio file generation script."""
+    parser = argparse.ArgumentParser(description="Generate audio file structure for Stormtrooper quotes.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of worker processes (0 uses all CPU cores, default: 1)")
+    args = parser.parse_args()
+    
     # First do a dry run to check what exists
     logger.info("Performing dry run to check existing files...")
     generate_audio_files(project_root, dry_run=True)
@@ -183,7 +188,7 @@ def main():
     response = input("\nWould you like to process the existing audio files? [y/N] ")
     if response.lower() == 'y':
         logger.info("Processing audio files...")
-        generate_audio_files(project_root, dry_run=False)
+        generate_audio_files(project_root, dry_run=False, jobs=resolve_jobs(args.jobs))
     else:
         logger.info("No changes made.")
 
@@ -5,7 +5,6 @@ from pathlib import Path
 from typing import Dict, List
 import numpy as np
 import numpy.typing as npt
-from scipy import signal
 import soundfile as sf
 from loguru import logger
 
@@ -15,18 +14,22 @@ if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
 from src.quotes import QuoteManager, Quote
-from src.audio.polly import PollyClient
+from src.audio.tts import create_tts_backend
+from src.audio.polly_batch import SynthesisRequest, SynthesisResult
 from src.audio.utils import generate_filename
 
-def resample_to_44100(data: bytes, src_rate: int = 16000) -> npt.NDArray[np.float32]:
-    """Resample PCM audio data to 44.1kHz.
+# Polly's native PCM rate. Raw files stay at this rate, effects processing
+# upsamples once after the voice stages (see EffectParams.output_rate)
+POLLY_RATE = 16000
+
+def pcm_to_float(data: bytes) -> npt.NDArray[np.float32]:
+    """Convert Polly PCM audio data to float samples.
     
     Args:
-        data: Raw PCM audio data
-        src_rate: Source sample rate
+        data: Raw 16-bit PCM audio data
         
     Returns:
-        Resampled audio data as float32 array normalized between -1 and 1
+        Audio data as float32 array normalized between -1 and 1
     """
     # Ensure data length is multiple of 2 (int16)
     if len(data) % 2 != 0:
@@ -35,28 +38,24 @@ def resample_to_44100(data: bytes, src_rate: int = 16000) -> npt.NDArray[np.floa
     
     # Convert PCM bytes to float32 array
     samples = np.frombuffer(data, dtype=np.int16)
-    audio = samples.astype(np.float32) / 32768.0
-    
-    # Calculate resampling parameters
-    src_samples = len(audio)
-    dst_rate = 44100
-    dst_samples = int(src_samples * float(dst_rate) / float(src_rate))
-    
-    # Resample audio
-    resampled = np.array(signal.resample(audio, dst_samples), dtype=np.float32)
-    
-    return resampled
+    return samples.astype(np.float32) / 32768.0
 
-def generate_polly_files(quotes_file: Path, output_dir: Path) -> None:
+def generate_polly_files(quotes_file: Path, output_dir: Path, workers: int = 4, rate: float = 5.0) -> None:
     """Generate missing audio files using AWS Polly.
     
+    Missing files are synthesized concurrently. Each file is written as soon
+    as its audio arrives and responses are cached, so an interrupted run
+    picks up where it left off.
+    
     Args:
         quotes_file: Path to quotes YAML file
         output_dir: Directory to save audio files
+        workers: Concurrent Polly requests
+        rate: Maximum Polly requests per second
     """
     # Initialize components
     quote_manager = QuoteManager(quotes_file)
-    polly = PollyClient()
+    polly = create_tts_backend(max_pool_connections=max(10, workers))
     
     # Group quotes by category and context
     quote_groups = {}
@@ -66,12 +65,12 @@ def generate_polly_files(quotes_file: Path, output_dir: Path) -> None:
             quote_groups[key] = []
         quote_groups[key].append(quote)
     
-    # Generate audio for each quote
+    # Collect the quotes without audio
     total_quotes = len(quote_manager.quotes)
-    generated = 0
     skipped = 0
+    requests: List[SynthesisRequest] = []
     
-    logger.info(f"Generating {total_quotes} audio files at 44.1kHz...")
+    logger.info(f"Generating {total_quotes} audio files at {POLLY_RATE // 1000}kHz...")
     
     for _, quotes in quote_groups.items():
         for i, quote in enumerate(quotes):
@@ -85,25 +84,24 @@ def generate_polly_files(quotes_file: Path, output_dir: Path) -> None:
                 skipped += 1
                 continue
             
-            try:
-                # Generate audio with Polly at 16kHz
-                logger.info(f"Generating audio for: {quote.text}")
-                pcm_data = polly.generate_speech(quote.text)
-                
-                # Ensure we got bytes and not a file path
-                if isinstance(pcm_data, str):
-                    logger.error(f"Unexpected string return from Polly for {filename}")
-                    continue
-                
-                # Resample to 44.1kHz
-                resampled_data = resample_to_44100(pcm_data)
-                
-                # Save as WAV
-                sf.write(str(output_path), resampled_data, 44100, format='WAV', subtype='PCM_16')
-                generated += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to generate audio for {filename}: {str(e)}")
+            requests.append(SynthesisRequest(quote.text, output_path=output_path))
+    
+    generated = 0
+    
+    def save(result: SynthesisResult) -> None:
+        nonlocal generated
+        if not result.ok or result.request.output_path is None:
+            return
+        try:
+            # Save as WAV at the native rate
+            sf.write(str(result.request.output_path), pcm_to_float(result.audio),
+                     POLLY_RATE, format='WAV', subtype='PCM_16')
+            generated += 1
+            logger.info(f"Generated audio for: {result.request.text}")
+        except Exception as e:
+            logger.error(f"Failed to save {result.request.output_path.name}: {str(e)}")
+    
+    polly.synthesize_many(requests, max_workers=workers, rate=rate, on_result=save)
     
     logger.info("Audio generation complete:")
     logger.info(f"- Total quotes: {total_quotes}")
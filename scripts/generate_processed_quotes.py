@@ -4,9 +4,8 @@
 import sys
 import argparse
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import numpy as np
-import soundfile as sf
 from loguru import logger
 
 # Add project root to Python path
@@ -14,9 +13,12 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
-from src.quotes import QuoteManager
-from src.audio.polly import PollyClient
-from src.audio.effects import StormtrooperEffect, EffectParams
+from src.quotes import QuoteManager, Quote
+from src.audio.tts import create_tts_backend
+from src.audio.polly_batch import SynthesisRequest, SynthesisResult
+from src.audio.effects import StormtrooperEffect, EffectParams, effect_seed
+from src.audio.render import RenderJob, render_files, resolve_jobs
+from src.audio.utils import write_audio_atomic
 
 def setup_directories(clean: bool = False) -> tuple[Path, Path]:
     """Create and verify required directories exist.
@@ -46,13 +48,22 @@ def setup_directories(clean: bool = False) -> tuple[Path, Path]:
     
     return polly_raw_dir, processed_dir
 
-def generate_processed_quotes(quotes_file: Optional[Path] = None, clean: bool = False) -> None:
+def generate_processed_quotes(
+    quotes_file: Optional[Path] = None,
+    clean: bool = False,
+    jobs: int = 1,
+    polly_workers: int = 4,
+    polly_rate: float = 5.0
+) -> None:
     """Generate processed audio files for all quotes.
     
     Args:
         quotes_file: Optional path to quotes YAML file. If not provided,
                     uses default config/quotes.yaml
         clean: If True, delete all existing files before processing
+        jobs: Number of worker processes for effect rendering
+        polly_workers: Concurrent Polly requests
+        polly_rate: Maximum Polly requests per second
     """
     # Setup
     quotes_file = quotes_file or (project_root / "config" / "quotes.yaml")
@@ -60,8 +71,8 @@ def generate_processed_quotes(quotes_file: Optional[Path] = None, clean: bool =
     
     # Initialize components
     quote_manager = QuoteManager(quotes_file)
-    polly = PollyClient()
-    effect = StormtrooperEffect()
+    polly = create_tts_backend(max_pool_connections=max(10, polly_workers))
+    effect = StormtrooperEffect(EffectParams(output_rate=44100))  # Raw audio is 16 kHz, the library 44.1 kHz
     
     total_quotes = len(quote_manager.quotes)
     generated = 0
@@ -70,6 +81,13 @@ def generate_processed_quotes(quotes_file: Optional[Path] = None, clean: bool =
     
     logger.info(f"Processing {total_quotes} quotes...")
     
+    # Raw files waiting for effects, processed together after generation
+    pending = []
+    
+    # Quotes without raw audio, synthesized together
+    requests: List[SynthesisRequest] = []
+    targets: Dict[Path, Tuple[Path, Quote]] = {}
+    
     # Process each quote
     for quote in quote_manager.quotes:
         try:
@@ -89,37 +107,14 @@ def generate_processed_quotes(quotes_file: Optional[Path] = None, clean: bool =
                     skipped += 1
                     continue
             
-            # Generate raw audio if needed
+            # Generate raw audio if needed, in one concurrent batch below
             if not raw_path.exists():
-                logger.info(f"Generating audio for: {quote.text}")
-                pcm_data = polly.generate_speech(
-                    text=quote.text,
-                    urgency=quote.urgency.value,
-                    context=quote.context
-                )
-                
-                # Ensure we have bytes data
-                if isinstance(pcm_data, str):
-                    logger.error(f"Unexpected string return from Polly for {quote.text}")
-                    failed += 1
-                    continue
-                
-                # Convert PCM bytes to float32 array
-                audio_data = np.frombuffer(pcm_data, dtype=np.int16)
-                audio_float = audio_data.astype(np.float32) / 32768.0
-                
-                # Save as WAV
-                sf.write(str(raw_path), audio_float, 16000, format='WAV', subtype='FLOAT')
-            
-            # Apply effects
-            logger.info(f"Applying effects to: {raw_path.name}")
-            effect.process_file(
-                str(raw_path),
-                str(processed_path),
-                urgency=quote.urgency
-            )
+                requests.append(SynthesisRequest(quote.text, quote.urgency.value, quote.context, raw_path))
+                targets[raw_path] = (processed_path, quote)
+                continue
             
-            generated += 1
+            # Queue for effects
+            pending.append((raw_path, processed_path, quote))
             
         except Exception as e:
             logger.error(f"Failed to process quote: {quote.text}")
@@ -127,6 +122,49 @@ def generate_processed_quotes(quotes_file: Optional[Path] = None, clean: bool =
             failed += 1
             continue
     
+    def save_raw(result: SynthesisResult) -> None:
+        nonlocal failed
+        raw_path = result.request.output_path
+        processed_path, quote = targets[raw_path]
+        if not result.ok:
+            failed += 1
+            return
+        try:
+            # Convert PCM bytes to float32 array
+            audio_data = np.frombuffer(result.audio[:len(result.audio) // 2 * 2], dtype=np.int16)
+            audio_float = audio_data.astype(np.float32) / 32768.0
+            
+            # Save as WAV
+            write_audio_atomic(raw_path, audio_float, 16000, subtype='FLOAT')
+            pending.append((raw_path, processed_path, quote))
+        except Exception as e:
+            logger.error(f"Failed to save audio for: {quote.text}")
+            logger.error(f"Error: {str(e)}")
+            failed += 1
+    
+    if requests:
+        logger.info(f"Generating audio for {len(requests)} quotes...")
+        polly.synthesize_many(requests, max_workers=polly_workers, rate=polly_rate, on_result=save_raw)
+    
+    # Apply effects to all queued files
+    if pending:
+        logger.info(f"Applying effects to {len(pending)} files...")
+        results = render_files(
+            [
+                RenderJob(raw_path, processed_path, quote.urgency, effect_seed(quote.text, quote.urgency))
+                for raw_path, processed_path, quote in pending
+            ],
+            n_jobs=jobs,
+            params=effect.params,
+            effect=effect
+        )
+        for (_, _, quote), result in zip(pending, results):
+            if not result.ok:
+                logger.error(f"Failed to process quote: {quote.text}")
+                failed += 1
+            else:
+                generated += 1
+    
     # Summary
     logger.info("\nProcessing complete:")
     logger.info(f"Total quotes: {total_quotes}")
@@ -139,12 +177,18 @@ def main():
     parser = argparse.ArgumentParser(description="Generate processed Stormtrooper voice files from quotes.")
     parser.add_argument("--clean", action="store_true", help="Delete existing files before processing")
     parser.add_argument("--quotes-file", type=Path, help="Path to quotes YAML file (default: config/quotes.yaml)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of worker processes (0 uses all CPU cores, default: 1)")
+    parser.add_argument("--polly-workers", type=int, default=4, help="Concurrent Polly requests (default: 4)")
+    parser.add_argument("--polly-rate", type=float, default=5.0, help="Maximum Polly requests per second (default: 5)")
     
     args = parser.parse_args()
     
     generate_processed_quotes(
         quotes_file=args.quotes_file,
-        clean=args.clean
+        clean=args.clean,
+        jobs=resolve_jobs(args.jobs),
+        polly_workers=args.polly_workers,
+        polly_rate=args.polly_rate
     )
 
 if __name__ == "__main__":
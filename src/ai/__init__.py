@@ -1,6 +1,6 @@
 """AI and natural language processing functionality."""
 
-from .polly_client import PollyClient
+from .lex_client import LexClient
 from .response_generator import ResponseGenerator
 
-__all__ = ['PollyClient', 'ResponseGenerator'] 
\ No newline at end of file
+__all__ = ['LexClient', 'ResponseGenerator']  
\ No newline at end of file
@@ -2,8 +2,8 @@
 
 import json
 from typing import Dict, Any, Optional, TypedDict
-import boto3
 from loguru import logger
+from src.aws import ClientRegistry, get_client_registry
 
 class SessionState(TypedDict):
     """Type definition for Lex session state."""
@@ -26,8 +26,11 @@ class LexClient:
                  bot_alias_id: str,
                  locale_id: str = 'en_US',
                  profile_name: str = 'trooper',
-                 region_name: str = 'us-east-1'):
-        """Initialize Lex client.
+                 region_name: str = 'us-east-1',
+                 registry: Optional[ClientRegistry] = None):
+        """Initialize Lex client settings.
+        
+        The AWS client is taken from the shared client registry on first use.
         
         Args:
             bot_id: Lex bot ID
@@ -35,23 +38,28 @@ class LexClient:
             locale_id: Locale ID for the bot
             profile_name: AWS profile name
             region_name: AWS region name
+            registry: Optional client registry. Defaults to the process-wide one
         """
-        try:
-            self.session = boto3.Session(
-                profile_name=profile_name,
-                region_name=region_name
-            )
-            self.client = self.session.client('lexv2-runtime')
-            
-            self.bot_id = bot_id
-            self.bot_alias_id = bot_alias_id
-            self.locale_id = locale_id
-            
-            logger.info(f"Initialized Lex client for bot: {bot_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize Lex client: {str(e)}")
-            raise
+        self.bot_id = bot_id
+        self.bot_alias_id = bot_alias_id
+        self.locale_id = locale_id
+        self.profile_name = profile_name
+        self.region_name = region_name
+        self.registry = registry
+        self._client: Optional[Any] = None
+    
+    @property
+    def client(self) -> Any:
+        """AWS Lex runtime client, created or shared on first access."""
+        if self._client is None:
+            try:
+                registry = self.registry or get_client_registry()
+                self._client = registry.client('lexv2-runtime', self.profile_name, self.region_name)
+                logger.info(f"Initialized Lex client for bot: {self.bot_id}")
+            except Exception as e:
+                logger.error(f"Failed to initialize Lex client: {str(e)}")
+                raise
+        return self._client
     
     def process_text(self, 
                     text: str, 
@@ -1,9 +1,16 @@
 """Audio processing and effects."""
 
-from .effects import StormtrooperEffect, EffectParams
-from .polly import PollyClient
+from .effects import StormtrooperEffect, EffectParams, EffectStream, effect_seed
+from .chain import EffectChain, EffectStage, ChainReport, RenderContext
+from .output_cache import OutputCache, get_output_cache
+from .polly import PollyClient, get_polly_client
+from .polly_cache import PollyCache, get_polly_cache
+from .polly_batch import SynthesisRequest, SynthesisResult
+from .tts import TTSBackend, LocalTTSBackend, create_tts_backend, get_tts_backend
 from .utils import generate_filename
+from .device import AudioDevice, get_audio_device
 from .player import AudioPlayer
+from .scheduler import SpeechScheduler, SpeechRequest, EqualPriorityPolicy
 
 class AudioError(Exception):
     """Base exception for audio processing errors."""
@@ -11,8 +18,30 @@ class AudioError(Exception):
 __all__ = [
     'StormtrooperEffect',
     'EffectParams',
+    'EffectStream',
+    'effect_seed',
+    'EffectChain',
+    'EffectStage',
+    'ChainReport',
+    'RenderContext',
+    'OutputCache',
+    'get_output_cache',
     'PollyClient',
+    'get_polly_client',
+    'PollyCache',
+    'get_polly_cache',
+    'SynthesisRequest',
+    'SynthesisResult',
+    'TTSBackend',
+    'LocalTTSBackend',
+    'create_tts_backend',
+    'get_tts_backend',
     'generate_filename',
     'AudioError',
+    'AudioDevice',
+    'get_audio_device',
     'AudioPlayer',
+    'SpeechScheduler',
+    'SpeechRequest',
+    'EqualPriorityPolicy',
 ] 
\ No newline at end of file
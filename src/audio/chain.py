@@ -0,0 +1,430 @@
+"""Composable Stormtrooper effect chain with per-stage instrumentation."""
+
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
+import yaml
+from loguru import logger
+import numpy as np
+
+from src.quotes import UrgencyLevel
+from .resample import resample
+
+if TYPE_CHECKING:
+    from .effects import StormtrooperEffect
+
+# Optional chain configuration, used when present
+DEFAULT_CHAIN_PATH = Path(__file__).parent.parent.parent / "config" / "effect_chain.yaml"
+
+# tracemalloc.reset_peak() is Python 3.9+. Without it a stage's allocation is
+# the net change in traced memory rather than its peak
+_HAS_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+@dataclass
+class StageReport:
+    """Timing and allocation figures for one stage of a chain run."""
+
+    name: str
+    ms: float = 0.0
+    bytes_allocated: Optional[int] = None
+    calls: int = 0
+
+@dataclass
+class ChainReport:
+    """Per-stage report for one call through an effect chain.
+
+    Stages that run more than once in a call, such as per-clip stages in a
+    batch, are accumulated into a single entry.
+    """
+
+    stages: List[StageReport] = field(default_factory=list)
+
+    def add(self, name: str, ms: float, bytes_allocated: Optional[int] = None) -> None:
+        """Record one run of a stage.
+
+        Args:
+            name: Stage name
+            ms: Run time in milliseconds
+            bytes_allocated: Bytes allocated by the stage, if traced
+        """
+        for stage in self.stages:
+            if stage.name == name:
+                break
+        else:
+            stage = StageReport(name)
+            self.stages.append(stage)
+        stage.ms += ms
+        stage.calls += 1
+        if bytes_allocated is not None:
+            stage.bytes_allocated = (stage.bytes_allocated or 0) + bytes_allocated
+
+    @property
+    def total_ms(self) -> float:
+        """Total time spent in all stages."""
+        return sum(stage.ms for stage in self.stages)
+
+    def slowest(self) -> Optional[StageReport]:
+        """Get the stage that took the most time."""
+        return max(self.stages, key=lambda stage: stage.ms, default=None)
+
+    def format(self) -> str:
+        """Format the report as a table with one line per stage."""
+        lines = [f"{'stage':<16} {'ms':>9} {'allocated':>12}"]
+        for stage in self.stages:
+            allocated = "-" if stage.bytes_allocated is None else f"{stage.bytes_allocated / 1024:.1f} KiB"
+            lines.append(f"{stage.name:<16} {stage.ms:>9.2f} {allocated:>12}")
+        lines.append(f"{'total':<16} {self.total_ms:>9.2f}")
+        return "\n".join(lines)
+
+@dataclass
+class RenderContext:
+    """Per-call state threaded through the stages of a chain run.
+
+    Everything that changes from one processing call to the next lives
+    here rather than on the effect or the chain, so concurrent calls on
+    one effect do not see each other's state. Stages that change the
+    sample rate update ``sample_rate`` for the stages after them.
+    """
+
+    sample_rate: int
+    report: ChainReport = field(default_factory=ChainReport)
+    urgency: UrgencyLevel = UrgencyLevel.MEDIUM
+    rng: Optional[np.random.Generator] = None  # Seeded generator for reproducible radio effects
+
+class EffectStage(ABC):
+    """Base class for a single step of the Stormtrooper effect chain.
+
+    Stages delegate to the DSP methods of the StormtrooperEffect they run on,
+    so they always use its parameters, and take the sample rate, urgency and
+    random generator from the call's RenderContext.
+    """
+
+    name = ""
+    batchable = False   # Works on 2-D (clips x samples) arrays along axis=-1
+    per_clip = False    # Must see each clip unpadded before batching
+    in_place = False    # Modifies its input buffer
+
+    def __init__(self, enabled: bool = True):
+        """Initialize the stage.
+
+        Args:
+            enabled: Whether the stage runs
+        """
+        self.enabled = enabled
+
+    @abstractmethod
+    def apply(self, effect: "StormtrooperEffect", data: np.ndarray, context: RenderContext) -> np.ndarray:
+        """Apply the stage to audio data.
+
+        Args:
+            effect: Effect processor providing parameters and filters
+            data: Input audio data
+            context: State of the current processing call
+
+        Returns:
+            Processed audio data
+        """
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(enabled={self.enabled})"
+
+class NormalizeStage(EffectStage):
+    """Normalize the input to full scale."""
+
+    name = "normalize"
+    batchable = True
+    per_clip = True
+
+    def apply(self, effect: "StormtrooperEffect", data: np.ndarray, context: RenderContext) -> np.ndarray:
+        peak = np.max(np.abs(data), axis=-1, keepdims=True) if data.shape[-1] else 0.0
+        return data / np.where(peak > 0, peak, 1)
+
+class EqStage(EffectStage):
+    """Filter Curve EQ, or the fused EQ and resonance with the fft engine."""
+
+    name = "eq"
+    batchable = True
+
+    def apply(self, effect: "StormtrooperEffect", data: np.ndarray, context: RenderContext) -> np.ndarray:
+        if effect.params.engine == "fft":
+            return effect._apply_fused_eq(data, context.sample_rate)
+        return effect._apply_filter_curve_eq(data, context.sample_rate)
+
+class ResonanceStage(EffectStage):
+    """Helmet resonance peaks. Already part of the fused fft EQ."""
+
+    name = "resonance"
+    batchable = True
+
+    def apply(self, effect: "StormtrooperEffect", data: np.ndarray, context: RenderContext) -> np.ndarray:
+        if effect.params.engine == "fft":
+            return data
+        return effect._apply_helmet_resonance(data, context.sample_rate)
+
+class ModulationStage(EffectStage):
+    """Radio amplitude modulation."""
+
+    name = "modulation"
+    batchable = True
+
+    def apply(self, effect: "StormtrooperEffect", data: np.ndarray, context: RenderContext) -> np.ndarray:
+        return effect._apply_radio_modulation(data, context.sample_rate)
+
+class UpsampleStage(EffectStage):
+    """Resample the voice to EffectParams.output_rate, if set.
+
+    The new rate is passed on through the RenderContext, so later stages,
+    including click and static picks, run at it.
+    """
+
+    name = "upsample"
+
+    def apply(self, effect: "StormtrooperEffect", data: np.ndarray, context: RenderContext) -> np.ndarray:
+        target = effect.params.output_rate
+        if not target or target == context.sample_rate:
+            return data
+        data = resample(data, context.sample_rate, target, effect.filter_cache)
+        context.sample_rate = target
+        return data
+
+class RadioEffectsStage(EffectStage):
+    """Mic clicks and static from the effect bank."""
+
+    name = "radio_effects"
+
+    def apply(self, effect: "StormtrooperEffect", data: np.ndarray, context: RenderContext) -> np.ndarray:
+        return effect._add_radio_effects(data, context)
+
+class GainStage(EffectStage):
+    """Output gain boost."""
+
+    name = "gain"
+    batchable = True
+    in_place = True
+
+    def apply(self, effect: "StormtrooperEffect", data: np.ndarray, context: RenderContext) -> np.ndarray:
+        data *= 10 ** (effect.params.output_gain_db / 20)  # Convert dB to linear gain
+        return data
+
+class LimitStage(EffectStage):
+    """Final normalization and clipping."""
+
+    name = "limit"
+    in_place = True
+
+    def apply(self, effect: "StormtrooperEffect", data: np.ndarray, context: RenderContext) -> np.ndarray:
+        peak = np.max(np.abs(data)) if len(data) else 0.0
+        if peak > 0:
+            data /= peak
+        np.clip(data, -1.0, 1.0, out=data)
+        return data
+
+# Available stages by name, in default order
+STAGES: Dict[str, Type[EffectStage]] = {
+    stage.name: stage for stage in [
+        NormalizeStage, EqStage, ResonanceStage, ModulationStage,
+        UpsampleStage, RadioEffectsStage, GainStage, LimitStage,
+    ]
+}
+
+class EffectChain:
+    """Ordered, configurable list of effect stages.
+
+    Every run records per-stage wall time, and optionally the bytes each
+    stage allocated as seen by tracemalloc, in the report of the call's
+    RenderContext. Tracing allocations slows processing down, so it is off
+    by default.
+    """
+
+    def __init__(self, stages: Optional[Sequence[EffectStage]] = None, trace_memory: bool = False):
+        """Initialize the chain.
+
+        Args:
+            stages: Stages in processing order. Defaults to all stages
+            trace_memory: Whether to measure allocations per stage
+        """
+        self.stages: List[EffectStage] = list(stages) if stages is not None else [cls() for cls in STAGES.values()]
+        self.trace_memory = trace_memory
+
+    @classmethod
+    def from_config(cls, config: Union[Dict[str, Any], Sequence[Union[str, Dict[str, Any]]]]) -> "EffectChain":
+        """Build a chain from a configuration mapping.
+
+        The configuration has a ``stages`` list of stage names or mappings
+        with ``name`` and optional ``enabled``, and an optional
+        ``trace_memory`` flag. A bare list is treated as the stage list.
+
+        Args:
+            config: Chain configuration
+
+        Returns:
+            Configured effect chain
+
+        Raises:
+            ValueError: If a stage name is unknown
+        """
+        if not isinstance(config, dict):
+            config = {"stages": config}
+
+        stages = []
+        for entry in config.get("stages") or list(STAGES):
+            if isinstance(entry, str):
+                entry = {"name": entry}
+            name = entry.get("name")
+            if name not in STAGES:
+                raise ValueError(f"Unknown effect stage: {name}")
+            stages.append(STAGES[name](enabled=bool(entry.get("enabled", True))))
+        return cls(stages, trace_memory=bool(config.get("trace_memory", False)))
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path]) -> "EffectChain":
+        """Build a chain from a YAML configuration file.
+
+        Args:
+            path: Path to the YAML file
+
+        Returns:
+            Configured effect chain
+        """
+        with open(path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+        logger.debug(f"Loaded effect chain from: {path}")
+        return cls.from_config(config)
+
+    @classmethod
+    def load_default(cls) -> "EffectChain":
+        """Build the chain from config/effect_chain.yaml, or all stages if absent."""
+        if DEFAULT_CHAIN_PATH.exists():
+            return cls.from_yaml(DEFAULT_CHAIN_PATH)
+        return cls()
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the enabled stages, in order."""
+        return [stage.name for stage in self.stages if stage.enabled]
+
+    def stage(self, name: str) -> EffectStage:
+        """Get a stage by name.
+
+        Raises:
+            KeyError: If the chain has no such stage
+        """
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    def enable(self, name: str, enabled: bool = True) -> None:
+        """Enable or disable a stage by name."""
+        self.stage(name).enabled = enabled
+
+    def disable(self, name: str) -> None:
+        """Disable a stage by name."""
+        self.enable(name, False)
+
+    def move(self, name: str, index: int) -> None:
+        """Move a stage to a new position in the chain."""
+        stage = self.stage(name)
+        self.stages.remove(stage)
+        self.stages.insert(index, stage)
+
+    def split(self) -> Tuple[List[EffectStage], List[EffectStage], List[EffectStage]]:
+        """Split the enabled stages for batch processing.
+
+        Returns:
+            Leading per-clip stages to run before padding, the following
+            batchable stages to run on the padded batch, and the remaining
+            stages to run per clip
+        """
+        enabled = [stage for stage in self.stages if stage.enabled]
+        pre = 0
+        while pre < len(enabled) and enabled[pre].per_clip:
+            pre += 1
+        batched = pre
+        while batched < len(enabled) and enabled[batched].batchable and not enabled[batched].per_clip:
+            batched += 1
+        return enabled[:pre], enabled[pre:batched], enabled[batched:]
+
+    def run(self, stages: Iterable[EffectStage], effect: "StormtrooperEffect", data: np.ndarray,
+            context: RenderContext) -> np.ndarray:
+        """Run stages in order, recording each in the context's report.
+
+        The input array is never modified, it is copied first if an
+        in-place stage would otherwise run on it.
+
+        Args:
+            stages: Stages to run
+            effect: Effect processor providing parameters and filters
+            data: Input audio data
+            context: State of the current processing call
+
+        Returns:
+            Processed audio data
+        """
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        source = data
+        for stage in stages:
+            if not stage.enabled:
+                continue
+            if stage.in_place and data is source:
+                data = data.copy()
+            if tracing:
+                if _HAS_RESET_PEAK:
+                    tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            data = stage.apply(effect, data, context)
+            ms = (time.perf_counter() - start) * 1000
+            allocated = None
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                allocated = (peak if _HAS_RESET_PEAK else current) - before
+            context.report.add(stage.name, ms, allocated)
+        return data
+
+    @contextmanager
+    def reporting(self, context: RenderContext) -> Iterator[ChainReport]:
+        """Scope one processing call, tracing allocations if enabled.
+
+        Tracing started here is stopped on exit, and the finished report is
+        logged.
+
+        Args:
+            context: State of the processing call
+
+        Yields:
+            The call's report
+        """
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            yield context.report
+        finally:
+            if started:
+                tracemalloc.stop()
+            logger.debug(f"Effect chain report:\n{context.report.format()}")
+
+    def process(self, effect: "StormtrooperEffect", data: np.ndarray,
+                context: Optional[RenderContext] = None) -> np.ndarray:
+        """Run all enabled stages on one clip.
+
+        Args:
+            effect: Effect processor providing parameters and filters
+            data: Input audio data
+            context: Optional state of the processing call, whose report
+                    receives the stage timings
+
+        Returns:
+            Processed audio data
+        """
+        context = context if context is not None else RenderContext(effect.sample_rate)
+        with self.reporting(context):
+            return self.run(self.stages, effect, data, context)
+
+    def __repr__(self) -> str:
+        return f"EffectChain({self.names})"
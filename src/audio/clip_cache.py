@@ -0,0 +1,215 @@
+"""In-memory cache of decoded, device-rate audio clips."""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+import numpy as np
+import numpy.typing as npt
+import soundfile as sf
+from loguru import logger
+
+from .resample import resample
+
+@dataclass
+class CachedClip:
+    """A decoded clip held by the ClipCache."""
+
+    data: np.ndarray
+    mtime_ns: int
+    pinned: bool = False
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the samples."""
+        return self.data.nbytes
+
+class ClipCache:
+    """Decoded audio buffers ready for playback, with LRU eviction by bytes.
+
+    Clips are read once, mixed to mono, resampled to the requested device
+    rate and stored as float32 or int16 (half the memory, scaled in the
+    mixer). Entries are keyed by path and sample rate and checked against
+    the file's modification time, so a re-rendered file is decoded again.
+    Pinned clips count towards the budget but are never evicted, so they
+    are capped at part of it to leave room for the rest.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, dtype: npt.DTypeLike = np.float32,
+                 max_pinned_bytes: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget for cached samples in bytes
+            dtype: Storage dtype, float32 or int16
+            max_pinned_bytes: Most bytes that may be pinned, defaults to
+                             half the budget
+        """
+        self.max_bytes = max_bytes
+        self.max_pinned_bytes = max_pinned_bytes if max_pinned_bytes is not None else max_bytes // 2
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.dtype(np.float32), np.dtype(np.int16)):
+            raise ValueError(f"Unsupported clip cache dtype: {self.dtype}")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clips: "OrderedDict[Tuple[str, int], CachedClip]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: Union[str, Path], sample_rate: int) -> Tuple[str, int]:
+        """Build the cache key for a file at a sample rate."""
+        return os.path.abspath(path), int(sample_rate)
+
+    def get(self, path: Union[str, Path], sample_rate: int) -> np.ndarray:
+        """Get a clip's samples, decoding it on a miss.
+
+        Args:
+            path: Path to the audio file
+            sample_rate: Sample rate to deliver the clip at
+
+        Returns:
+            Mono samples at sample_rate in the cache dtype (shared, do not modify)
+        """
+        key = self._key(path, sample_rate)
+        mtime_ns = os.stat(key[0]).st_mtime_ns
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is not None and clip.mtime_ns == mtime_ns:
+                self.hits += 1
+                self._clips.move_to_end(key)
+                return clip.data
+            self.misses += 1
+
+        data = self._decode(key[0], sample_rate)
+        with self._lock:
+            old = self._clips.pop(key, None)
+            pinned = old.pinned if old is not None else False
+            if old is not None:
+                self._total -= old.nbytes
+            self._clips[key] = CachedClip(data, mtime_ns, pinned)
+            self._total += data.nbytes
+            self._evict()
+        return data
+
+    def _decode(self, path: str, sample_rate: int) -> np.ndarray:
+        """Read, mix down, resample and convert a clip to the storage dtype."""
+        data, src_rate = sf.read(path, dtype='float32')
+        if data.ndim > 1:
+            data = np.mean(data, axis=1)
+        if src_rate != sample_rate:
+            data = resample(data, src_rate, sample_rate)
+        logger.debug(f"Decoded clip into cache: {Path(path).name}")
+        if self.dtype == np.int16:
+            return np.round(np.clip(data, -1.0, 32767 / 32768) * 32768).astype(np.int16)
+        return np.ascontiguousarray(data, dtype=np.float32)
+
+    def _evict(self) -> None:
+        """Remove least recently used unpinned clips until within budget."""
+        if self._total <= self.max_bytes:
+            return
+        for key in list(self._clips):
+            if self._total <= self.max_bytes:
+                break
+            clip = self._clips[key]
+            if clip.pinned:
+                continue
+            del self._clips[key]
+            self._total -= clip.nbytes
+            self.evictions += 1
+
+    def preload(self, paths: Iterable[Union[str, Path]], sample_rate: int, pin: bool = False) -> None:
+        """Decode clips ahead of time.
+
+        Args:
+            paths: Audio files to load
+            sample_rate: Sample rate to deliver the clips at
+            pin: Whether to pin the clips, as far as the pinned cap allows
+        """
+        for path in paths:
+            try:
+                if pin:
+                    self.pin(path, sample_rate)
+                else:
+                    self.get(path, sample_rate)
+            except Exception as e:
+                logger.warning(f"Failed to preload {Path(path).name}: {str(e)}")
+        if pin:
+            stats = self.stats()
+            logger.info(f"Pinned {stats['pinned']} clips, {stats['pinned_bytes']} of {self.max_pinned_bytes} bytes")
+
+    def pin(self, path: Union[str, Path], sample_rate: int) -> bool:
+        """Load a clip and exempt it from eviction.
+
+        Args:
+            path: Path to the audio file
+            sample_rate: Sample rate to deliver the clip at
+
+        Returns:
+            True if the clip is pinned, False if it would exceed max_pinned_bytes
+        """
+        self.get(path, sample_rate)
+        with self._lock:
+            clip = self._clips.get(self._key(path, sample_rate))
+            if clip is None:
+                return False
+            if not clip.pinned and self._pinned_bytes() + clip.nbytes > self.max_pinned_bytes:
+                logger.warning(f"Not pinning {Path(path).name}, pinned clips would exceed {self.max_pinned_bytes} bytes")
+                return False
+            clip.pinned = True
+            return True
+
+    def unpin(self, path: Union[str, Path], sample_rate: int) -> None:
+        """Make a pinned clip evictable again.
+
+        Args:
+            path: Path to the audio file
+            sample_rate: Sample rate the clip was pinned at
+        """
+        with self._lock:
+            clip = self._clips.get(self._key(path, sample_rate))
+            if clip is not None:
+                clip.pinned = False
+                self._evict()
+
+    def _pinned_bytes(self) -> int:
+        """Memory used by pinned clips. Called with the lock held."""
+        return sum(clip.nbytes for clip in self._clips.values() if clip.pinned)
+
+    def __contains__(self, item: Tuple[Union[str, Path], int]) -> bool:
+        path, sample_rate = item
+        with self._lock:
+            return self._key(path, sample_rate) in self._clips
+
+    def __len__(self) -> int:
+        return len(self._clips)
+
+    def clear(self) -> None:
+        """Drop all clips, including pinned ones, and reset the counters."""
+        with self._lock:
+            self._clips.clear()
+            self._total = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss, eviction, entry, pinned and byte
+            counts, pinned bytes, and the hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._clips),
+                "pinned": sum(1 for clip in self._clips.values() if clip.pinned),
+                "bytes": self._total,
+                "pinned_bytes": self._pinned_bytes(),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
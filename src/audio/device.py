@@ -0,0 +1,241 @@
+"""Process-wide output device manager."""
+
+import platform
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple, TypedDict, cast
+import sounddevice as sd
+from loguru import logger
+
+class DeviceInfo(TypedDict, total=False):
+    """Type definition for sounddevice device info."""
+    name: str
+    max_output_channels: int
+    default_samplerate: float
+
+@dataclass(frozen=True)
+class DeviceCapabilities:
+    """What a probe found out about the output device."""
+
+    device_id: int
+    name: str
+    max_output_channels: int
+    default_samplerate: float
+    sample_rates: Tuple[int, ...]
+    sample_rate: int
+
+class AudioDevice:
+    """Output device shared by all players in the process.
+
+    Enumerating devices and checking sample rates costs hundreds of
+    milliseconds on the Pi, so the device is probed once and its
+    capabilities are cached. Players call reprobe() when a stream fails,
+    which re-initializes PortAudio to pick up a device that was unplugged
+    or replaced, then probes again. Re-initializing closes every stream in
+    the process, so each reprobe bumps the generation and players rebuild
+    mixers made for an older one.
+    """
+
+    # Common sample rates supported by most devices
+    # 44.1kHz is the preferred rate for best quality and compatibility
+    SUPPORTED_RATES = [44100, 48000, 22050, 16000]
+    DEFAULT_RATE = 44100  # CD-quality audio
+
+    def __init__(self, preferred_rate: int = DEFAULT_RATE):
+        """Initialize the device manager. The device is probed on first use.
+
+        Args:
+            preferred_rate: Sample rate to use if the device supports it
+        """
+        self.system = platform.system()
+        self.preferred_rate = preferred_rate
+        self.probes = 0
+        self.generation = 0
+        self._capabilities: Optional[DeviceCapabilities] = None
+        self._lock = threading.Lock()
+
+    @property
+    def capabilities(self) -> DeviceCapabilities:
+        """Cached device capabilities, probing the device on first access."""
+        capabilities = self._capabilities
+        if capabilities is None:
+            capabilities = self.probe()
+        return capabilities
+
+    @property
+    def device_id(self) -> int:
+        """Output device index."""
+        return self.capabilities.device_id
+
+    @property
+    def sample_rate(self) -> int:
+        """Output sample rate (Hz)."""
+        return self.capabilities.sample_rate
+
+    def probe(self, force: bool = False) -> DeviceCapabilities:
+        """Find the output device and its supported rates, and make it the default.
+
+        Args:
+            force: Probe again even if capabilities are cached
+
+        Returns:
+            Device capabilities
+
+        Raises:
+            sd.PortAudioError: If no output device is available
+        """
+        with self._lock:
+            if self._capabilities is not None and not force:
+                return self._capabilities
+
+            start = time.perf_counter()
+            device_id = self._find_device()
+            if device_id is None:
+                raise sd.PortAudioError("No suitable audio device found")
+            device_info = cast(Optional[DeviceInfo], sd.query_devices(device_id))
+            if device_info is None:
+                raise sd.PortAudioError(f"Device {device_id} not found")
+
+            default_rate = device_info.get('default_samplerate', self.DEFAULT_RATE)
+            sample_rates = self._check_rates(device_id, default_rate)
+            sample_rate = self._choose_rate(self.preferred_rate, sample_rates)
+            capabilities = DeviceCapabilities(
+                device_id=device_id,
+                name=device_info.get('name', 'Unknown'),
+                max_output_channels=device_info.get('max_output_channels', 0),
+                default_samplerate=default_rate,
+                sample_rates=sample_rates,
+                sample_rate=sample_rate
+            )
+
+            # Configure device with safe defaults
+            # Note: Ignoring type errors here as sounddevice's types are incomplete
+            sd.default.device = (None, device_id)  # type: ignore
+            sd.default.samplerate = sample_rate  # type: ignore
+            sd.default.channels = (None, 1)  # type: ignore
+
+            self._capabilities = capabilities
+            self.probes += 1
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.info(f"Using audio device: {capabilities.name} at {sample_rate} Hz (probed in {elapsed_ms:.0f} ms)")
+            return capabilities
+
+    def reprobe(self) -> DeviceCapabilities:
+        """Re-initialize PortAudio and probe again, after a device error.
+
+        This invalidates the output streams of all players, not just the
+        caller's. The generation is bumped so they open new ones.
+
+        Returns:
+            Device capabilities
+        """
+        logger.warning("Re-probing audio device")
+        with self._lock:
+            self._capabilities = None
+            self.generation += 1
+            # PortAudio only enumerates devices on initialization, and
+            # sounddevice has no public way to re-initialize it. Its private
+            # helpers are used when present, otherwise only the probe reruns
+            terminate = getattr(sd, "_terminate", None)
+            initialize = getattr(sd, "_initialize", None)
+            if terminate is None or initialize is None:
+                logger.warning("sounddevice cannot re-initialize PortAudio, new devices may not be found")
+            else:
+                try:
+                    terminate()
+                    initialize()
+                except sd.PortAudioError as e:
+                    logger.error(f"Failed to re-initialize PortAudio: {e}")
+        return self.probe(force=True)
+
+    def _find_device(self) -> Optional[int]:
+        """Get the output device index for this platform.
+
+        Returns:
+            Device ID if found, None otherwise
+        """
+        if self.system != 'Darwin':  # Linux/Raspberry Pi
+            # Use device 0 (usually the USB audio device)
+            return 0
+
+        # macOS: use the system default output device
+        try:
+            default_device = sd.default.device[1]  # Output device
+            if default_device is not None and default_device >= 0:
+                return cast(int, default_device)
+
+            # Fallback: find first output device
+            devices = sd.query_devices()
+            for i, device in enumerate(devices):
+                device_info = cast(DeviceInfo, device)
+                if device_info.get('max_output_channels', 0) > 0:
+                    return i
+
+            return None
+
+        except Exception as e:
+            logger.error(f"Failed to get default device: {e}")
+            return None
+
+    def _check_rates(self, device_id: int, default_rate: float) -> Tuple[int, ...]:
+        """Find which of the common sample rates the device accepts.
+
+        Args:
+            device_id: Output device index
+            default_rate: Device default sample rate, assumed to work if
+                         none of the common rates are accepted
+
+        Returns:
+            Supported rates, in order of preference
+        """
+        supported = []
+        for rate in self.SUPPORTED_RATES:
+            try:
+                sd.check_output_settings(device=device_id, channels=1, samplerate=rate)
+                supported.append(rate)
+            except (sd.PortAudioError, ValueError):
+                continue
+        return tuple(supported) or (int(round(default_rate)),)
+
+    @staticmethod
+    def _choose_rate(preferred_rate: float, sample_rates: Tuple[int, ...]) -> int:
+        """Get the closest supported sample rate.
+
+        Args:
+            preferred_rate: Preferred sample rate
+            sample_rates: Rates the device supports
+
+        Returns:
+            Closest supported sample rate
+        """
+        # Round to nearest integer
+        target = int(round(preferred_rate))
+
+        # If the preferred rate is supported, use it
+        if target in sample_rates:
+            return target
+
+        # Find the closest supported rate
+        # Prefer rates that are multiples/factors of the target
+        for rate in sample_rates:
+            if rate % target == 0 or target % rate == 0:
+                return rate
+
+        # Fallback to closest rate
+        return min(sample_rates, key=lambda x: abs(x - target))
+
+_default_device: Optional[AudioDevice] = None
+_default_lock = threading.Lock()
+
+def get_audio_device() -> AudioDevice:
+    """Get the process-wide output device manager.
+
+    Returns:
+        Shared AudioDevice instance
+    """
+    global _default_device
+    with _default_lock:
+        if _default_device is None:
+            _default_device = AudioDevice()
+        return _default_device
@@ -0,0 +1,173 @@
+"""Content-addressed on-disk cache with LRU eviction by total size."""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union
+from loguru import logger
+
+class DiskCache:
+    """Directory of cached blobs keyed by content hash.
+
+    Each entry is one file named after its key. The cache tracks the total
+    size of its entries and evicts the least recently used ones once it grows
+    past ``max_bytes``. Recency survives restarts because hits touch the
+    file's modification time, which is used to order entries on startup.
+    Writes go to a temporary file first and are moved into place, so readers
+    never see a partial entry.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 64 * 1024 * 1024, suffix: str = ".bin"):
+        """Initialize the cache, indexing any existing entries.
+
+        Args:
+            directory: Directory holding the cache entries
+            max_bytes: Total size budget in bytes
+            suffix: File suffix of cache entries
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_read = 0
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._total = 0
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _scan(self) -> None:
+        """Index existing entries, oldest first."""
+        if not self.directory.exists():
+            return
+        entries = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.name[:-len(self.suffix)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total += size
+        if entries:
+            logger.debug(f"Indexed {len(entries)} cache entries in: {self.directory}")
+        self._evict()
+
+    def path(self, key: str) -> Path:
+        """Get the file path of an entry."""
+        return self.directory / f"{key}{self.suffix}"
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of all cached entries."""
+        return self._total
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read an entry, marking it as recently used.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Cached bytes, or None on a miss
+        """
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+                size = self._index.pop(key, None)
+                if size is not None:
+                    self._total -= size
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_read += len(data)
+            if key not in self._index:
+                self._total += len(data)
+            self._index[key] = len(data)
+            self._index.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes) -> bool:
+        """Atomically store an entry, evicting old entries to stay in budget.
+
+        Args:
+            key: Entry key
+            data: Bytes to store
+
+        Returns:
+            True if the entry was stored
+        """
+        if len(data) > self.max_bytes:
+            logger.debug(f"Not caching {key}: {len(data)} bytes exceeds cache budget")
+            return False
+
+        path = self.path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_bytes(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path}: {str(e)}")
+            return False
+
+        with self._lock:
+            self._total += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._evict()
+        return True
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until within budget."""
+        while self._total > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total -= size
+            self.evictions += 1
+            try:
+                self.path(key).unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            for key in list(self._index):
+                try:
+                    self.path(key).unlink()
+                except OSError:
+                    pass
+            self._index.clear()
+            self._total = 0
+            self.hits = self.misses = self.evictions = self.bytes_read = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss, eviction, entry and byte counts
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "bytes": self._total,
+            "bytes_read": self.bytes_read,
+        }
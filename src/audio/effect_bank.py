@@ -0,0 +1,261 @@
+"""Pre-rendered radio effect bank for mic clicks and static."""
+
+import dataclasses
+import hashlib
+import json
+import os
+import random
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from loguru import logger
+import numpy as np
+import numpy.typing as npt
+from scipy import signal
+
+from src.quotes import UrgencyLevel, URGENCY_EFFECTS
+from .filter_cache import FilterCache, get_filter_cache
+
+if TYPE_CHECKING:
+    from .effects import EffectParams
+
+# Default directory for cached banks, next to the other cached audio assets
+DEFAULT_BANK_DIR = Path(__file__).parent.parent.parent / "assets" / "audio" / "cache"
+
+def urgency_params(params: "EffectParams", urgency: Union[UrgencyLevel, str]) -> "EffectParams":
+    """Apply the URGENCY_EFFECTS overrides for a level to effect parameters.
+
+    The overrides are much quieter than the base click and static levels,
+    so they only apply when EffectParams.urgency_levels opts in.
+
+    Args:
+        params: Base effect parameters
+        urgency: Urgency level
+
+    Returns:
+        Effect parameters for that urgency level
+    """
+    level = UrgencyLevel(urgency).value
+    if not params.urgency_levels:
+        return params
+    return dataclasses.replace(params, **URGENCY_EFFECTS[level])
+
+def render_click(params: "EffectParams", sample_rate: int, rng: np.random.Generator) -> np.ndarray:
+    """Render a single randomized mic click.
+
+    Args:
+        params: Effect parameters
+        sample_rate: Sample rate (Hz)
+        rng: Random generator
+
+    Returns:
+        Mic click samples
+    """
+    click_samples = int(params.click_duration * sample_rate)
+
+    # Ensure minimum volume
+    click_volume = max(
+        params.click_volume * 0.8,  # Minimum 80% of base volume
+        params.click_volume * (1 + rng.uniform(-params.click_variation, params.click_variation))
+    )
+    click_freq = params.click_freq * (1 + rng.uniform(-params.click_variation, params.click_variation))
+    t = np.linspace(0, params.click_duration, click_samples)
+    # Sharper attack, slower decay for more prominent click
+    envelope = np.exp(-t / (params.click_duration * 0.3))  # Slower decay
+    return click_volume * np.sin(2 * np.pi * click_freq * t) * envelope
+
+def render_static(params: "EffectParams", sample_rate: int, rng: np.random.Generator,
+                  filter_cache: Optional[FilterCache] = None) -> np.ndarray:
+    """Render a randomized burst of ramped radio static.
+
+    Args:
+        params: Effect parameters
+        sample_rate: Sample rate (Hz)
+        rng: Random generator
+        filter_cache: Optional filter coefficient cache
+
+    Returns:
+        Static samples
+    """
+    filter_cache = filter_cache or get_filter_cache()
+
+    # Calculate random static duration
+    static_duration = rng.uniform(params.static_duration_min, params.static_duration_max)
+    static_samples = int(static_duration * sample_rate)
+
+    # Generate aggressive static with volume ramp
+    static_volume = params.static_volume * (1 + rng.uniform(-params.static_variation, params.static_variation))
+
+    # Create base static
+    static = rng.normal(0, 1.0, static_samples)
+
+    # Apply bandpass filter to make static more harsh
+    # 1000 Hz highpass, 4000 Hz lowpass
+    sos = filter_cache.bandpass(2, 1000, 4000, sample_rate)
+    static = signal.sosfiltfilt(sos, static)
+
+    # Create volume ramp
+    ramp_samples = int(static_samples * params.static_ramp_percent)
+    ramp = np.linspace(0.3, 1.0, ramp_samples)  # Start at 30% volume
+
+    # Apply ramp to latter portion of static
+    static_with_ramp = static * static_volume
+    static_with_ramp[-ramp_samples:] *= ramp
+
+    return static_with_ramp
+
+class EffectBank:
+    """Bank of pre-rendered mic click and static variants per urgency level.
+
+    Rendering clicks and filtered static for every clip costs a filter run
+    per response. The bank renders a fixed number of randomized variants for
+    each level in URGENCY_EFFECTS once, optionally caching them on disk, so
+    adding radio effects only picks variants and copies them into place.
+    Picking start click, end click and static independently keeps the
+    perceived randomness of rendering them fresh.
+    """
+
+    def __init__(
+        self,
+        params: "EffectParams",
+        sample_rate: int,
+        variants: int = 16,
+        dtype: npt.DTypeLike = np.float32,
+        filter_cache: Optional[FilterCache] = None,
+        cache_dir: Optional[Union[str, Path]] = None
+    ):
+        """Initialize the bank, loading cached variants or rendering new ones.
+
+        Args:
+            params: Base effect parameters
+            sample_rate: Sample rate to render at (Hz)
+            variants: Number of click and static variants per urgency level
+            dtype: Sample dtype of the stored variants
+            filter_cache: Optional filter coefficient cache
+            cache_dir: Optional directory for the cached bank file
+        """
+        self.params = params
+        self.sample_rate = sample_rate
+        self.variants = max(1, variants)
+        self.dtype = np.dtype(dtype)
+        self.filter_cache = filter_cache or get_filter_cache()
+        self.clicks: Dict[str, List[np.ndarray]] = {}
+        self.statics: Dict[str, List[np.ndarray]] = {}
+
+        self.path = None
+        if cache_dir:
+            self.path = Path(cache_dir) / f"effect_bank_{sample_rate}_{self.dtype.name}_{self.key}.npz"
+        if not self.load():
+            self.render()
+            self.save()
+
+    @property
+    def key(self) -> str:
+        """Short hash of everything that shapes the rendered variants."""
+        fields = dataclasses.asdict(self.params)
+        fields.pop("dtype", None)
+        fields.update(sample_rate=self.sample_rate, variants=self.variants, urgency_effects=URGENCY_EFFECTS)
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()[:12]
+
+    @property
+    def digest(self) -> str:
+        """Hash of the variant samples themselves, whether rendered or loaded."""
+        digest = hashlib.sha256()
+        for level in sorted(self.clicks):
+            for variant in self.clicks[level] + self.statics[level]:
+                digest.update(np.ascontiguousarray(variant).tobytes())
+        return digest.hexdigest()
+
+    def render(self, rng: Optional[np.random.Generator] = None) -> None:
+        """Render all variants for every urgency level.
+
+        Args:
+            rng: Optional random generator. Defaults to one seeded from the
+                bank key, so the same parameters always give the same bank
+        """
+        rng = rng or np.random.default_rng(int(self.key, 16))
+        for level in URGENCY_EFFECTS:
+            params = urgency_params(self.params, level)
+            self.clicks[level] = [
+                render_click(params, self.sample_rate, rng).astype(self.dtype)
+                for _ in range(self.variants)
+            ]
+            self.statics[level] = [
+                render_static(params, self.sample_rate, rng, self.filter_cache).astype(self.dtype)
+                for _ in range(self.variants)
+            ]
+        logger.debug(f"Rendered effect bank at {self.sample_rate} Hz with {self.variants} variants")
+
+    def click(self, urgency: Union[UrgencyLevel, str], rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Pick a mic click variant.
+
+        Args:
+            urgency: Urgency level
+            rng: Optional random generator for a reproducible pick. Defaults
+                to the global random module
+
+        Returns:
+            Mic click samples (shared, do not modify)
+        """
+        return self._pick(self.clicks[UrgencyLevel(urgency).value], rng)
+
+    def static(self, urgency: Union[UrgencyLevel, str], rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Pick a static burst variant.
+
+        Args:
+            urgency: Urgency level
+            rng: Optional random generator for a reproducible pick. Defaults
+                to the global random module
+
+        Returns:
+            Static samples (shared, do not modify)
+        """
+        return self._pick(self.statics[UrgencyLevel(urgency).value], rng)
+
+    @staticmethod
+    def _pick(variants: List[np.ndarray], rng: Optional[np.random.Generator]) -> np.ndarray:
+        """Pick one variant, with rng if given."""
+        if rng is None:
+            return random.choice(variants)
+        return variants[int(rng.integers(len(variants)))]
+
+    def load(self) -> bool:
+        """Load variants from the cached bank file.
+
+        Returns:
+            True if the bank was loaded from disk
+        """
+        if self.path is None or not self.path.exists():
+            return False
+
+        try:
+            clicks: Dict[str, List[np.ndarray]] = {}
+            statics: Dict[str, List[np.ndarray]] = {}
+            with np.load(self.path) as stored:
+                for level in URGENCY_EFFECTS:
+                    clicks[level] = [stored[f"click_{level}_{i}"] for i in range(self.variants)]
+                    statics[level] = [stored[f"static_{level}_{i}"] for i in range(self.variants)]
+            self.clicks, self.statics = clicks, statics
+            logger.debug(f"Loaded effect bank from: {self.path}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load effect bank {self.path}: {str(e)}")
+            return False
+
+    def save(self) -> None:
+        """Atomically write the rendered variants to the cached bank file."""
+        if self.path is None:
+            return
+
+        arrays = {}
+        for level in self.clicks:
+            for i, (click, static) in enumerate(zip(self.clicks[level], self.statics[level])):
+                arrays[f"click_{level}_{i}"] = click
+                arrays[f"static_{level}_{i}"] = static
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f".{self.path.stem}.{os.getpid()}.tmp.npz")
+            np.savez(temp_path, **arrays)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save effect bank {self.path}: {str(e)}")
@@ -1,15 +1,22 @@
 """Audio effects processing for Stormtrooper voice."""
 
+import dataclasses
+import hashlib
 from pathlib import Path
-from typing import Optional, Union, Tuple
+from typing import Optional, Union, Tuple, Iterable, Iterator, List, Sequence, Dict
 from dataclasses import dataclass
-import random
 from loguru import logger
 import numpy as np
 from scipy import signal
 import soundfile as sf
 
 from src.quotes import UrgencyLevel, URGENCY_EFFECTS
+from .filter_cache import FilterCache, get_filter_cache
+from .effect_bank import EffectBank, DEFAULT_BANK_DIR
+from .chain import EffectChain, ChainReport, RenderContext
+from .output_cache import OutputCache
+from .resample import StreamingResampler
+from .utils import write_audio_atomic
 
 @dataclass
 class EffectParams:
@@ -18,6 +25,8 @@ class EffectParams:
     # Audio Format
     sample_rate: int = 44100
     output_format: str = "WAV"
+    dtype: str = "float32"           # Sample dtype for reading and processing (float32 or float64)
+    output_rate: int = 0             # Rate to upsample to after the voice stages (0 keeps the input rate)
     
     # Filter Curve EQ - More "tinny" radio sound
     highpass_freq: float = 500.0    # Back to 500Hz to reduce bass
@@ -31,6 +40,10 @@ class EffectParams:
     resonance_q: float = 5.0        # Q factor for resonance
     resonance_gain: float = 9.0     # Gain for resonant peaks (increased from 6)
     
+    # EQ Engine
+    engine: str = "iir"            # "iir" for cascaded filters, "fft" for one fused FFT convolution
+    fft_taps: int = 0              # FIR length for the fft engine (0 picks ~40 ms worth)
+    
     # Radio Modulation
     mod_freq: float = 55.0         # Modulation frequency (Hz)
     mod_depth: float = 0.15        # Modulation depth (0-1)
@@ -50,19 +63,50 @@ class EffectParams:
     click_volume: float = 0.8      # Very loud clicks
     click_freq: float = 2000.0     # Frequency of click sound (Hz)
     click_variation: float = 0.2   # Less variation to keep clicks consistently loud
+    urgency_levels: bool = False   # Use the quieter URGENCY_EFFECTS click and static levels per urgency
+    
+    # Effect Bank
+    bank_variants: int = 16        # Pre-rendered click/static variants per urgency level
+
+def effect_seed(text: str, urgency: Optional[Union[UrgencyLevel, str]] = None) -> int:
+    """Derive a stable render seed from a quote and urgency level.
+    
+    Args:
+        text: Quote text
+        urgency: Optional urgency level
+        
+    Returns:
+        64-bit seed, the same for the same text and urgency in every process
+    """
+    level = getattr(urgency, "value", urgency) or ""
+    digest = hashlib.sha256(f"{text}\0{level}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
 
 class StormtrooperEffect:
     """Audio effects processor for Stormtrooper voice."""
     
-    def __init__(self, params: Optional[EffectParams] = None):
+    def __init__(self, params: Optional[EffectParams] = None, filter_cache: Optional[FilterCache] = None,
+                 chain: Optional[EffectChain] = None, output_cache: Optional[OutputCache] = None):
         """Initialize the effects processor.
         
         Args:
             params: Optional effect parameters
+            filter_cache: Optional filter coefficient cache. Defaults to the
+                         shared on-disk cache
+            chain: Optional effect chain. Defaults to config/effect_chain.yaml
+                  when present, otherwise all stages in the standard order
+            output_cache: Optional processed audio cache used for seeded renders
         """
         self.params = params or EffectParams()
-        self.sample_rate = self.params.sample_rate
+        self.filter_cache = filter_cache or get_filter_cache()
+        self.chain = chain or EffectChain.load_default()
+        self.output_cache = output_cache
+        self.sample_rate = self.params.sample_rate  # Default rate for calls that do not give one
+        self.dtype = np.dtype(self.params.dtype)
+        if self.params.engine not in ("iir", "fft"):
+            raise ValueError(f"Unknown EQ engine: {self.params.engine}")
         self.current_urgency = UrgencyLevel.MEDIUM  # Default urgency
+        self._banks: Dict[int, EffectBank] = {}
         logger.info("Initialized Stormtrooper effects processor")
         
     def set_urgency(self, urgency: Union[UrgencyLevel, str]) -> None:
@@ -84,7 +128,45 @@ class StormtrooperEffect:
         """
         return URGENCY_EFFECTS[self.current_urgency.value]
         
-    def process_file(self, input_path: Union[str, Path], output_path: Optional[Union[str, Path]] = None, urgency: Optional[Union[UrgencyLevel, str]] = None) -> str:
+    def effect_bank(self, sample_rate: Optional[int] = None) -> EffectBank:
+        """Get the radio effect bank for a sample rate, rendering it on first use.
+        
+        Args:
+            sample_rate: Optional sample rate, defaults to the configured one
+            
+        Returns:
+            Effect bank with click and static variants per urgency level
+        """
+        sample_rate = int(sample_rate or self.sample_rate)
+        if sample_rate not in self._banks:
+            self._banks[sample_rate] = EffectBank(
+                self.params,
+                sample_rate,
+                variants=self.params.bank_variants,
+                dtype=self.dtype,
+                filter_cache=self.filter_cache,
+                cache_dir=DEFAULT_BANK_DIR
+            )
+        return self._banks[sample_rate]
+        
+    def output_rate(self, sample_rate: int) -> int:
+        """Get the rate of processed audio for a given input rate.
+        
+        With EffectParams.output_rate set, the voice stages run at the input
+        rate and the upsample stage converts once to the output rate, so
+        only click and static synthesis run at the higher rate.
+        
+        Args:
+            sample_rate: Input sample rate
+            
+        Returns:
+            Sample rate of the processed audio
+        """
+        if self.params.output_rate and "upsample" in self.chain.names:
+            return self.params.output_rate
+        return sample_rate
+        
+    def process_file(self, input_path: Union[str, Path], output_path: Optional[Union[str, Path]] = None, urgency: Optional[Union[UrgencyLevel, str]] = None, seed: Optional[int] = None) -> str:
         """Process an audio file with Stormtrooper effects.
         
         Args:
@@ -92,6 +174,7 @@ class StormtrooperEffect:
             output_path: Optional path for output file. If not provided,
                         will append '_processed' to input filename
             urgency: Optional urgency level for effects
+            seed: Optional seed for reproducible radio effects
             
         Returns:
             Path to processed audio file
@@ -104,26 +187,16 @@ class StormtrooperEffect:
             input_path = Path(input_path)
             
             # Read audio file
-            data, sample_rate = sf.read(str(input_path))
-            self.sample_rate = sample_rate
-            
-            # Convert to mono if stereo
-            if len(data.shape) > 1:
-                data = np.mean(data, axis=1)
+            data, sample_rate = sf.read(str(input_path), dtype=self.params.dtype)
             
             # Process audio
-            processed = self._process_audio(data)
+            processed = self.process_array(data, sample_rate, seed=seed)
             
             # Generate output path if not provided
-            if output_path is None:
-                output_path = input_path.parent / f"{input_path.stem}_processed.wav"
-            else:
-                output_path = Path(output_path)
-                if output_path.suffix.lower() not in ['.wav', '.mp3']:
-                    output_path = output_path.with_suffix('.wav')
+            output_path = self._output_path(input_path, output_path)
             
             # Save processed audio
-            sf.write(str(output_path), processed, sample_rate, format='WAV', subtype='PCM_16')
+            write_audio_atomic(output_path, processed, self.output_rate(sample_rate))
             logger.info(f"Saved processed audio to: {output_path}")
             
             return str(output_path)
@@ -132,58 +205,386 @@ class StormtrooperEffect:
             logger.error(f"Failed to process audio file: {str(e)}")
             raise
             
-    def _process_audio(self, data: np.ndarray) -> np.ndarray:
+    def process_array(self, data: np.ndarray, sample_rate: int, urgency: Optional[Union[UrgencyLevel, str]] = None, seed: Optional[int] = None,
+                      report: Optional[ChainReport] = None) -> np.ndarray:
+        """Process in-memory audio with Stormtrooper effects.
+        
+        With a seed the radio effects are picked by a local generator, so the
+        same input, settings and seed always give the same output. Seeded
+        renders are served from and stored in the output cache when one is
+        configured.
+        
+        Args:
+            data: Mono or multi-channel audio data in the range [-1, 1]
+            sample_rate: Sample rate of the audio data
+            urgency: Optional urgency level for effects
+            seed: Optional seed for reproducible radio effects, for example
+                 from effect_seed()
+            report: Optional report to record per-stage timings of this
+                   call into. Left empty when served from the output cache
+            
+        Returns:
+            Processed mono audio data at output_rate(sample_rate)
+        """
+        if urgency:
+            self.set_urgency(urgency)
+        
+        data = np.asarray(data, dtype=self.dtype)
+        
+        # Convert to mono if stereo
+        if len(data.shape) > 1:
+            data = np.mean(data, axis=1)
+            
+        context = RenderContext(sample_rate, report if report is not None else ChainReport(), self.current_urgency)
+        if seed is None:
+            return self._process_audio(data, context)
+            
+        key = None
+        if self.output_cache is not None:
+            bank = self.effect_bank(self.output_rate(sample_rate)).digest if "radio_effects" in self.chain.names else ""
+            key = self.output_cache.key(data, sample_rate, self.params, context.urgency, seed, self.chain.names, bank)
+            cached = self.output_cache.get_audio(key)
+            if cached is not None:
+                logger.debug(f"Processed audio cache hit: {key[:12]}")
+                return cached
+                
+        context.rng = np.random.default_rng(seed)
+        processed = self._process_audio(data, context)
+        if key is not None:
+            self.output_cache.put_audio(key, processed)
+        return processed
+        
+    def process_pcm(self, pcm: bytes, sample_rate: int = 16000, urgency: Optional[Union[UrgencyLevel, str]] = None, seed: Optional[int] = None) -> bytes:
+        """Process raw 16-bit mono PCM, such as Polly output, with Stormtrooper effects.
+        
+        Args:
+            pcm: Little-endian signed 16-bit mono PCM data
+            sample_rate: Sample rate of the PCM data
+            urgency: Optional urgency level for effects
+            seed: Optional seed for reproducible radio effects
+            
+        Returns:
+            Processed audio as little-endian signed 16-bit mono PCM at
+            output_rate(sample_rate)
+        """
+        # Ensure data length is multiple of 2 (int16)
+        if len(pcm) % 2 != 0:
+            pcm = pcm[:-1]
+            logger.warning("Trimmed odd byte from PCM data")
+            
+        data = np.frombuffer(pcm, dtype='<i2').astype(self.dtype) / 32768.0
+        processed = self.process_array(data, sample_rate, urgency, seed)
+        
+        # Convert back to int16 PCM
+        return (processed * 32767).astype('<i2').tobytes()
+        
+    def _output_path(self, input_path: Path, output_path: Optional[Union[str, Path]] = None) -> Path:
+        """Resolve the output path for a processed file.
+        
+        Args:
+            input_path: Path to input audio file
+            output_path: Optional requested output path
+            
+        Returns:
+            Output path with a supported extension
+        """
+        if output_path is None:
+            return input_path.parent / f"{input_path.stem}_processed.wav"
+            
+        output_path = Path(output_path)
+        if output_path.suffix.lower() not in ['.wav', '.mp3']:
+            output_path = output_path.with_suffix('.wav')
+        return output_path
+        
+    def process_batch(
+        self,
+        clips: Sequence[np.ndarray],
+        sample_rate: Optional[int] = None,
+        urgency: Optional[Union[UrgencyLevel, str, Sequence[Union[UrgencyLevel, str]]]] = None,
+        max_padding: float = 1.25,
+        seed: Optional[Union[int, Sequence[Optional[int]]]] = None,
+        report: Optional[ChainReport] = None
+    ) -> List[np.ndarray]:
+        """Process several mono clips with Stormtrooper effects at once.
+        
+        Clips of similar length are packed into padded 2-D arrays so the
+        batchable chain stages (EQ, resonance and modulation by default) run
+        once per group along ``axis=-1``. Results are unpacked to the original
+        lengths before the remaining per-clip stages. Each clip is padded with an odd
+        reflection of its own tail, the same extension filtfilt uses at the
+        edges, which keeps the output close to process_file and avoids the
+        slow denormal filter tails that zero padding produces.
+        
+        Args:
+            clips: Mono audio clips sharing one sample rate
+            sample_rate: Sample rate of the clips. Defaults to the configured one
+            urgency: Optional urgency level, either one for all clips or one per clip
+            max_padding: Largest allowed ratio between the longest and shortest
+                        clip in a group
+            seed: Optional seed for reproducible radio effects, either one
+                 for all clips or one per clip
+            report: Optional report to record per-stage timings into, with
+                   stages that run per clip accumulated
+            
+        Returns:
+            Processed clips in input order, at output_rate(sample_rate)
+        """
+        sample_rate = sample_rate or self.sample_rate
+            
+        if urgency is None or isinstance(urgency, (str, UrgencyLevel)):
+            urgencies = [urgency] * len(clips)
+        else:
+            urgencies = list(urgency)
+            if len(urgencies) != len(clips):
+                raise ValueError("Expected one urgency level per clip")
+        if seed is None or isinstance(seed, (int, np.integer)):
+            seeds = [seed] * len(clips)
+        else:
+            seeds = list(seed)
+            if len(seeds) != len(clips):
+                raise ValueError("Expected one seed per clip")
+                
+        # Group clips of similar length, shortest first
+        order = sorted(range(len(clips)), key=lambda i: len(clips[i]))
+        groups: List[List[int]] = []
+        for index in order:
+            if groups and len(clips[index]) <= max_padding * max(len(clips[groups[-1][0]]), 1):
+                groups[-1].append(index)
+            else:
+                groups.append([index])
+                
+        pre, batched, tail = self.chain.split()
+        context = RenderContext(sample_rate, report if report is not None else ChainReport())
+        results: List[np.ndarray] = [np.zeros(0)] * len(clips)
+        with self.chain.reporting(context):
+            for group in groups:
+                lengths = [len(clips[i]) for i in group]
+                batch = np.zeros((len(group), max(lengths)), dtype=self.dtype)
+                for row, index in enumerate(group):
+                    # Per-clip stages such as normalization see each clip unpadded
+                    clip = self.chain.run(pre, self, np.asarray(clips[index], dtype=self.dtype), context)
+                    if 1 < len(clip) < batch.shape[-1]:
+                        clip = np.pad(clip, (0, batch.shape[-1] - len(clip)), mode='reflect', reflect_type='odd')
+                    batch[row, :len(clip)] = clip
+                
+                # Vectorized voice stages
+                batch = self.chain.run(batched, self, batch, context)
+                
+                for row, index in enumerate(group):
+                    # Each clip gets its own urgency, seed and rate for the tail stages
+                    clip_context = dataclasses.replace(
+                        context,
+                        urgency=UrgencyLevel(urgencies[index]) if urgencies[index] else self.current_urgency,
+                        rng=np.random.default_rng(seeds[index]) if seeds[index] is not None else None
+                    )
+                    results[index] = self.chain.run(tail, self, batch[row, :lengths[row]], clip_context)
+                
+        logger.debug(f"Processed {len(clips)} clips in {len(groups)} batches")
+        return results
+        
+    def process_files(
+        self,
+        input_paths: Sequence[Union[str, Path]],
+        output_paths: Optional[Sequence[Optional[Union[str, Path]]]] = None,
+        urgency: Optional[Union[UrgencyLevel, str, Sequence[Union[UrgencyLevel, str]]]] = None,
+        seed: Optional[Union[int, Sequence[Optional[int]]]] = None
+    ) -> List[Optional[str]]:
+        """Process several audio files with a single batched effect run.
+        
+        Files are grouped by sample rate and processed with process_batch.
+        A file that fails to read, process or write does not affect the
+        others: if a group's batch fails, its files are retried one by one.
+        
+        Args:
+            input_paths: Paths to input audio files
+            output_paths: Optional output paths, one per input. Missing entries
+                         default to the '_processed' naming of process_file
+            urgency: Optional urgency level, either one for all files or one per file
+            seed: Optional seed for reproducible radio effects, either one
+                 for all files or one per file
+            
+        Returns:
+            Output path for each input, or None if that file failed
+        """
+        if output_paths is None:
+            output_paths = [None] * len(input_paths)
+        if urgency is None or isinstance(urgency, (str, UrgencyLevel)):
+            urgencies = [urgency] * len(input_paths)
+        else:
+            urgencies = list(urgency)
+        if seed is None or isinstance(seed, (int, np.integer)):
+            seeds = [seed] * len(input_paths)
+        else:
+            seeds = list(seed)
+            
+        # Read all inputs, grouped by sample rate
+        by_rate: Dict[int, List[Tuple[int, np.ndarray]]] = {}
+        for index, input_path in enumerate(input_paths):
+            try:
+                data, sample_rate = sf.read(str(input_path), dtype=self.params.dtype)
+                if len(data.shape) > 1:
+                    data = np.mean(data, axis=1)
+                by_rate.setdefault(sample_rate, []).append((index, data))
+            except Exception as e:
+                logger.error(f"Failed to read {Path(input_path).name}: {str(e)}")
+                
+        results: List[Optional[str]] = [None] * len(input_paths)
+        for sample_rate, items in by_rate.items():
+            try:
+                processed: List[Optional[np.ndarray]] = list(self.process_batch(
+                    [data for _, data in items],
+                    sample_rate=sample_rate,
+                    urgency=[urgencies[index] for index, _ in items],
+                    seed=[seeds[index] for index, _ in items]
+                ))
+            except Exception as e:
+                # Retry the group one file at a time so only the bad file fails
+                logger.warning(f"Batch of {len(items)} files at {sample_rate} Hz failed, processing one by one: {str(e)}")
+                processed = []
+                for index, data in items:
+                    try:
+                        processed.extend(self.process_batch(
+                            [data], sample_rate=sample_rate, urgency=[urgencies[index]], seed=[seeds[index]]
+                        ))
+                    except Exception as e:
+                        logger.error(f"Failed to process {Path(input_paths[index]).name}: {str(e)}")
+                        processed.append(None)
+            for (index, _), clip in zip(items, processed):
+                if clip is None:
+                    continue
+                try:
+                    output_path = self._output_path(Path(input_paths[index]), output_paths[index])
+                    write_audio_atomic(output_path, clip, self.output_rate(sample_rate))
+                    logger.info(f"Saved processed audio to: {output_path}")
+                    results[index] = str(output_path)
+                except Exception as e:
+                    logger.error(f"Failed to write {Path(input_paths[index]).name}: {str(e)}")
+                    
+        return results
+        
+    def _process_audio(self, data: np.ndarray, context: Optional[RenderContext] = None) -> np.ndarray:
         """Apply Stormtrooper effects to audio data.
         
+        Runs the effect chain, by default normalize, EQ, helmet resonance,
+        radio modulation, radio effects, output gain and final normalization.
+        
         Args:
             data: Input audio data
+            context: Optional state of the processing call, whose report
+                    receives the per-stage timings
             
         Returns:
             Processed audio data
         """
-        # Normalize input
-        data = data / np.max(np.abs(data))
+        data = np.asarray(data, dtype=self.dtype)
+        return self.chain.process(self, data, context)
+        
+    def stream(self, sample_rate: Optional[int] = None, block_size: int = 1024, urgency: Optional[Union[UrgencyLevel, str]] = None, seed: Optional[int] = None) -> "EffectStream":
+        """Open a stateful block-streaming processor.
+        
+        Args:
+            sample_rate: Sample rate of the incoming blocks. Defaults to the
+                        configured effect sample rate
+            block_size: Block size used when re-chunking with EffectStream.process
+            urgency: Optional urgency level for effects
+            seed: Optional seed for reproducible radio effects
+            
+        Returns:
+            New EffectStream bound to this processor
+        """
+        if urgency:
+            self.set_urgency(urgency)
+        return EffectStream(self, sample_rate or self.params.sample_rate, block_size, seed)
         
-        # Apply Filter Curve EQ
-        data = self._apply_filter_curve_eq(data)
+    def _apply_voice_eq(self, data: np.ndarray, sample_rate: Optional[int] = None) -> np.ndarray:
+        """Apply Filter Curve EQ and helmet resonance with the configured engine.
         
-        # Apply helmet resonance
-        data = self._apply_helmet_resonance(data)
+        Args:
+            data: Input audio data
+            sample_rate: Sample rate (Hz), defaults to the configured one
+            
+        Returns:
+            Equalized audio data
+        """
+        if self.params.engine == "fft":
+            return self._apply_fused_eq(data, sample_rate)
         
-        # Apply radio modulation
-        data = self._apply_radio_modulation(data)
+        data = self._apply_filter_curve_eq(data, sample_rate)
+        return self._apply_helmet_resonance(data, sample_rate)
         
-        # Add radio effects
-        data = self._add_radio_effects(data)
+    def _fused_eq_fir(self, sample_rate: int, dtype: np.dtype) -> np.ndarray:
+        """Get the linear-phase FIR with the fused EQ and resonance response.
         
-        # Apply final output gain boost
-        output_gain = 10 ** (self.params.output_gain_db / 20)  # Convert dB to linear gain
-        data = data * output_gain
+        The combined magnitude response of the bandpass (squared, as filtfilt
+        applies it twice), mid boost and both resonators is sampled on a fine
+        frequency grid, turned into a zero-phase impulse response and
+        windowed to the configured length. The design is cached per sample
+        rate and parameter set.
         
-        # Final normalization and clipping
-        data = data / np.max(np.abs(data))
-        data = np.clip(data, -1.0, 1.0)
+        Args:
+            sample_rate: Sample rate (Hz)
+            dtype: Coefficient dtype
+            
+        Returns:
+            FIR coefficients of odd length
+        """
+        p = self.params
+        taps = p.fft_taps or 2 ** int(np.ceil(np.log2(sample_rate * 0.04)))
+        
+        def design() -> np.ndarray:
+            n_fft = 4 * taps
+            freqs = np.fft.rfftfreq(n_fft, 1 / sample_rate)
+            bandpass = self.filter_cache.bandpass(p.filter_order, p.highpass_freq, p.lowpass_freq, sample_rate)
+            _, response = signal.sosfreqz(bandpass, worN=freqs, fs=sample_rate)
+            magnitude = np.abs(response) ** 2 * 10 ** (p.mid_boost_db / 20)
+            for freq in [p.resonance_freq1, p.resonance_freq2]:
+                _, response = signal.sosfreqz(self.filter_cache.peak(freq, p.resonance_q, sample_rate), worN=freqs, fs=sample_rate)
+                magnitude *= np.abs(response) * 10 ** (p.resonance_gain / 20)
+                
+            # Zero-phase impulse response centred in an odd-length window
+            impulse = np.roll(np.fft.irfft(magnitude, n_fft), taps // 2)[:taps + 1]
+            return impulse * signal.windows.hann(taps + 1, sym=True)
+            
+        key = (taps, p.filter_order, p.highpass_freq, p.lowpass_freq, p.mid_boost_db,
+               p.resonance_freq1, p.resonance_freq2, p.resonance_q, p.resonance_gain)
+        return self.filter_cache.design("fused", sample_rate, key, design).astype(dtype, copy=False)
         
-        return data
+    def _apply_fused_eq(self, data: np.ndarray, sample_rate: Optional[int] = None) -> np.ndarray:
+        """Apply EQ and helmet resonance as one FFT overlap-add convolution.
         
-    def _apply_filter_curve_eq(self, data: np.ndarray) -> np.ndarray:
+        Args:
+            data: Input audio data, 1-D or 2-D with time along the last axis
+            sample_rate: Sample rate (Hz), defaults to the configured one
+            
+        Returns:
+            Equalized audio data, same shape as the input
+        """
+        fir = self._fused_eq_fir(sample_rate or self.sample_rate, data.dtype)
+        if data.ndim > 1:
+            fir = fir.reshape((1,) * (data.ndim - 1) + (-1,))
+        return signal.oaconvolve(data, fir, mode='same', axes=-1)
+        
+    def _apply_filter_curve_eq(self, data: np.ndarray, sample_rate: Optional[int] = None) -> np.ndarray:
         """Apply Filter Curve EQ with mid-frequency boost.
         
         Args:
             data: Input audio data
+            sample_rate: Sample rate (Hz), defaults to the configured one
             
         Returns:
             Filtered audio data with mid boost
         """
-        nyquist = self.sample_rate / 2
-        
-        # Design bandpass filter
-        low = self.params.highpass_freq / nyquist
-        high = self.params.lowpass_freq / nyquist
-        b, a = signal.butter(self.params.filter_order, [low, high], btype='band')
+        # Get bandpass filter design
+        sos = self.filter_cache.bandpass(
+            self.params.filter_order,
+            self.params.highpass_freq,
+            self.params.lowpass_freq,
+            sample_rate or self.sample_rate,
+            dtype=data.dtype
+        )
         
         # Apply bandpass filter
-        filtered = signal.filtfilt(b, a, data)
+        filtered = signal.sosfiltfilt(sos, data)
         
         # Apply mid-frequency boost
         boost_factor = 10 ** (self.params.mid_boost_db / 20)  # Convert dB to linear gain
@@ -191,125 +592,77 @@ class StormtrooperEffect:
         
         return filtered
         
-    def _apply_helmet_resonance(self, data: np.ndarray) -> np.ndarray:
+    def _apply_helmet_resonance(self, data: np.ndarray, sample_rate: Optional[int] = None) -> np.ndarray:
         """Apply helmet resonance using two resonant peaks.
         
         Args:
             data: Input audio data
+            sample_rate: Sample rate (Hz), defaults to the configured one
             
         Returns:
             Audio data with helmet resonance
         """
-        nyquist = self.sample_rate / 2
-        result = data.copy()  # Ensure we start with an ndarray
+        sample_rate = sample_rate or self.sample_rate
+        result = data
         
         # Create resonant filters
         for freq in [self.params.resonance_freq1, self.params.resonance_freq2]:
-            w0 = freq / nyquist
             Q = self.params.resonance_q
             gain = 10 ** (self.params.resonance_gain / 20)
             
-            # Create resonant bandpass filter
-            b, a = signal.iirpeak(w0, Q)
-            filtered = signal.lfilter(b, a, result)
-            result = np.array(filtered) * gain  # Ensure ndarray type
+            # Get resonant bandpass filter design
+            sos = self.filter_cache.peak(freq, Q, sample_rate, dtype=data.dtype)
+            result = signal.sosfilt(sos, result)  # New array, safe to scale in place
+            result *= gain
             
         return result
         
-    def _apply_radio_modulation(self, data: np.ndarray) -> np.ndarray:
+    def _apply_radio_modulation(self, data: np.ndarray, sample_rate: Optional[int] = None) -> np.ndarray:
         """Apply amplitude modulation for radio effect.
         
         Args:
             data: Input audio data
+            sample_rate: Sample rate (Hz), defaults to the configured one
             
         Returns:
             Modulated audio data
         """
-        # Create modulation signal
-        t = np.arange(len(data)) / self.sample_rate
-        mod = 1.0 + self.params.mod_depth * np.sin(2 * np.pi * self.params.mod_freq * t)
+        # Create modulation signal in the data's dtype
+        phase = np.arange(data.shape[-1], dtype=data.dtype)
+        phase *= 2 * np.pi * self.params.mod_freq / (sample_rate or self.sample_rate)
+        mod = np.sin(phase, out=phase)
+        mod *= self.params.mod_depth
+        mod += 1.0
         
         # Apply modulation
         return data * mod
         
-    def _add_radio_effects(self, data: np.ndarray) -> np.ndarray:
+    def _add_radio_effects(self, data: np.ndarray, context: RenderContext) -> np.ndarray:
         """Add radio static and mic click effects at start and end.
         
         Args:
             data: Input audio data
+            context: Processing call supplying the sample rate, urgency level
+                    and random generator for the picks
             
         Returns:
             Audio data with radio effects
         """
-        # Get urgency-based parameters
-        urgency_params = self._get_urgency_params()
-        
-        # Calculate random static duration and samples for effects
-        static_duration = random.uniform(
-            self.params.static_duration_min,
-            self.params.static_duration_max
-        )
-        static_samples = int(static_duration * self.sample_rate)
-        click_samples = int(self.params.click_duration * self.sample_rate)
-        
-        # Generate start mic click with urgency-based volume - ensure minimum volume
-        start_click_volume = max(
-            self.params.click_volume * 0.8,  # Minimum 80% of base volume
-            self.params.click_volume * (
-                1 + random.uniform(
-                    -self.params.click_variation,
-                    self.params.click_variation
-                )
-            )
-        )
-        start_click_freq = self.params.click_freq * (1 + random.uniform(-self.params.click_variation, self.params.click_variation))
-        t = np.linspace(0, self.params.click_duration, click_samples)
-        # Sharper attack, slower decay for more prominent click
-        envelope = np.exp(-t / (self.params.click_duration * 0.3))  # Slower decay
-        start_click = start_click_volume * np.sin(2 * np.pi * start_click_freq * t) * envelope
-        
-        # Generate end mic click with different variation but same loud characteristics
-        end_click_volume = max(
-            self.params.click_volume * 0.8,  # Minimum 80% of base volume
-            self.params.click_volume * (
-                1 + random.uniform(
-                    -self.params.click_variation,
-                    self.params.click_variation
-                )
-            )
-        )
-        end_click_freq = self.params.click_freq * (1 + random.uniform(-self.params.click_variation, self.params.click_variation))
-        end_click = end_click_volume * np.sin(2 * np.pi * end_click_freq * t) * envelope
-        
-        # Generate aggressive static with volume ramp
-        static_volume = self.params.static_volume * (
-            1 + random.uniform(
-                -self.params.static_variation,
-                self.params.static_variation
-            )
-        )
-        
-        # Create base static
-        static = np.random.normal(0, 1.0, static_samples)
+        # Pick pre-rendered urgency-based variants
+        bank = self.effect_bank(context.sample_rate)
         
-        # Apply bandpass filter to make static more harsh
-        nyquist = self.sample_rate / 2
-        static_low = 1000 / nyquist  # 1000 Hz highpass
-        static_high = 4000 / nyquist # 4000 Hz lowpass
-        b, a = signal.butter(2, [static_low, static_high], btype='band')
-        static = signal.filtfilt(b, a, static)
+        # Start and end mic clicks with different variation but same loud characteristics
+        start_click = bank.click(context.urgency, context.rng)
+        end_click = bank.click(context.urgency, context.rng)
+        click_samples = len(start_click)
         
-        # Create volume ramp
-        ramp_samples = int(static_samples * self.params.static_ramp_percent)
-        ramp = np.linspace(0.3, 1.0, ramp_samples)  # Start at 30% volume
-        
-        # Apply ramp to latter portion of static
-        static_with_ramp = static * static_volume
-        static_with_ramp[-ramp_samples:] *= ramp
+        # Ramped static for the end
+        static_with_ramp = bank.static(context.urgency, context.rng)
+        static_samples = len(static_with_ramp)
         
         # Create output buffer with space for effects
         total_length = click_samples + len(data) + click_samples + static_samples
-        result = np.zeros(total_length)
+        result = np.zeros(total_length, dtype=data.dtype)
         
         # Add effects in sequence
         result[:click_samples] = start_click                          # Start click
@@ -318,4 +671,180 @@ class StormtrooperEffect:
         result[pos:pos + click_samples] = end_click                  # End click
         result[pos + click_samples:] = static_with_ramp             # Ramped static at the end
         
-        return result 
\ No newline at end of file
+        return result
+
+def soft_limit(data: np.ndarray, threshold: float) -> np.ndarray:
+    """Limit audio to full scale with a soft knee, in place.
+    
+    Samples below the threshold pass unchanged. Above it, the excess is
+    compressed with tanh so it approaches full scale smoothly, keeping the
+    slope continuous at the threshold instead of flattening the peaks.
+    
+    Args:
+        data: Audio data, modified in place
+        threshold: Level where limiting starts, in (0, 1]
+        
+    Returns:
+        The limited data
+    """
+    knee = 1.0 - threshold
+    if knee <= 0:
+        return np.clip(data, -1.0, 1.0, out=data)
+    magnitude = np.abs(data)
+    over = magnitude > threshold
+    if np.any(over):
+        limited = threshold + knee * np.tanh((magnitude[over] - threshold) / knee)
+        data[over] = np.sign(data[over]) * limited
+    return data
+
+class EffectStream:
+    """Stateful block processor for streaming Stormtrooper effects.
+    
+    The whole-clip path normalizes by the global peak and runs zero-phase
+    filters, so it needs the complete clip before producing any output. The
+    stream instead runs the same EQ and resonance stages as causal SOS filters
+    whose state (``zi``) is carried across blocks, and replaces peak
+    normalization with a fixed headroom gain derived from the filter response.
+    Memory use and latency are bounded by the block size. With an output
+    rate set, filtered blocks are upsampled by a streaming resampler and the
+    clicks and static are taken from the bank at the output rate.
+    """
+    
+    def __init__(self, effect: StormtrooperEffect, sample_rate: int, block_size: int = 1024, seed: Optional[int] = None):
+        """Initialize the stream.
+        
+        Args:
+            effect: Effects processor supplying parameters and radio effects
+            sample_rate: Sample rate of the incoming blocks
+            block_size: Block size used when re-chunking with process()
+            seed: Optional seed for reproducible radio effects
+        """
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+            
+        self.effect = effect
+        self.params = effect.params
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.dtype = effect.dtype
+        self.rng = np.random.default_rng(seed) if seed is not None else None
+        self.urgency = effect.current_urgency
+        self.output_rate = effect.output_rate(sample_rate)
+        self._resampler = None
+        if self.output_rate != sample_rate:
+            self._resampler = StreamingResampler(sample_rate, self.output_rate, self.dtype, effect.filter_cache)
+        
+        cache = effect.filter_cache
+        
+        # Bandpass followed by the two helmet resonators as one SOS cascade
+        bandpass = cache.bandpass(
+            self.params.filter_order,
+            self.params.highpass_freq,
+            self.params.lowpass_freq,
+            sample_rate
+        )
+        peaks = [
+            cache.peak(freq, self.params.resonance_q, sample_rate)
+            for freq in [self.params.resonance_freq1, self.params.resonance_freq2]
+        ]
+        sos = np.vstack([bandpass] + peaks)
+        self.sos = sos.astype(self.dtype)
+        
+        # Fixed gain so a full-scale tone at the response peak just reaches
+        # full scale after modulation, then the output gain as makeup gain.
+        # Makeup gain above unity eats the headroom, so peaks that would pass
+        # full scale go through a soft limiter instead of being hard clipped
+        _, response = signal.sosfreqz(sos, worN=4096)
+        peak_response = float(np.max(np.abs(response)))
+        output_gain = 10 ** (self.params.output_gain_db / 20)  # Convert dB to linear gain
+        self.gain = output_gain / (peak_response * (1.0 + self.params.mod_depth))
+        self.limit_threshold = 1.0 / output_gain if output_gain > 1.0 else None
+        
+        self.reset()
+        
+    def reset(self) -> None:
+        """Reset filter state so the next block starts a new utterance."""
+        self.zi = np.zeros((self.sos.shape[0], 2), dtype=self.dtype)
+        self.position = 0
+        self.started = False
+        self._pending = np.zeros(0, dtype=self.dtype)
+        if self._resampler is not None:
+            self._resampler.reset()
+        
+    def process_block(self, block: np.ndarray) -> np.ndarray:
+        """Process one block of audio, carrying filter state to the next call.
+        
+        Args:
+            block: Mono input block in the range [-1, 1]
+            
+        Returns:
+            Processed block at the output rate. The first block of an
+            utterance is prefixed with the start mic click
+        """
+        block = np.asarray(block, dtype=self.dtype)
+        if block.ndim > 1:
+            block = np.mean(block, axis=1)
+            
+        # Causal EQ and helmet resonance with carried state
+        filtered, self.zi = signal.sosfilt(self.sos, block, zi=self.zi)
+        
+        # Radio modulation continues in phase across blocks
+        t = (self.position + np.arange(len(block))) / self.sample_rate
+        mod = 1.0 + self.params.mod_depth * np.sin(2 * np.pi * self.params.mod_freq * t)
+        self.position += len(block)
+        
+        filtered *= (mod * self.gain).astype(self.dtype)
+        if self._resampler is not None:
+            filtered = self._resampler.process(filtered)
+        if self.limit_threshold is not None:
+            out = soft_limit(filtered, self.limit_threshold)
+        else:
+            out = np.clip(filtered, -1.0, 1.0, out=filtered)
+        
+        if not self.started:
+            self.started = True
+            click = self.effect.effect_bank(self.output_rate).click(self.urgency, self.rng)
+            out = np.concatenate([click, out])
+                
+        return out
+        
+    def flush(self) -> np.ndarray:
+        """Finish the utterance with the end mic click and static burst.
+        
+        Returns:
+            Remaining output samples. The stream is reset afterwards
+        """
+        parts = []
+        if len(self._pending):
+            parts.append(self.process_block(self._pending))
+        if self._resampler is not None:
+            parts.append(self._resampler.flush())
+            
+        if self.started:
+            bank = self.effect.effect_bank(self.output_rate)
+            parts.append(bank.click(self.urgency, self.rng))
+            parts.append(bank.static(self.urgency, self.rng))
+                
+        self.reset()
+        if not parts:
+            return np.zeros(0, dtype=self.dtype)
+        return np.clip(np.concatenate(parts), -1.0, 1.0).astype(self.dtype, copy=False)
+        
+    def process(self, chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """Re-chunk arbitrary input into fixed-size blocks and process them.
+        
+        Args:
+            chunks: Iterable of mono input chunks of any length
+            
+        Yields:
+            Processed blocks, followed by the flushed tail
+        """
+        for chunk in chunks:
+            self._pending = np.concatenate([self._pending, np.asarray(chunk, dtype=self.dtype)])
+            while len(self._pending) >= self.block_size:
+                block, self._pending = self._pending[:self.block_size], self._pending[self.block_size:]
+                yield self.process_block(block)
+                
+        tail = self.flush()
+        if len(tail):
+            yield tail
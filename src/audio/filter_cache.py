@@ -0,0 +1,191 @@
+"""Filter coefficient cache for the Stormtrooper effect chain."""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Union
+from loguru import logger
+import numpy as np
+import numpy.typing as npt
+from scipy import signal
+
+# Default on-disk location, next to the other cached audio assets
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / "assets" / "audio" / "cache" / "filters.npz"
+
+class FilterCache:
+    """Cache of designed filter coefficients.
+
+    IIR designs are stored in second-order-section (SOS) form, and arbitrary
+    designs such as fused FIR responses can be stored through design().
+
+    Filters are keyed by their kind, sample rate and the design parameters
+    taken from EffectParams, so each distinct design is computed only once
+    per process. When a path is given the cache is loaded from and saved to
+    an ``.npz`` file, letting a cold process skip filter design entirely.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, autosave: bool = True):
+        """Initialize the filter cache.
+
+        Args:
+            path: Optional ``.npz`` file to persist coefficients to
+            autosave: Whether to save to disk after each newly designed filter
+        """
+        self.path = Path(path) if path is not None else None
+        self.autosave = autosave
+        self.hits = 0
+        self.misses = 0
+        self._filters: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+        if self.path is not None:
+            self.load()
+
+    @staticmethod
+    def _key(kind: str, sample_rate: float, *params: float) -> str:
+        """Build a cache key from filter kind, sample rate and parameters.
+
+        Parameters use repr so distinct floats never share a key.
+        """
+        return "_".join([kind, f"{int(sample_rate)}"] + [repr(float(p)) for p in params])
+
+    def _get(self, key: str, design: Callable[[], np.ndarray]) -> np.ndarray:
+        """Return cached coefficients for key, designing them on a miss.
+
+        Args:
+            key: Cache key
+            design: Function computing the coefficients
+
+        Returns:
+            Coefficient array
+        """
+        with self._lock:
+            sos = self._filters.get(key)
+            if sos is not None:
+                self.hits += 1
+                return sos
+            self.misses += 1
+
+        sos = np.asarray(design(), dtype=np.float64)
+        with self._lock:
+            self._filters[key] = sos
+        logger.debug(f"Designed filter: {key}")
+
+        if self.autosave and self.path is not None:
+            self.save()
+        return sos
+
+    def design(self, kind: str, sample_rate: float, params: Sequence[float],
+               design: Callable[[], np.ndarray]) -> np.ndarray:
+        """Get arbitrary cached coefficients, designing them on a miss.
+
+        Args:
+            kind: Name of the design, part of the cache key
+            sample_rate: Sample rate (Hz)
+            params: Numeric design parameters, part of the cache key
+            design: Function computing the coefficients
+
+        Returns:
+            Coefficient array
+        """
+        return self._get(self._key(kind, sample_rate, *params), design)
+
+    def bandpass(self, order: int, low_freq: float, high_freq: float, sample_rate: float,
+                 dtype: npt.DTypeLike = np.float64) -> np.ndarray:
+        """Get a Butterworth bandpass filter.
+
+        Args:
+            order: Filter order
+            low_freq: Lower cutoff frequency (Hz)
+            high_freq: Upper cutoff frequency (Hz)
+            sample_rate: Sample rate (Hz)
+            dtype: Coefficient dtype, matching the data to be filtered so
+                  that SciPy does not upcast it
+
+        Returns:
+            SOS coefficient array
+        """
+        key = self._key("bandpass", sample_rate, order, low_freq, high_freq)
+        nyquist = sample_rate / 2
+        return self._get(key, lambda: signal.butter(
+            order, [low_freq / nyquist, high_freq / nyquist], btype='band', output='sos'
+        )).astype(dtype, copy=False)
+
+    def peak(self, freq: float, q: float, sample_rate: float,
+             dtype: npt.DTypeLike = np.float64) -> np.ndarray:
+        """Get a second-order resonant peak filter.
+
+        Args:
+            freq: Resonant frequency (Hz)
+            q: Quality factor
+            sample_rate: Sample rate (Hz)
+            dtype: Coefficient dtype, matching the data to be filtered
+
+        Returns:
+            SOS coefficient array
+        """
+        key = self._key("peak", sample_rate, freq, q)
+        return self._get(
+            key, lambda: signal.tf2sos(*signal.iirpeak(freq / (sample_rate / 2), q))
+        ).astype(dtype, copy=False)
+
+    def load(self) -> None:
+        """Load cached coefficients from disk, ignoring missing or corrupt files."""
+        if self.path is None or not self.path.exists():
+            return
+
+        try:
+            with np.load(self.path) as stored:
+                filters = {key: stored[key] for key in stored.files}
+            with self._lock:
+                self._filters.update(filters)
+            logger.debug(f"Loaded {len(filters)} cached filters from: {self.path}")
+        except Exception as e:
+            logger.warning(f"Failed to load filter cache {self.path}: {str(e)}")
+
+    def save(self) -> None:
+        """Atomically write cached coefficients to disk."""
+        if self.path is None:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                filters = dict(self._filters)
+            temp_path = self.path.with_name(f".{self.path.stem}.{os.getpid()}.tmp.npz")
+            np.savez(temp_path, **filters)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save filter cache {self.path}: {str(e)}")
+
+    def clear(self) -> None:
+        """Drop all cached coefficients and reset the counters."""
+        with self._lock:
+            self._filters.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss and entry counts
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._filters),
+        }
+
+_default_cache: Optional[FilterCache] = None
+
+def get_filter_cache() -> FilterCache:
+    """Get the process-wide filter cache backed by the default cache file.
+
+    Returns:
+        Shared FilterCache instance
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FilterCache(DEFAULT_CACHE_PATH)
+    return _default_cache
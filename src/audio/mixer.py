@@ -0,0 +1,496 @@
+"""Callback-driven audio mixer on a persistent output stream."""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+import numpy.typing as npt
+import sounddevice as sd
+from loguru import logger
+
+# Default gain ramp time (seconds), short enough to feel instant and long
+# enough to avoid a click
+DEFAULT_RAMP = 0.01
+
+class Voice:
+    """A clip playing through the mixer, and the caller's handle on it.
+
+    Gain can be changed at any time and takes effect from the next block,
+    either at once by assigning ``gain`` or smoothly with set_gain(). The
+    mixer ramps ``level``, the gain actually applied, sample by sample
+    towards ``gain``. Samples may be float in [-1, 1] or int16, which is
+    scaled while mixing.
+    A voice queued with Mixer.enqueue() is linked from the previous clip's
+    ``next`` and starts on the sample after it ends.
+    Once its last sample is mixed the voice is ``ended``, but it is only
+    ``done`` when that sample has reached the speaker, one stream latency
+    later.
+    """
+
+    def __init__(self, data: np.ndarray, gain: float = 1.0, name: str = "", loop: bool = False,
+                 sample_rate: int = 0):
+        """Initialize the voice.
+
+        Args:
+            data: Mono samples at the mixer's sample rate
+            gain: Linear gain applied while mixing
+            name: Optional label, such as "speech", "click" or "ambient"
+            loop: Whether to repeat the clip until stopped
+            sample_rate: Sample rate of the data, used for times in seconds
+        """
+        self.data = data
+        self.gain = gain
+        self.level = gain
+        self.step = np.inf   # Per-sample level change while ramping
+        self.duck = 1.0      # Current ducking level, set by the mixer
+        self.fading = False  # Whether the voice stops once silent
+        self.scale = 1 / 32768 if data.dtype == np.int16 else 1.0
+        self.name = name
+        self.loop = loop
+        self.sample_rate = sample_rate
+        self.position = 0
+        self.ended = False   # Whether every sample has been mixed
+        self.next: Optional["Voice"] = None
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        """Whether the voice has finished playing or was stopped."""
+        return self._done.is_set()
+
+    @property
+    def active(self) -> bool:
+        """Whether the mixer still has samples of this voice to mix."""
+        return not (self.ended or self._done.is_set())
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the voice has finished.
+
+        Args:
+            timeout: Optional timeout in seconds
+
+        Returns:
+            True if the voice finished, False on timeout
+        """
+        return self._done.wait(timeout)
+
+    @property
+    def elapsed(self) -> float:
+        """Playback position in seconds."""
+        return self.position / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def duration(self) -> float:
+        """Clip length in seconds."""
+        return len(self.data) / self.sample_rate if self.sample_rate else 0.0
+
+    def set_gain(self, gain: float, ramp: float = DEFAULT_RAMP) -> None:
+        """Ramp the gain to a new value.
+
+        Args:
+            gain: Target linear gain
+            ramp: Time to reach the target in seconds, 0 for a jump
+        """
+        delta = abs(gain - self.level)
+        if ramp > 0 and self.sample_rate and delta:
+            self.step = delta / (ramp * self.sample_rate)
+        else:
+            self.step = np.inf
+        self.gain = gain
+
+    def fade_out(self, duration: float = DEFAULT_RAMP) -> None:
+        """Fade the voice to silence and then stop it.
+
+        A clip queued after this one starts once the fade has finished.
+
+        Args:
+            duration: Fade time in seconds
+        """
+        self.fading = True
+        self.set_gain(0.0, duration)
+
+    def stop(self) -> None:
+        """Stop the voice, it is dropped from the mix at the next block."""
+        self._done.set()
+
+    def cancel(self) -> None:
+        """Cancel playback. A clip queued after this one starts in its place."""
+        self.stop()
+
+    def __repr__(self) -> str:
+        return f"Voice(name={self.name!r}, position={self.position}/{len(self.data)}, gain={self.gain})"
+
+class Mixer:
+    """Mixes any number of voices into one long-lived output stream.
+
+    Opening a PortAudio stream per clip costs a device wake-up before the
+    first sample. The mixer keeps one ``sd.OutputStream`` open and sums the
+    active voices in its callback, so a newly added voice is heard within
+    one block.
+
+    With an int16 stream the voices are still summed in float32 and only the
+    finished block is converted, so int16 clips go from their (possibly
+    memory-mapped) buffer to the device with gain as the only arithmetic.
+
+    All gain changes are applied per block in the callback as sample-level
+    ramps: voice gain and fades, ducking of background voices while a
+    trigger voice (speech) plays, and crossfades when a clip preempts
+    another with the same name. Changes are heard within one block and
+    nothing is rendered again.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        block_size: int = 512,
+        channels: int = 1,
+        dtype: npt.DTypeLike = np.float32,
+        device: Optional[Any] = None
+    ):
+        """Initialize the mixer. The stream is opened by start() or the first play().
+
+        Args:
+            sample_rate: Output sample rate (Hz)
+            block_size: Frames per callback block
+            channels: Output channels, mono voices are copied to each
+            dtype: Output sample dtype, float32 or int16
+            device: Optional sounddevice output device
+        """
+        self.sample_rate = int(sample_rate)
+        self.block_size = block_size
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        # Voices are mixed in floating point whatever the output dtype
+        self.mix_dtype = self.dtype if self.dtype.kind == 'f' else np.dtype(np.float32)
+        self.device = device
+        self.master_gain = 1.0
+        self.underflows = 0
+        self.latency_frames = 0  # Output latency of the open stream
+        self.frames_mixed = 0
+        self._voices: List[Voice] = []
+        self._ending: List[Tuple[int, Voice]] = []  # Mixed out, waiting for the output latency
+        self._lock = threading.Lock()
+        self._stream: Optional[sd.OutputStream] = None
+        self.duck_levels: Dict[str, float] = {}
+        self.duck_trigger = "speech"
+        self.duck_ramp = 0.1
+        self._allocate(block_size)
+
+    def _allocate(self, frames: int) -> None:
+        """Allocate the per-block work buffers."""
+        self._mix = np.zeros(frames, dtype=self.mix_dtype)
+        self._scratch = np.zeros(frames, dtype=self.mix_dtype)
+        self._gain_env = np.zeros(frames, dtype=self.mix_dtype)
+        self._duck_env = np.zeros(frames, dtype=self.mix_dtype)
+        self._index = np.arange(1, frames + 1, dtype=self.mix_dtype)
+
+    @property
+    def running(self) -> bool:
+        """Whether the output stream is open and running."""
+        return self._stream is not None and self._stream.active
+
+    @property
+    def voices(self) -> List[Voice]:
+        """Currently mixed voices."""
+        with self._lock:
+            return list(self._voices)
+
+    def start(self) -> None:
+        """Open and start the output stream if it is not running."""
+        if self.running:
+            return
+        self._stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            blocksize=self.block_size,
+            device=self.device,
+            channels=self.channels,
+            dtype=self.dtype.name,
+            callback=self._callback
+        )
+        self._stream.start()
+        self.latency_frames = int(round(self._stream.latency * self.sample_rate))
+        logger.debug(f"Started mixer stream at {self.sample_rate} Hz, {self.block_size} frames per block")
+
+    def _start_with(self, voice: Voice) -> None:
+        """Start the stream for a newly added voice, removing the voice if that fails."""
+        try:
+            self.start()
+        except Exception:
+            with self._lock:
+                if voice in self._voices:
+                    self._voices.remove(voice)
+            voice.stop()
+            raise
+
+    def close(self) -> None:
+        """Stop all voices and close the output stream."""
+        self.stop_all()
+        with self._lock:
+            for _, voice in self._ending:
+                voice.stop()
+            self._ending = []
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except sd.PortAudioError as e:
+                logger.warning(f"Failed to close mixer stream: {e}")
+            self._stream = None
+
+    def set_ducking(self, levels: Dict[str, float], trigger: str = "speech", ramp: float = 0.1) -> None:
+        """Lower background voices while a trigger voice is playing.
+
+        Args:
+            levels: Ducked gain for each voice name, e.g. {"ambient": 0.3}
+            trigger: Name of the voices that cause ducking
+            ramp: Time for a full-scale duck or release in seconds
+        """
+        self.duck_levels = dict(levels)
+        self.duck_trigger = trigger
+        self.duck_ramp = ramp
+
+    def play(
+        self,
+        data: np.ndarray,
+        gain: float = 1.0,
+        name: str = "",
+        loop: bool = False,
+        fade_in: float = 0.0,
+        crossfade: float = 0.0
+    ) -> Voice:
+        """Add a voice to the mix, starting the stream if needed.
+
+        Args:
+            data: Mono samples at the mixer's sample rate, float or int16
+            gain: Linear gain for this voice
+            name: Optional label for the voice
+            loop: Whether to repeat the clip until stopped
+            fade_in: Fade-in time in seconds
+            crossfade: If positive, voices with the same name fade out over
+                      this many seconds while the new voice fades in
+
+        Returns:
+            The playing voice
+        """
+        voice = self._voice(data, gain, name, loop)
+        if not len(voice.data):
+            voice.stop()
+            return voice
+        fade_in = max(fade_in, crossfade)
+        if fade_in > 0:
+            voice.level = 0.0
+            voice.set_gain(gain, fade_in)
+        with self._lock:
+            if crossfade > 0:
+                self._stop_voices(name, crossfade)
+            self._voices.append(voice)
+        self._start_with(voice)
+        return voice
+
+    def enqueue(self, data: np.ndarray, gain: float = 1.0, name: str = "") -> Voice:
+        """Queue a clip to start on the sample after the last queued clip with the same name.
+
+        The clip joins the newest queue with that name that is still
+        playing and is neither fading out nor looping. If there is none,
+        it starts right away as a new queue.
+
+        Args:
+            data: Mono samples at the mixer's sample rate, float or int16
+            gain: Linear gain for this voice
+            name: Voice label identifying the queue
+
+        Returns:
+            The queued voice
+        """
+        voice = self._voice(data, gain, name, False)
+        if not len(voice.data):
+            voice.stop()
+            return voice
+        with self._lock:
+            tail = self._queue_tail(name)
+            if tail is not None:
+                tail.next = voice
+                return voice
+            self._voices.append(voice)
+        self._start_with(voice)
+        return voice
+
+    def _queue_tail(self, name: str) -> Optional[Voice]:
+        """Find the last clip of the newest queue a clip can join. Called with the lock held.
+
+        Returns:
+            Tail of the queue, or None if no queue with that name is still
+            playing without fading or looping
+        """
+        for head in reversed(self._voices):
+            if head.name != name:
+                continue
+            voice, tail = head, None
+            while voice is not None:
+                if voice.fading or voice.loop:
+                    break
+                tail, voice = voice, voice.next
+            else:
+                if tail.active:
+                    return tail
+        return None
+
+    def _voice(self, data: np.ndarray, gain: float, name: str, loop: bool) -> Voice:
+        """Create a voice, converting float data to the mix dtype."""
+        data = np.asarray(data)
+        if data.dtype != np.int16:
+            data = data.astype(self.mix_dtype, copy=False)
+        return Voice(data, gain, name, loop, self.sample_rate)
+
+    def stop_all(self, name: Optional[str] = None, fade: float = 0.0) -> None:
+        """Stop all voices, or only those with a given name.
+
+        Args:
+            name: Optional voice label to match
+            fade: Fade-out time in seconds for the playing voices. Queued
+                 clips behind a fading voice are dropped
+        """
+        with self._lock:
+            self._stop_voices(name, fade)
+
+    def _stop_voices(self, name: Optional[str], fade: float) -> None:
+        """Stop or fade out matching voices. Called with the lock held."""
+        for voice in self._voices:
+            if name is not None and voice.name != name:
+                continue
+            # The first unfinished clip in a queue is the one playing
+            while voice is not None and not voice.active:
+                voice = voice.next
+            if voice is not None and fade > 0:
+                # Queued clips would start after the fade, drop them
+                voice.fade_out(fade)
+                queued, voice.next = voice.next, None
+                voice = queued
+            while voice is not None:
+                voice.stop()
+                voice = voice.next
+
+    def mix(self, frames: int) -> np.ndarray:
+        """Mix the next block of all active voices.
+
+        Args:
+            frames: Number of frames to produce
+
+        Returns:
+            Mixed mono block in the mix dtype, valid until the next call
+        """
+        if frames > len(self._mix):
+            self._allocate(frames)
+        mix = self._mix[:frames]
+        mix.fill(0)
+
+        with self._lock:
+            # Voices whose last sample has now been heard are done
+            if self._ending:
+                for deadline, voice in self._ending:
+                    if deadline <= self.frames_mixed:
+                        voice.stop()
+                self._ending = [(deadline, voice) for deadline, voice in self._ending if not voice.done]
+            ducking = bool(self.duck_levels) and any(
+                voice.name == self.duck_trigger for voice in self._voices
+            )
+            active = []
+            for voice in self._voices:
+                filled = 0
+                while voice is not None and filled < frames:
+                    if voice.active:
+                        chunk = voice.data[voice.position:voice.position + frames - filled]
+                        scratch = self._scratch[:len(chunk)]
+                        np.multiply(chunk, voice.scale, out=scratch)
+                        self._apply_gain(voice, scratch, ducking)
+                        mix[filled:filled + len(chunk)] += scratch
+                        filled += len(chunk)
+                        voice.position += len(chunk)
+                        if voice.position >= len(voice.data):
+                            if voice.loop:
+                                voice.position = 0
+                            else:
+                                self._end(voice, filled)
+                    if voice.fading and voice.level == 0.0:
+                        voice.stop()
+                    if not voice.active:
+                        # A queued clip continues on the very next sample
+                        voice = voice.next
+                if voice is not None:
+                    active.append(voice)
+            self._voices = active
+            self.frames_mixed += frames
+
+        if self.master_gain != 1.0:
+            mix *= self.master_gain
+        np.clip(mix, -1.0, 1.0, out=mix)
+        return mix
+
+    def _end(self, voice: Voice, offset: int) -> None:
+        """Mark a voice as fully mixed, done once its last sample has played.
+
+        Called with the lock held.
+
+        Args:
+            voice: Voice whose last sample was mixed
+            offset: Frames into the current block where the voice ended
+        """
+        voice.ended = True
+        if not self.latency_frames:
+            voice.stop()
+            return
+        self._ending.append((self.frames_mixed + offset + self.latency_frames, voice))
+
+    def _apply_gain(self, voice: Voice, block: np.ndarray, ducking: bool) -> None:
+        """Apply a voice's gain and ducking to a block, advancing their ramps."""
+        frames = len(block)
+        gain, voice.level = self._ramp(voice.level, voice.gain, voice.step, frames, self._gain_env)
+        if voice.level == voice.gain:
+            voice.step = np.inf
+        duck_target = self.duck_levels.get(voice.name, 1.0) if ducking else 1.0
+        duck_step = 1.0 / (self.duck_ramp * self.sample_rate) if self.duck_ramp > 0 else np.inf
+        duck, voice.duck = self._ramp(voice.duck, duck_target, duck_step, frames, self._duck_env)
+        block *= gain
+        if not (np.isscalar(duck) and duck == 1.0):
+            block *= duck
+
+    def _ramp(
+        self,
+        start: float,
+        target: float,
+        step: float,
+        frames: int,
+        out: np.ndarray
+    ) -> Tuple[Union[float, np.ndarray], float]:
+        """Build a linear per-sample ramp from start towards target.
+
+        Args:
+            start: Level before the block
+            target: Level to ramp towards
+            step: Level change per sample
+            frames: Block length
+            out: Buffer to hold the ramp
+
+        Returns:
+            Tuple of (levels, end level). Levels are a scalar when constant
+        """
+        if start == target or not np.isfinite(step):
+            return target, target
+        ramp = out[:frames]
+        np.multiply(self._index[:frames], step if target > start else -step, out=ramp)
+        ramp += start
+        if target > start:
+            np.minimum(ramp, target, out=ramp)
+        else:
+            np.maximum(ramp, target, out=ramp)
+        end = float(ramp[-1])
+        # Snap to the target once float rounding leaves it within one step
+        return ramp, target if abs(end - target) < step else end
+
+    def _callback(self, outdata: np.ndarray, frames: int, time: Any, status: Any) -> None:
+        """Fill the output buffer for PortAudio."""
+        if status and getattr(status, "output_underflow", False):
+            self.underflows += 1
+        mix = self.mix(frames)
+        if self.dtype == np.int16:
+            # Scale in place, the assignment below converts to int16
+            np.rint(np.multiply(mix, 32767, out=mix), out=mix)
+        outdata[:] = mix[:, np.newaxis]
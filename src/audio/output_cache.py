@@ -0,0 +1,123 @@
+"""Content-addressed cache of processed Stormtrooper audio."""
+
+import dataclasses
+import hashlib
+import io
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+from loguru import logger
+import numpy as np
+
+from src.quotes import UrgencyLevel, URGENCY_EFFECTS
+from .disk_cache import DiskCache
+
+if TYPE_CHECKING:
+    from .effects import EffectParams
+
+# Default directory for processed audio, next to the other cached audio assets
+DEFAULT_OUTPUT_CACHE_DIR = Path(__file__).parent.parent.parent / "assets" / "audio" / "cache" / "processed"
+
+class OutputCache(DiskCache):
+    """Cache of processed audio keyed by everything that determines it.
+
+    The key hashes the input samples, sample rate, EffectParams, enabled
+    chain stages, urgency level and its URGENCY_EFFECTS levels, the effect
+    bank contents and the seed, so a repeat render of the same
+    input with the same settings is a file read instead of a DSP run. Only
+    seeded renders are deterministic, so only those should be cached.
+    """
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_OUTPUT_CACHE_DIR, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding the cached audio
+            max_bytes: Total size budget in bytes
+        """
+        super().__init__(directory, max_bytes, suffix=".npy")
+
+    @staticmethod
+    def key(
+        data: np.ndarray,
+        sample_rate: int,
+        params: "EffectParams",
+        urgency: Union[UrgencyLevel, str],
+        seed: int,
+        stages: Sequence[str] = (),
+        bank: str = ""
+    ) -> str:
+        """Build the cache key for a render.
+
+        Args:
+            data: Input audio samples
+            sample_rate: Sample rate of the input
+            params: Effect parameters
+            urgency: Urgency level
+            seed: Render seed
+            stages: Names of the enabled effect chain stages
+            bank: Digest of the effect bank the clicks and static come from
+
+        Returns:
+            Hex digest identifying the processed output
+        """
+        data = np.ascontiguousarray(data)
+        settings = {
+            "dtype": data.dtype.str,
+            "shape": data.shape,
+            "sample_rate": int(sample_rate),
+            "params": dataclasses.asdict(params),
+            "urgency": UrgencyLevel(urgency).value,
+            "seed": int(seed),
+            "stages": list(stages),
+            "urgency_effects": URGENCY_EFFECTS,
+            "bank": bank,
+        }
+        digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode())
+        digest.update(data.tobytes())
+        return digest.hexdigest()
+
+    def get_audio(self, key: str) -> Optional[np.ndarray]:
+        """Read cached processed audio.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Processed audio, or None on a miss
+        """
+        data = self.get(key)
+        if data is None:
+            return None
+        try:
+            return np.load(io.BytesIO(data), allow_pickle=False)
+        except ValueError as e:
+            logger.warning(f"Discarding corrupt cache entry {key}: {str(e)}")
+            return None
+
+    def put_audio(self, key: str, audio: np.ndarray) -> bool:
+        """Store processed audio.
+
+        Args:
+            key: Cache key
+            audio: Processed audio
+
+        Returns:
+            True if the audio was stored
+        """
+        buffer = io.BytesIO()
+        np.save(buffer, audio, allow_pickle=False)
+        return self.put(key, buffer.getvalue())
+
+_default_cache: Optional[OutputCache] = None
+
+def get_output_cache() -> OutputCache:
+    """Get the process-wide processed audio cache in the default directory.
+
+    Returns:
+        Shared OutputCache instance
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = OutputCache()
+    return _default_cache
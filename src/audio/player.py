@@ -1,46 +1,89 @@
 """Audio playback functionality."""
 
-import platform
-from typing import Optional, Dict, Any, Union, cast, TypedDict
+import weakref
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, TypeVar, Union
 import numpy as np
-from scipy import signal
 import sounddevice as sd
 import soundfile as sf
 from loguru import logger
 
-class DeviceInfo(TypedDict, total=False):
-    """Type definition for sounddevice device info."""
-    name: str
-    max_output_channels: int
-    default_samplerate: float
+from .resample import resample
+from .mixer import Mixer, Voice, DEFAULT_RAMP
+from .clip_cache import ClipCache
+from .device import AudioDevice, get_audio_device
+from .utils import map_wav
+
+T = TypeVar("T")
 
 class AudioPlayer:
-    """Audio playback handler."""
+    """Audio playback handler.
     
-    # Common sample rates supported by most devices
-    # 44.1kHz is the preferred rate for best quality and compatibility
-    SUPPORTED_RATES = [44100, 48000, 22050, 16000]
-    DEFAULT_RATE = 44100  # CD-quality audio
+    Playback goes through a Mixer that keeps one output stream open for the
+    player's lifetime, so clips start within one callback block and several
+    voices (speech, clicks, ambient) can play at once with their own gain.
+    Volume changes, ducking, fades and crossfades are ramped per block in
+    the mixer callback, so they apply to clips that are already playing.
+    The output device is probed once per process and shared by all players.
+    """
     
     # Volume settings
     MIN_VOLUME = 1
     MAX_VOLUME = 11
     DEFAULT_VOLUME = 5
     
-    def __init__(self):
-        """Initialize the audio player."""
-        self.system = platform.system()
+    # Time allowed beyond a clip's length before playback counts as stuck
+    WAIT_MARGIN = 2.0
+    
+    def __init__(
+        self,
+        dtype: str = 'float32',
+        block_size: int = 512,
+        clip_cache: Optional[ClipCache] = None,
+        device: Optional[AudioDevice] = None,
+        output_dtype: str = 'int16'
+    ):
+        """Initialize the audio player.
+        
+        Args:
+            dtype: Sample dtype used for decoding, resampling and playback
+            block_size: Frames per mixer callback block, bounding start latency
+            clip_cache: Optional cache of decoded device-rate clips used by
+                       play_file, so repeated files play from RAM
+            device: Optional output device manager. Defaults to the shared
+                   process-wide device
+            output_dtype: Sample format of the output stream, int16 or float32
+        """
+        self.device = device or get_audio_device()
+        self.system = self.device.system
         self.volume = self.DEFAULT_VOLUME
-        self._configure_device()
+        self.dtype = np.dtype(dtype)
+        self.output_dtype = np.dtype(output_dtype)
+        self.block_size = block_size
+        self.mixer: Optional[Mixer] = None
+        # Device generation the mixer was opened for
+        self._mixer_generation = -1
+        self.clip_cache = clip_cache
+        self._ducking: Optional[Tuple[Dict[str, float], str, float]] = None
+        # Voices following the player volume, with their own gain
+        self._volume_voices: "weakref.WeakKeyDictionary[Voice, float]" = weakref.WeakKeyDictionary()
+        # Probed on the first player only, later players reuse the result
+        self.device.probe()
         logger.info(f"Initialized audio player on {self.system}")
         
-    def set_volume(self, volume: float) -> None:
-        """Set playback volume level.
+    def set_volume(self, volume: float, ramp: float = 0.05) -> None:
+        """Set playback volume level, including for clips already playing.
         
         Args:
             volume: Volume level from 1 (quietest) to 11 (loudest)
+            ramp: Time in seconds to reach the new level on playing clips
         """
         self.volume = max(self.MIN_VOLUME, min(self.MAX_VOLUME, volume))
+        scale = self._volume_scale()
+        for voice, gain in list(self._volume_voices.items()):
+            # A fading voice keeps its zero target so it still stops
+            if not voice.done and not voice.fading:
+                voice.set_gain(scale * gain, ramp)
         logger.info(f"Volume set to: {self.volume}")
         
     def get_volume(self) -> float:
@@ -51,142 +94,360 @@ class AudioPlayer:
         """
         return self.volume
         
-    def _configure_device(self) -> None:
-        """Configure audio device based on platform."""
-        try:
-            if self.system == 'Darwin':  # macOS
-                # Use system default output device
-                device_id = self._get_default_device()
-            else:  # Linux/Raspberry Pi
-                # Use device 0 (usually the USB audio device)
-                device_id = 0
-                
-            # Verify device exists
-            if device_id is not None:
-                device_info = cast(Optional[DeviceInfo], sd.query_devices(device_id))
-                if device_info is not None:
-                    logger.info(f"Using audio device: {device_info.get('name', 'Unknown')}")
-                    
-                    # Try to use 44.1kHz first (CD quality), fallback to device default
-                    default_rate = device_info.get('default_samplerate', self.DEFAULT_RATE)
-                    sample_rate = self._get_supported_rate(self.DEFAULT_RATE)
-                    logger.info(f"Using sample rate: {sample_rate} Hz")
-                    
-                    # Configure device with safe defaults
-                    # Note: Ignoring type errors here as sounddevice's types are incomplete
-                    sd.default.device = (None, device_id)  # type: ignore
-                    sd.default.samplerate = sample_rate  # type: ignore
-                    sd.default.channels = (None, 1)  # type: ignore
-                else:
-                    logger.warning(f"Device {device_id} not found")
-            else:
-                logger.warning("No suitable audio device found")
-                
-        except sd.PortAudioError as e:
-            logger.error(f"Failed to configure audio device: {e}")
-            raise
+    def set_ducking(self, levels: Dict[str, float], trigger: str = "speech", ramp: float = 0.1) -> None:
+        """Lower background voices while speech plays.
+        
+        Args:
+            levels: Ducked gain for each voice name, e.g. {"ambient": 0.3}
+            trigger: Name of the voices that cause ducking
+            ramp: Time for a full-scale duck or release in seconds
+        """
+        self._ducking = (dict(levels), trigger, ramp)
+        if self.mixer is not None:
+            self.mixer.set_ducking(*self._ducking)
+        
+    def play_file(self, file_path: str, volume: Optional[float] = None) -> bool:
+        """Play an audio file, blocking until it has finished.
+        
+        Args:
+            file_path: Path to the audio file to play
+            volume: Optional volume override (1-11)
             
-    def _get_supported_rate(self, preferred_rate: float) -> int:
-        """Get the closest supported sample rate.
+        Returns:
+            True if playback successful, False otherwise
+        """
+        voice = self.play_async(file_path, volume=volume)
+        if voice is None:
+            return False
+        return self.wait(voice)
+        
+    def play_array(self, data: np.ndarray, sample_rate: int, volume: Optional[float] = None) -> bool:
+        """Play in-memory audio data, blocking until it has finished.
         
         Args:
-            preferred_rate: Preferred sample rate
+            data: Audio data in the range [-1, 1]
+            sample_rate: Sample rate of the audio data
+            volume: Optional volume override (1-11)
             
         Returns:
-            Closest supported sample rate
+            True if playback successful, False otherwise
         """
-        # Round to nearest integer
-        target = int(round(preferred_rate))
+        # Work on a private copy, the mixer reads it during playback
+        voice = self.play(np.array(data, dtype=self.dtype), sample_rate, volume)
+        if voice is None:
+            return False
+        return self.wait(voice)
+        
+    def wait(self, voice: Voice, duration: Optional[float] = None) -> bool:
+        """Block until a voice has played, giving up if playback stalls.
+        
+        A stream that stopped calling back would otherwise block forever, so
+        the wait is bounded by the audio still to play plus WAIT_MARGIN. A
+        voice that overruns is stopped.
         
-        # If the preferred rate is supported, use it
-        if target in self.SUPPORTED_RATES:
-            return target
+        Args:
+            voice: Playback handle
+            duration: Seconds of audio still to play before the voice ends,
+                     including clips queued ahead of it. Defaults to the
+                     voice's own length
             
-        # Find the closest supported rate
-        # Prefer rates that are multiples/factors of the target
-        for rate in self.SUPPORTED_RATES:
-            if rate % target == 0 or target % rate == 0:
-                return rate
-                
-        # Fallback to closest rate
-        return min(self.SUPPORTED_RATES, key=lambda x: abs(x - target))
+        Returns:
+            True if the voice finished, False if it timed out
+        """
+        timeout = (voice.duration if duration is None else duration) + self.WAIT_MARGIN
+        if voice.wait(timeout):
+            return True
+        logger.error(f"Playback did not finish within {timeout:.1f}s, stopping it")
+        voice.stop()
+        return False
+        
+    def play_async(
+        self,
+        source: Union[str, Path, np.ndarray],
+        sample_rate: Optional[int] = None,
+        volume: Optional[float] = None,
+        gain: float = 1.0,
+        name: str = "speech",
+        loop: bool = False,
+        crossfade: float = 0.0
+    ) -> Optional[Voice]:
+        """Start playing a file or array and return at once.
+        
+        The returned voice is a handle with wait(), cancel(), done and
+        position/elapsed, so callers can prepare the next clip while this
+        one plays. Array data is played in place, do not modify it until
+        playback is done.
+        
+        Args:
+            source: Path to an audio file, or audio data in the range [-1, 1]
+            sample_rate: Sample rate of array data, ignored for files
+            volume: Optional volume override (1-11)
+            gain: Additional linear gain for this voice
+            name: Voice label, used by stop() to stop a group of voices
+            loop: Whether to repeat the clip until stopped, for ambient beds
+            crossfade: If positive, clips with the same name fade out over
+                      this many seconds while this one fades in
             
-    def _get_default_device(self) -> Optional[int]:
-        """Get the system default output device.
+        Returns:
+            Playback handle, or None if playback could not start
+        """
+        loaded = self._load(source, sample_rate)
+        if loaded is None:
+            return None
+        return self.play(*loaded, volume=volume, gain=gain, name=name, loop=loop, crossfade=crossfade)
+        
+    def enqueue(
+        self,
+        source: Union[str, Path, np.ndarray],
+        sample_rate: Optional[int] = None,
+        volume: Optional[float] = None,
+        gain: float = 1.0,
+        name: str = "speech"
+    ) -> Optional[Voice]:
+        """Queue a file or array to start on the sample after the previous clip.
+        
+        Clips enqueued with the same name play back to back without a gap,
+        for example a squad command followed by "Over.". If nothing with
+        that name is playing the clip starts at once.
         
+        Args:
+            source: Path to an audio file, or audio data in the range [-1, 1]
+            sample_rate: Sample rate of array data, ignored for files
+            volume: Optional volume override (1-11)
+            gain: Additional linear gain for this voice
+            name: Voice label identifying the queue
+            
         Returns:
-            Device ID if found, None otherwise
+            Playback handle for the queued clip, or None on error
         """
+        loaded = self._load(source, sample_rate)
+        if loaded is None:
+            return None
         try:
-            # Get default output device
-            default_device = sd.default.device[1]  # Output device
-            if default_device is not None:
-                return cast(int, default_device)
-            
-            # Fallback: find first output device
-            devices = sd.query_devices()
-            for i, device in enumerate(devices):
-                device_info = cast(DeviceInfo, device)
-                if device_info.get('max_output_channels', 0) > 0:
-                    return i
-                    
+            voice = self._with_mixer(lambda mixer: mixer.enqueue(
+                self._prepare(*loaded, mixer), gain=self._volume_scale(volume) * gain, name=name
+            ))
+            if volume is None:
+                self._volume_voices[voice] = gain
+            return voice
+        except Exception as e:
+            logger.error(f"Failed to queue audio: {str(e)}")
             return None
-            
+        
+    def load(
+        self,
+        source: Union[str, Path, np.ndarray],
+        sample_rate: Optional[int] = None
+    ) -> Optional[Tuple[np.ndarray, int]]:
+        """Decode and resample a clip for play() without starting it.
+        
+        Lets callers do the slow part of starting a clip ahead of time, or
+        outside their own locks.
+        
+        Args:
+            source: Path to an audio file, or audio data in the range [-1, 1]
+            sample_rate: Sample rate of array data, ignored for files
+        
+        Returns:
+            Mono samples and the mixer rate they are at, or None on error
+        """
+        loaded = self._load(source, sample_rate)
+        if loaded is None:
+            return None
+        try:
+            mixer = self._get_mixer()
+            return self._prepare(*loaded, mixer), mixer.sample_rate
         except Exception as e:
-            logger.error(f"Failed to get default device: {e}")
+            logger.error(f"Failed to prepare audio: {str(e)}")
             return None
-    
-    def play_file(self, file_path: str, volume: Optional[float] = None) -> bool:
-        """Play an audio file.
+        
+    def play(
+        self,
+        data: np.ndarray,
+        sample_rate: int,
+        volume: Optional[float] = None,
+        gain: float = 1.0,
+        name: str = "speech",
+        loop: bool = False,
+        crossfade: float = 0.0
+    ) -> Optional[Voice]:
+        """Start playing audio data through the mixer without blocking.
         
         Args:
-            file_path: Path to the audio file to play
+            data: Audio data in the range [-1, 1] or int16, mono or multi-channel
+            sample_rate: Sample rate of the audio data
             volume: Optional volume override (1-11)
+            gain: Additional linear gain for this voice
+            name: Voice label, used by stop() to stop a group of voices
+            loop: Whether to repeat the clip until stopped, for ambient beds
+            crossfade: If positive, clips with the same name fade out over
+                      this many seconds while this one fades in
             
         Returns:
-            True if playback successful, False otherwise
+            The playing voice, or None if playback could not start
         """
         try:
-            # Load the audio file
-            data, src_rate = sf.read(file_path)
-            
-            # Ensure audio data is float32 in range [-1, 1]
-            if data.dtype != 'float32':
-                data = data.astype('float32')
-            
-            # Get the device's sample rate
-            device_rate = int(sd.default.samplerate)  # type: ignore
-            
-            # Resample if necessary
-            if src_rate != device_rate:
-                logger.debug(f"Resampling from {src_rate}Hz to {device_rate}Hz")
-                samples = len(data)
-                new_samples = int(samples * device_rate / src_rate)
-                data = signal.resample(data, new_samples)
-            
-            # Apply volume scaling
-            current_volume = volume if volume is not None else self.volume
-            current_volume = max(self.MIN_VOLUME, min(self.MAX_VOLUME, current_volume))
-            # Convert 1-11 range to 0-1 range for audio scaling
-            volume_scale = (current_volume - 1) / (self.MAX_VOLUME - 1)
-            data *= volume_scale
-            
-            # Play the audio
-            sd.play(data, device_rate)
-            sd.wait()  # Wait until file is done playing
-            return True
+            voice = self._with_mixer(lambda mixer: mixer.play(
+                self._prepare(data, sample_rate, mixer), gain=self._volume_scale(volume) * gain,
+                name=name, loop=loop, crossfade=crossfade
+            ))
+            if volume is None:
+                self._volume_voices[voice] = gain
+            return voice
             
         except Exception as e:
             logger.error(f"Failed to play audio: {str(e)}")
-            return False
-    
-    def stop(self) -> None:
-        """Stop current playback."""
+            return None
+            
+    def _load(self, source: Union[str, Path, np.ndarray], sample_rate: Optional[int]) -> Optional[Tuple[np.ndarray, int]]:
+        """Load a file, from the clip cache if there is one, or pass array data through.
+        
+        Without a clip cache, 16-bit PCM WAVs (what process_file writes) are
+        memory-mapped rather than decoded, so a device-rate mono clip plays
+        straight from the mapped file with no per-play copies.
+        
+        Args:
+            source: Path to an audio file, or audio data
+            sample_rate: Sample rate of array data
+            
+        Returns:
+            Tuple of (data, sample_rate), or None if the file could not be read
+        """
+        if isinstance(source, np.ndarray):
+            if sample_rate is None:
+                raise ValueError("sample_rate is required for array data")
+            return source, sample_rate
+            
         try:
-            sd.stop()
-            logger.info("Stopped audio playback")
+            if self.clip_cache is not None:
+                # Decoded once at the device rate, played without copies
+                src_rate = self._get_mixer().sample_rate
+                return self.clip_cache.get(source, src_rate), src_rate
+            mapped = map_wav(source)
+            if mapped is not None:
+                return mapped
+            # Load the audio file directly in the playback dtype, in range [-1, 1]
+            data, src_rate = sf.read(str(source), dtype=self.dtype.name)
+            return data, src_rate
+            
         except Exception as e:
-            logger.error(f"Failed to stop playback: {str(e)}")
+            logger.error(f"Failed to play audio: {str(e)}")
+            return None
+            
+    def _prepare(self, data: np.ndarray, sample_rate: int, mixer: Mixer) -> np.ndarray:
+        """Convert audio data to mono at the mixer rate.
+        
+        Args:
+            data: Audio data in the range [-1, 1] or int16
+            sample_rate: Sample rate of the audio data
+            mixer: Mixer the data will play on
+            
+        Returns:
+            Mono samples at the mixer rate. Device-rate int16 data is passed
+            through for the mixer to scale
+        """
+        data = np.asarray(data)
+        if data.dtype == np.int16 and data.ndim == 1 and sample_rate == mixer.sample_rate:
+            return data
+        if data.dtype == np.int16:
+            data = data / np.float32(32768)
+        
+        # Mix down to mono
+        data = data.astype(self.dtype, copy=False)
+        if data.ndim > 1:
+            data = np.mean(data, axis=1)
+        
+        # Resample if necessary
+        if sample_rate != mixer.sample_rate:
+            logger.debug(f"Resampling from {sample_rate}Hz to {mixer.sample_rate}Hz")
+            data = resample(data, sample_rate, mixer.sample_rate).astype(self.dtype, copy=False)
+        return data
+        
+    def _volume_scale(self, volume: Optional[float] = None) -> float:
+        """Convert a 1-11 volume level to a linear gain.
+        
+        Args:
+            volume: Optional volume override, defaults to the player volume
+            
+        Returns:
+            Linear gain between 0 and 1
+        """
+        current_volume = volume if volume is not None else self.volume
+        current_volume = max(self.MIN_VOLUME, min(self.MAX_VOLUME, current_volume))
+        # Convert 1-11 range to 0-1 range for audio scaling
+        return (current_volume - 1) / (self.MAX_VOLUME - 1)
+        
+    def _get_mixer(self) -> Mixer:
+        """Get the mixer for the configured output device, creating it on first use.
+        
+        A mixer opened before the device was re-probed, by this player or
+        another, has a dead stream and is replaced.
+        
+        Returns:
+            Mixer at the device's sample rate
+        """
+        capabilities = self.device.capabilities
+        generation = self.device.generation
+        if (self.mixer is None or self.mixer.sample_rate != capabilities.sample_rate
+                or self.mixer.device != capabilities.device_id
+                or self._mixer_generation != generation):
+            if self.mixer is not None:
+                self.mixer.close()
+            self.mixer = Mixer(
+                capabilities.sample_rate,
+                block_size=self.block_size,
+                dtype=self.output_dtype,
+                device=capabilities.device_id
+            )
+            self._mixer_generation = generation
+            if self._ducking is not None:
+                self.mixer.set_ducking(*self._ducking)
+        return self.mixer
+        
+    def _with_mixer(self, action: Callable[[Mixer], T]) -> T:
+        """Run a mixer action, re-probing the device and retrying once if the stream fails.
+        
+        A device that was unplugged or replaced shows up as a PortAudio error
+        when the stream is opened. The stale stream is dropped and the action
+        runs again on a new mixer for the re-probed device.
+        
+        Args:
+            action: Function using the mixer, such as adding a voice
+            
+        Returns:
+            The action's result
+        """
+        try:
+            return action(self._get_mixer())
+        except sd.PortAudioError as e:
+            logger.warning(f"Audio device error: {e}")
+            self.close()
+            self.device.reprobe()
+            return action(self._get_mixer())
+        
+    def start(self) -> None:
+        """Open the output stream ahead of the first clip to hide device wake-up."""
+        try:
+            self._with_mixer(lambda mixer: mixer.start())
+        except Exception as e:
+            logger.error(f"Failed to start audio stream: {str(e)}")
+            
+    def stop(self, name: Optional[str] = None, fade: float = DEFAULT_RAMP) -> None:
+        """Stop current playback.
+        
+        Args:
+            name: Optional voice label, only voices with this label are stopped
+            fade: Fade-out time in seconds, short by default to avoid a click
+        """
+        if self.mixer is not None:
+            self.mixer.stop_all(name, fade)
+            logger.info("Stopped audio playback")
+            
+    def close(self) -> None:
+        """Stop playback and close the output stream."""
+        if self.mixer is not None:
+            self.mixer.close()
+            self.mixer = None
     
     @property
     def is_playing(self) -> bool:
@@ -195,7 +456,4 @@ class AudioPlayer:
         Returns:
             True if audio is playing, False otherwise
         """
-        try:
-            return sd.get_stream() is not None
-        except Exception:
-            return False 
\ No newline at end of file
+        return self.mixer is not None and bool(self.mixer.voices) 
\ No newline at end of file
@@ -1,14 +1,28 @@
 """AWS Polly integration for text-to-speech."""
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
-import boto3
+from typing import Any, Callable, Iterator, List, Optional, Sequence
 from loguru import logger
+from src.aws import ClientRegistry, get_client_registry
 from src.quotes import UrgencyLevel
+from .polly_cache import PollyCache, get_polly_cache
+from .polly_batch import SynthesisRequest, SynthesisResult, TokenBucket, backoff_delay, is_retryable
 
 class PollyClient:
-    """AWS Polly client for text-to-speech synthesis."""
+    """AWS Polly client for text-to-speech synthesis.
+    
+    Responses are kept in an on-disk PollyCache, so a phrase that was
+    synthesized before is read from disk instead of requested again.
+    """
+    
+    # Synthesis settings, part of the cache key
+    ENGINE = 'neural'
+    OUTPUT_FORMAT = 'pcm'
+    SAMPLE_RATE = '16000'
     
     # SSML templates for different urgency levels
     URGENCY_TEMPLATES = {
@@ -27,18 +41,82 @@ class PollyClient:
         'casual': '{text}'
     }
     
-    def __init__(self, profile_name: str = 'trooper', region_name: str = 'us-east-1'):
-        """Initialize Polly client with AWS credentials."""
-        try:
-            self.polly = boto3.Session(
-                profile_name=profile_name,
-                region_name=region_name
-            ).client('polly')
-            self.voice_id = "Matthew"  # Default voice
-            logger.info(f"Initialized Polly client with voice: {self.voice_id}")
-        except Exception as e:
-            logger.error(f"Failed to initialize Polly client: {str(e)}")
-            raise
+    def __init__(
+        self,
+        profile_name: str = 'trooper',
+        region_name: str = 'us-east-1',
+        cache: Optional[PollyCache] = None,
+        use_cache: bool = True,
+        client: Optional[Any] = None,
+        max_pool_connections: int = 10,
+        registry: Optional[ClientRegistry] = None
+    ):
+        """Initialize Polly client settings.
+        
+        The AWS client is taken from the shared client registry on first
+        use, so creating a PollyClient is cheap and instances share one
+        connection pool.
+        
+        Args:
+            profile_name: AWS profile name
+            region_name: AWS region
+            cache: Optional response cache. Defaults to the shared on-disk cache
+            use_cache: Whether to cache responses at all
+            client: Optional client to use instead of a shared one, such as
+                   a stand-in for tests
+            max_pool_connections: HTTP connections kept by the client, the
+                                 most requests synthesize_many() can have
+                                 in flight
+            registry: Optional client registry. Defaults to the process-wide one
+        """
+        # An empty cache is falsy, so compare with None
+        self.cache = (cache if cache is not None else get_polly_cache()) if use_cache else None
+        self.profile_name = profile_name
+        self.region_name = region_name
+        self.max_pool_connections = max_pool_connections
+        self.registry = registry
+        self._client = client
+        # A client passed in is used for batches as well
+        self._batch_client: Optional[Any] = client
+        self.voice_id = "Matthew"  # Default voice
+    
+    @property
+    def sample_rate(self) -> int:
+        """Sample rate of the returned PCM (Hz)."""
+        return int(self.SAMPLE_RATE)
+    
+    @property
+    def polly(self) -> Any:
+        """AWS Polly client, created or shared on first access.
+        
+        One client is shared by all threads, boto3 clients are thread-safe.
+        """
+        if self._client is None:
+            try:
+                registry = self.registry or get_client_registry()
+                self._client = registry.client(
+                    'polly', self.profile_name, self.region_name, self.max_pool_connections
+                )
+                logger.info(f"Initialized Polly client with voice: {self.voice_id}")
+            except Exception as e:
+                logger.error(f"Failed to initialize Polly client: {str(e)}")
+                raise
+        return self._client
+    
+    @property
+    def batch_polly(self) -> Any:
+        """AWS Polly client for synthesize_many(), created or shared on first access.
+        
+        It makes a single attempt per request, so throttling reaches the
+        token bucket instead of being retried inside botocore. A client
+        passed to the constructor is used as is.
+        """
+        if self._batch_client is None:
+            registry = self.registry or get_client_registry()
+            self._batch_client = registry.client(
+                'polly', self.profile_name, self.region_name, self.max_pool_connections, max_attempts=1
+            )
+        return self._batch_client
     
     def apply_ssml_template(self, text: str, urgency: str = 'medium', context: str = 'patrol') -> str:
         """Apply SSML template based on urgency and context.
@@ -92,20 +170,7 @@ class PollyClient:
             # Apply SSML templates
             ssml_text = self.apply_ssml_template(text, urgency, context)
             logger.debug(f"Generated SSML: {ssml_text}")
-            
-            response = self.polly.synthesize_speech(
-                Text=ssml_text,
-                TextType='ssml',
-                OutputFormat='pcm',
-                SampleRate='16000',
-                VoiceId=self.voice_id,
-                Engine='neural'
-            )
-            
-            if "AudioStream" not in response:
-                raise ValueError("No AudioStream in Polly response")
-            
-            audio_data = response['AudioStream'].read()
+            audio_data = self.synthesize(ssml_text)
             
             if output_path:
                 path = Path(output_path)
@@ -122,11 +187,227 @@ class PollyClient:
             logger.error(f"Failed to generate speech: {str(e)}")
             raise
     
+    def generate_speech_stream(self, text: str, urgency: str = 'medium', context: str = 'patrol',
+                               chunk_size: int = 4096) -> Iterator[bytes]:
+        """Generate speech from text, yielding audio as it arrives from Polly.
+        
+        Processing and playback can start on the first chunk instead of
+        waiting for the whole response. A complete response is cached like
+        one from generate_speech().
+        
+        Args:
+            text: The text to convert to speech
+            urgency: Urgency level for SSML template
+            context: Context for SSML template
+            chunk_size: Bytes to read from the response at a time
+            
+        Yields:
+            Raw PCM chunks, each a whole number of 16-bit samples
+        """
+        try:
+            ssml_text = self.apply_ssml_template(text, urgency, context)
+            logger.debug(f"Generated SSML: {ssml_text}")
+            yield from self.synthesize_stream(ssml_text, chunk_size)
+            
+        except Exception as e:
+            logger.error(f"Failed to generate speech: {str(e)}")
+            raise
+    
+    def synthesize(self, ssml_text: str, client: Optional[Any] = None) -> bytes:
+        """Synthesize SSML, using the cache when possible.
+        
+        Args:
+            ssml_text: Final SSML to send to Polly
+            client: Optional Polly client to send it with, defaults to polly
+            
+        Returns:
+            Raw PCM audio data
+        """
+        return b"".join(self.synthesize_stream(ssml_text, chunk_size=64 * 1024, client=client))
+    
+    def synthesize_stream(self, ssml_text: str, chunk_size: int = 4096, client: Optional[Any] = None) -> Iterator[bytes]:
+        """Synthesize SSML, yielding audio as it is received.
+        
+        A cache hit is yielded as one chunk. On a miss the response is
+        stored once it has been read to the end.
+        
+        Args:
+            ssml_text: Final SSML to send to Polly
+            chunk_size: Bytes to read from the response at a time
+            client: Optional Polly client to send it with, defaults to polly
+            
+        Yields:
+            Raw PCM chunks, each a whole number of 16-bit samples
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(ssml_text, self.voice_id, self.ENGINE, self.OUTPUT_FORMAT, self.SAMPLE_RATE)
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug(f"Polly cache hit: {key[:12]}")
+                yield cached
+                return
+        
+        response = (client if client is not None else self.polly).synthesize_speech(
+            Text=ssml_text,
+            TextType='ssml',
+            OutputFormat=self.OUTPUT_FORMAT,
+            SampleRate=self.SAMPLE_RATE,
+            VoiceId=self.voice_id,
+            Engine=self.ENGINE
+        )
+        
+        if "AudioStream" not in response:
+            raise ValueError("No AudioStream in Polly response")
+        
+        stream = response['AudioStream']
+        received = []
+        carry = b""
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            received.append(chunk)
+            # Hold back a split sample until its second byte arrives
+            data = carry + chunk
+            cut = len(data) - len(data) % 2
+            carry = data[cut:]
+            if cut:
+                yield data[:cut]
+        
+        if self.cache is not None and key is not None:
+            self.cache.put(key, b"".join(received))
+    
+    def synthesize_many(
+        self,
+        requests: Sequence[SynthesisRequest],
+        max_workers: int = 4,
+        rate: float = 5.0,
+        max_retries: int = 6,
+        on_result: Optional[Callable[[SynthesisResult], None]] = None
+    ) -> List[SynthesisResult]:
+        """Synthesize many lines concurrently within a request rate.
+        
+        Lines already in the cache are served at once without a request.
+        The rest run on a thread pool sharing this client, each request
+        taking a token from an adaptive token bucket. Throttling and
+        transient service errors are retried with jittered exponential
+        backoff and lower the request rate. Every response is cached as soon
+        as it arrives, so an interrupted run resumes where it stopped.
+        
+        Args:
+            requests: Lines to synthesize
+            max_workers: Concurrent requests, capped by max_pool_connections
+            rate: Maximum requests per second
+            max_retries: Retries per line before giving up
+            on_result: Optional callback run in the calling thread as each
+                      line completes, e.g. to save it
+            
+        Returns:
+            One result per request, in order
+        """
+        start = time.perf_counter()
+        results: List[Optional[SynthesisResult]] = [None] * len(requests)
+        pending = []
+        
+        def finish(index: int, result: SynthesisResult) -> None:
+            results[index] = result
+            if not result.ok:
+                logger.error(f"Failed to synthesize '{result.request.text}': {result.error}")
+            if on_result is not None:
+                on_result(result)
+        
+        for index, request in enumerate(requests):
+            ssml_text = self.apply_ssml_template(request.text, request.urgency, request.context)
+            cached = None
+            if self.cache is not None:
+                key = self.cache.key(ssml_text, self.voice_id, self.ENGINE, self.OUTPUT_FORMAT, self.SAMPLE_RATE)
+                cached = self.cache.get(key)
+            if cached is not None:
+                finish(index, SynthesisResult(request, audio=cached, cached=True))
+            else:
+                pending.append((index, request, ssml_text))
+        
+        if pending:
+            bucket = TokenBucket(rate)
+            client = self.batch_polly
+            workers = max(1, min(max_workers, self.max_pool_connections, len(pending)))
+            logger.info(f"Synthesizing {len(pending)} lines with {workers} workers at up to {rate:g} requests/s "
+                        f"({len(requests) - len(pending)} cached)")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="polly") as executor:
+                futures = {
+                    executor.submit(self._synthesize_with_retry, request, ssml_text, client, bucket, max_retries): index
+                    for index, request, ssml_text in pending
+                }
+                for future in as_completed(futures):
+                    finish(futures[future], future.result())
+        
+        elapsed = time.perf_counter() - start
+        failed = sum(1 for result in results if result is None or not result.ok)
+        logger.info(f"Synthesized {len(requests)} lines in {elapsed:.1f}s ({failed} failed)")
+        return [result for result in results if result is not None]
+    
+    def _synthesize_with_retry(
+        self,
+        request: SynthesisRequest,
+        ssml_text: str,
+        client: Any,
+        bucket: TokenBucket,
+        max_retries: int
+    ) -> SynthesisResult:
+        """Synthesize one line for synthesize_many(), retrying transient errors.
+        
+        Args:
+            request: Line to synthesize
+            ssml_text: Final SSML for the line
+            client: Polly client without retries of its own
+            bucket: Shared rate limiter
+            max_retries: Retries before giving up
+            
+        Returns:
+            Result for the line
+        """
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            bucket.acquire()
+            attempt += 1
+            try:
+                audio = self.synthesize(ssml_text, client)
+                bucket.succeeded()
+                return SynthesisResult(request, audio=audio, attempts=attempt, seconds=time.perf_counter() - start)
+            except Exception as e:
+                if not is_retryable(e) or attempt > max_retries:
+                    return SynthesisResult(request, error=str(e), attempts=attempt, seconds=time.perf_counter() - start)
+                bucket.throttled()
+                delay = backoff_delay(attempt - 1)
+                logger.debug(f"Retrying '{request.text[:30]}' in {delay:.2f}s after: {str(e)}")
+                time.sleep(delay)
+    
     def set_voice(self, voice_id: str) -> None:
-        """Change the Polly voice ID."""
+        """Change the Polly voice ID.
+        
+        On the shared client from get_polly_client() this changes the voice
+        for every caller. Use a separate PollyClient for a different voice.
+        """
         self.voice_id = voice_id
         logger.info(f"Changed voice to: {voice_id}")
 
+_default_client: Optional[PollyClient] = None
+_default_lock = threading.Lock()
+
+def get_polly_client() -> PollyClient:
+    """Get the process-wide Polly client with default settings.
+    
+    Its settings, such as voice_id, are shared by every caller, so leave
+    them as they are and create a PollyClient to use other ones.
+    
+    Returns:
+        Shared PollyClient instance
+    """
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = PollyClient()
+        return _default_client
+
 def get_polly_ssml(text: str, urgency: UrgencyLevel) -> str:
     """Generate SSML text for AWS Polly with appropriate effects.
     
@@ -0,0 +1,140 @@
+"""Support for concurrent, rate-limited Polly synthesis.
+
+Building the quote library synthesizes hundreds of lines whose cost is almost
+all network latency, so PollyClient.synthesize_many() runs them on a thread
+pool sharing one client. The helpers here keep that within Polly's request
+rate: a token bucket that slows down when Polly throttles and speeds up again
+on success, and jittered exponential backoff between retries.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from botocore.exceptions import ClientError
+
+# Error codes worth retrying after a pause
+RETRYABLE_ERRORS = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "Throttling",
+    "ServiceUnavailable",
+    "ServiceFailureException",
+}
+
+@dataclass
+class SynthesisRequest:
+    """A line to synthesize."""
+
+    text: str
+    urgency: str = 'medium'
+    context: str = 'patrol'
+    output_path: Optional[Path] = None
+
+@dataclass
+class SynthesisResult:
+    """Outcome of synthesizing a single line."""
+
+    request: SynthesisRequest
+    audio: Optional[bytes] = None
+    error: Optional[str] = None
+    cached: bool = False
+    attempts: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the line was synthesized."""
+        return self.audio is not None
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether an AWS error is throttling or a transient service failure.
+
+    Args:
+        error: Exception raised by the client
+
+    Returns:
+        True if the request should be retried
+    """
+    if not isinstance(error, ClientError):
+        return False
+    return error.response.get("Error", {}).get("Code") in RETRYABLE_ERRORS
+
+def backoff_delay(attempt: int, base: float = 0.1, cap: float = 5.0) -> float:
+    """Get a jittered exponential backoff delay.
+
+    Uses full jitter, a random delay up to the exponential bound, so workers
+    throttled together do not retry together.
+
+    Args:
+        attempt: Retry number, starting at 0
+        base: Delay bound for the first retry in seconds
+        cap: Maximum delay bound in seconds
+
+    Returns:
+        Delay in seconds
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class TokenBucket:
+    """Thread-safe token bucket with an adaptive refill rate.
+
+    Each request takes one token. Tokens refill at ``rate`` per second up to
+    ``capacity``. throttled() halves the rate and succeeded() raises it back
+    in small steps, so the pool settles just below the service limit.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: float = 0.5):
+        """Initialize the bucket, full.
+
+        Args:
+            rate: Requests per second
+            capacity: Largest burst, defaults to one second's worth
+            min_rate: Lowest rate reached by throttling
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update. Called with the lock held."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take a token, waiting for one if the bucket is empty.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def throttled(self) -> None:
+        """Halve the rate after a throttling response."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def succeeded(self) -> None:
+        """Recover a little of the rate after a successful request."""
+        with self._lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + 0.1 * self.max_rate)
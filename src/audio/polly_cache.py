@@ -0,0 +1,75 @@
+"""On-disk cache of Polly speech synthesis responses."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from .disk_cache import DiskCache
+
+# Default directory for cached Polly audio, next to the other cached audio assets
+DEFAULT_POLLY_CACHE_DIR = Path(__file__).parent.parent.parent / "assets" / "audio" / "cache" / "polly"
+
+class PollyCache(DiskCache):
+    """Cache of raw Polly audio keyed by the full synthesis request.
+
+    The key hashes the final SSML with the voice, engine, output format and
+    sample rate, which together determine the response, so a repeated
+    phrase is a file read instead of a network round trip.
+    """
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_POLLY_CACHE_DIR, max_bytes: int = 128 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding the cached audio
+            max_bytes: Total size budget in bytes
+        """
+        super().__init__(directory, max_bytes, suffix=".pcm")
+
+    @staticmethod
+    def key(ssml: str, voice_id: str, engine: str, output_format: str, sample_rate: Union[int, str]) -> str:
+        """Build the cache key for a synthesis request.
+
+        Args:
+            ssml: Final SSML sent to Polly
+            voice_id: Polly voice
+            engine: Polly engine
+            output_format: Audio format
+            sample_rate: Sample rate (Hz)
+
+        Returns:
+            Hex digest identifying the response
+        """
+        request = {
+            "ssml": ssml,
+            "voice": voice_id,
+            "engine": engine,
+            "format": output_format,
+            "sample_rate": str(sample_rate),
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss, eviction, entry and byte counts, and
+            the bytes served from disk instead of downloaded
+        """
+        stats = super().stats()
+        stats["bytes_saved"] = stats["bytes_read"]
+        return stats
+
+_default_cache: Optional[PollyCache] = None
+
+def get_polly_cache() -> PollyCache:
+    """Get the process-wide Polly cache in the default directory.
+
+    Returns:
+        Shared PollyCache instance
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PollyCache()
+    return _default_cache
@@ -48,8 +48,9 @@ def get_input_files(input_dir: Path) -> List[Path]:
 
 def process_samples():
     """Process all audio samples with Stormtrooper effects."""
-    # Initialize effect processor with WAV output
-    params = EffectParams(output_format="WAV")
+    # Initialize effect processor with WAV output. Raw Polly files are at
+    # 16 kHz, processed samples are upsampled once to 44.1 kHz
+    params = EffectParams(output_format="WAV", output_rate=44100)
     effect = StormtrooperEffect(params)
     
     # Setup directories
@@ -59,23 +60,30 @@ def process_samples():
     input_files = get_input_files(input_dir)
     logger.info(f"Found {len(input_files)} samples to process")
     
-    # Process each file
+    # Collect files that need processing
+    pending = []
     for input_file in input_files:
-        try:
-            # Always use .wav extension for processed files
-            output_file = output_dir / f"{input_file.stem}_processed.wav"
-            
-            # Skip if output exists and is newer than input
-            if output_file.exists() and output_file.stat().st_mtime > input_file.stat().st_mtime:
-                logger.info(f"Skipping {input_file.name} - already processed")
-                continue
-                
-            logger.info(f"Processing: {input_file.name}")
-            effect.process_file(str(input_file), str(output_file))
-            
-        except Exception as e:
-            logger.error(f"Failed to process {input_file.name}: {str(e)}")
+        # Always use .wav extension for processed files
+        output_file = output_dir / f"{input_file.stem}_processed.wav"
+        
+        # Skip if output exists and is newer than input
+        if output_file.exists() and output_file.stat().st_mtime > input_file.stat().st_mtime:
+            logger.info(f"Skipping {input_file.name} - already processed")
             continue
+            
+        logger.info(f"Processing: {input_file.name}")
+        pending.append((input_file, output_file))
+        
+    # Process all pending files in one batched run
+    if pending:
+        results = effect.process_files(
+            [str(input_file) for input_file, _ in pending],
+            [str(output_file) for _, output_file in pending]
+        )
+        failed = sum(1 for result in results if result is None)
+        logger.info(f"Processed {len(results) - failed} samples, {failed} failed")
+        
+    logger.info(f"Filter cache: {effect.filter_cache.stats()}")
 
 if __name__ == "__main__":
     process_samples() 
\ No newline at end of file
@@ -4,10 +4,10 @@ This module combines TTS generation, audio processing, and playback into a singl
 """
 
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 import numpy as np
-import soundfile as sf
 from loguru import logger
 
 # Add project root to Python path
@@ -15,9 +15,11 @@ project_root = Path(__file__).parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
-from src.audio.polly import PollyClient
-from src.audio.effects import StormtrooperEffect
+from src.audio.tts import TTSBackend, get_tts_backend
+from src.audio.effects import StormtrooperEffect, EffectParams, effect_seed
+from src.audio.output_cache import get_output_cache
 from src.audio import AudioPlayer, AudioError
+from src.audio.utils import write_audio_atomic
 
 def process_and_play_text(
     text: str,
@@ -25,41 +27,47 @@ def process_and_play_text(
     context: str = "general",
     play_immediately: bool = True,
     cleanup: bool = True,
-    volume: Optional[float] = None
-) -> Path:
+    volume: Optional[float] = None,
+    polly: Optional[TTSBackend] = None,
+    player: Optional[AudioPlayer] = None,
+    stream: bool = False
+) -> Optional[Path]:
     """Process text through TTS pipeline and optionally play it.
     
+    Synthesis, effects and playback all happen in memory. The processed audio
+    is only written to disk when it is kept or not played.
+    
     Args:
         text: Input text to process
         urgency: Urgency level (default: "normal")
         context: Context for voice generation (default: "general")
         play_immediately: Whether to play the audio after processing
-        cleanup: Whether to delete the temporary files after processing
-        volume: Optional volume level from 1 (quietest) to 11 (loudest)
+        cleanup: Whether to skip saving the processed audio after playing it
+        volume: Optional volume level from 1 (quietest) to 11 (loudest) for
+               this playback only, the player's own volume is left as it is
+        polly: Optional TTS backend. Defaults to the one selected by the
+               TROOPER_TTS_BACKEND environment variable, normally Polly
+        player: Optional audio player to reuse. Without one, a player is
+               created for this call and closed afterwards
+        stream: Whether to process and play audio as it arrives from Polly
+               instead of after the whole response
         
     Returns:
-        Path to the processed audio file
+        Path to the processed audio file, or None if it was not saved
         
     Raises:
         AudioError: If there's an error during processing or playback
     """
+    own_player = None
     try:
-        # Setup directories
-        temp_dir = project_root / "assets" / "audio" / "temp"
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Clean text for filename
-        clean_text = "_".join(text.split()[:3]).lower()
-        clean_text = "".join(c for c in clean_text if c.isalnum() or c == "_")
-        
-        # Generate filenames
-        base_name = f"temp_{clean_text}"
-        raw_path = temp_dir / f"{base_name}_raw.wav"
-        processed_path = temp_dir / f"{base_name}_processed.wav"
-        
         # Initialize components
-        polly = PollyClient()
-        effect = StormtrooperEffect()
+        polly = polly or get_tts_backend()
+        if play_immediately and player is None:
+            player = own_player = AudioPlayer()
+        if stream and play_immediately:
+            return _stream_and_play_text(text, urgency, context, cleanup, volume, polly, player)
+            
+        effect = StormtrooperEffect(output_cache=get_output_cache())
         
         # Generate raw audio
         logger.info(f"Generating TTS for: {text}")
@@ -76,29 +84,122 @@ def process_and_play_text(
         audio_data = np.frombuffer(pcm_data, dtype=np.int16)
         audio_float = audio_data.astype(np.float32) / 32768.0
         
-        # Save raw audio
-        sf.write(str(raw_path), audio_float, 16000, format='WAV', subtype='FLOAT')
-        
-        # Apply effects
+        # Apply effects, seeded by the text so repeats come from the cache
         logger.info("Applying Stormtrooper effect...")
-        effect.process_file(
-            str(raw_path),
-            str(processed_path)
-        )
+        processed = effect.process_array(audio_float, polly.sample_rate, seed=effect_seed(text, urgency))
         
-        # Play if requested
+        # Start playback first so saving overlaps with it
+        playback = None
         if play_immediately:
             logger.info("Playing processed audio...")
-            player = AudioPlayer()
-            if volume is not None:
-                player.set_volume(volume)
-            player.play_file(str(processed_path))
-        
-        # Cleanup if requested
-        if cleanup:
-            raw_path.unlink(missing_ok=True)
+            playback = player.play_async(processed, effect.output_rate(polly.sample_rate), volume=volume)
+            
+        # Save processed audio if it is kept or not played
+        processed_path = None
+        if not cleanup or not play_immediately:
+            processed_path = _processed_path(text)
+            write_audio_atomic(processed_path, processed, effect.output_rate(polly.sample_rate))
+            
+        # Wait for playback to finish
+        if playback is not None and not player.wait(playback):
+            raise AudioError("Playback did not finish")
             
         return processed_path
             
     except Exception as e:
-        raise AudioError(f"Error processing audio: {str(e)}") 
\ No newline at end of file
+        raise AudioError(f"Error processing audio: {str(e)}")
+        
+    finally:
+        # Close the output stream of a player made for this call
+        if own_player is not None:
+            own_player.close()
+
+def _processed_path(text: str) -> Path:
+    """Get the path processed audio for a text is saved to.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        Path in the temporary audio directory
+    """
+    # Setup directories
+    temp_dir = project_root / "assets" / "audio" / "temp"
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Clean text for filename
+    clean_text = "_".join(text.split()[:3]).lower()
+    clean_text = "".join(c for c in clean_text if c.isalnum() or c == "_")
+    
+    return temp_dir / f"temp_{clean_text}_processed.wav"
+
+def _stream_and_play_text(
+    text: str,
+    urgency: str,
+    context: str,
+    cleanup: bool,
+    volume: Optional[float],
+    polly: TTSBackend,
+    player: AudioPlayer
+) -> Optional[Path]:
+    """Play text as Polly delivers it: PCM chunks, block effects, gapless playback.
+    
+    Each chunk from Polly goes through a block-streaming effect that
+    outputs at the device rate, and each processed block is queued on the
+    player right behind the previous one. Time to first audio is logged
+    separately from the total synthesis time.
+    
+    Args:
+        text: Input text to process
+        urgency: Urgency level
+        context: Context for voice generation
+        cleanup: Whether to skip saving the processed audio
+        volume: Optional volume override (1-11) for this playback only
+        polly: TTS backend
+        player: Audio player
+        
+    Returns:
+        Path to the processed audio file, or None if it was not saved
+    """
+    start = time.perf_counter()
+        
+    # Output straight at the device rate so blocks play without resampling
+    effect = StormtrooperEffect(EffectParams(output_rate=player.device.sample_rate))
+    effect_stream = effect.stream(polly.sample_rate, seed=effect_seed(text, urgency))
+    synthesis_ms = 0.0
+    
+    def chunks() -> Iterator[np.ndarray]:
+        nonlocal synthesis_ms
+        logger.info(f"Streaming TTS for: {text}")
+        for pcm in polly.generate_speech_stream(text, urgency=urgency, context=context):
+            yield np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        synthesis_ms = (time.perf_counter() - start) * 1000
+        
+    first_audio_ms = None
+    playback = None
+    queued_seconds = 0.0
+    blocks = []
+    for block in effect_stream.process(chunks()):
+        # A block that fails to queue is skipped, the wait is on the last one queued
+        voice = player.enqueue(block, effect_stream.output_rate, volume=volume)
+        if voice is not None:
+            playback = voice
+        queued_seconds += len(block) / effect_stream.output_rate
+        if first_audio_ms is None:
+            first_audio_ms = (time.perf_counter() - start) * 1000
+        if not cleanup:
+            blocks.append(block)
+            
+    if first_audio_ms is not None:
+        logger.info(f"Time to first audio: {first_audio_ms:.0f} ms, synthesis: {synthesis_ms:.0f} ms")
+        
+    processed_path = None
+    if not cleanup and blocks:
+        processed_path = _processed_path(text)
+        write_audio_atomic(processed_path, np.concatenate(blocks), effect_stream.output_rate)
+        
+    # Wait for the last block to finish playing, at most the queued audio
+    if playback is not None and not player.wait(playback, queued_seconds):
+        raise AudioError("Playback did not finish")
+        
+    return processed_path
@@ -1,140 +1,298 @@
-"""Real-time text-to-speech with Stormtrooper effects."""
+"""Real-time text-to-speech with Stormtrooper effects.
+
+Lines run through a three-stage asyncio pipeline: synthesis, effects, then
+playback through the speech scheduler on the in-process output stream.
+Each stage works on its own line at once, so the next line is synthesized
+while the current one is processed and the one before it plays.
+"""
 
 import asyncio
-from typing import Optional
-import threading
-from queue import Queue
-import tempfile
-from pathlib import Path
-import os
-import subprocess
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
 from loguru import logger
 
-from src.audio.effects import StormtrooperEffect
-from src.audio.polly import PollyClient
+from src.audio.effects import StormtrooperEffect, EffectParams, effect_seed
+from src.audio.output_cache import OutputCache, get_output_cache
+from src.audio.tts import TTSBackend, get_tts_backend
+from src.audio.player import AudioPlayer
+from src.audio.scheduler import PRIORITY, EqualPriorityPolicy, SpeechRequest, SpeechScheduler
 from src.quotes import UrgencyLevel
 
+# Pipeline stages, in order
+STAGES = ("synthesize", "effect", "play")
+
+class _Job:
+    """A line moving through the pipeline."""
+    
+    def __init__(self, text: str, urgency: UrgencyLevel, context: str, sequence: int, future: asyncio.Future):
+        self.text = text
+        self.urgency = urgency
+        self.context = context
+        self.sequence = sequence
+        self.future = future
+        self.submitted = time.monotonic()
+        self.queued = self.submitted
+        self.audio: Optional[np.ndarray] = None
+        
+    @property
+    def entry(self) -> tuple:
+        """Priority queue entry, most urgent first, then in submission order."""
+        return (PRIORITY[self.urgency], self.sequence, self)
+        
+    def resolve(self, request: Optional[SpeechRequest]) -> None:
+        """Hand the outcome to the caller, if it is still waiting."""
+        if not self.future.done():
+            self.future.set_result(request)
+
 class RealtimeStormtrooperTTS:
-    """Real-time text-to-speech with Stormtrooper effects."""
+    """Real-time text-to-speech with Stormtrooper effects.
+    
+    Synthesis and effects are blocking, so each runs on its own single
+    worker thread and the event loop stays free. Stages are joined by
+    bounded priority queues: a burst of lines waits at the first stage
+    instead of piling up audio, and an urgent line overtakes routine ones
+    still waiting. Lines are played through a SpeechScheduler: an urgent
+    line cuts off a routine one, a less urgent line waits its turn or is
+    dropped once stale, and by default a new line of the same urgency
+    replaces the current one.
     
-    def __init__(self):
-        """Initialize the real-time TTS system."""
-        self.effect = StormtrooperEffect()
-        self.polly = PollyClient()
-        self.audio_queue: Queue = Queue()
-        self.current_task: Optional[asyncio.Task] = None
-        self.current_process: Optional[subprocess.Popen] = None
-        self.is_speaking = False
-        self.temp_dir = Path(tempfile.mkdtemp(prefix="trooper_tts_"))
-        
-        # Start audio processing thread
-        self.processing_thread = threading.Thread(target=self._process_audio_queue)
-        self.processing_thread.daemon = True
-        self.processing_thread.start()
+    Effects output at the device rate, so playback needs no resampling, and
+    one worker per stage keeps the load predictable on the Pi.
+    """
+    
+    def __init__(
+        self,
+        equal_policy: Union[EqualPriorityPolicy, str] = EqualPriorityPolicy.PREEMPT,
+        backend: Optional[TTSBackend] = None,
+        player: Optional[AudioPlayer] = None,
+        queue_size: int = 2,
+        output_cache: Optional[OutputCache] = None
+    ):
+        """Initialize the real-time TTS system.
+        
+        Args:
+            equal_policy: Handling of a line with the same urgency as the
+                         one playing
+            backend: Optional TTS backend. Defaults to the one selected by
+                    the TROOPER_TTS_BACKEND environment variable
+            player: Optional audio player to play on
+            queue_size: Lines each stage may hold waiting for the next
+            output_cache: Optional processed audio cache. Defaults to the
+                         shared on-disk cache
+        """
+        self.polly = backend or get_tts_backend()
+        self.player = player or AudioPlayer()
+        self.effect = StormtrooperEffect(
+            EffectParams(output_rate=self.player.device.sample_rate),
+            output_cache=output_cache if output_cache is not None else get_output_cache()
+        )
+        self.scheduler = SpeechScheduler(self.player, equal_policy=equal_policy)
+        self.queue_size = queue_size
+        
+        self._executors = {
+            "synthesize": ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-synthesize"),
+            "effect": ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-effect"),
+        }
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queues: Dict[str, asyncio.PriorityQueue] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: set = set()
+        
+        # Per stage: count, total and longest time in the stage, total time queued before it
+        self._stage_stats = {stage: [0, 0.0, 0.0, 0.0] for stage in STAGES}
+        self._first_audio = [0, 0.0, 0.0]
+        self._counts = {"submitted": 0, "played": 0, "failed": 0, "dropped": 0}
+        
+        self.player.start()
         logger.info("Initialized real-time Stormtrooper TTS")
         
-    async def speak(self, text: str, urgency: UrgencyLevel = UrgencyLevel.MEDIUM, context: str = 'patrol'):
+    @property
+    def is_speaking(self) -> bool:
+        """Whether a line is playing."""
+        return self.scheduler.current is not None
+        
+    async def speak(
+        self,
+        text: str,
+        urgency: UrgencyLevel = UrgencyLevel.MEDIUM,
+        context: str = 'patrol'
+    ) -> Optional[SpeechRequest]:
         """Speak text with Stormtrooper effects.
         
+        Waits until the line has played, was preempted or was dropped. When
+        the pipeline is full, waits for room before the line is accepted.
+        
         Args:
             text: Text to speak
-            urgency: Urgency level for effects
+            urgency: Urgency level for effects and scheduling
             context: Context for SSML template
-        """
-        # Cancel current speech if any
-        if self.current_task is not None:
-            self.current_task.cancel()
-            try:
-                await self.current_task
-            except asyncio.CancelledError:
-                pass
             
-        # Stop current audio if playing
-        if self.current_process is not None:
-            self.current_process.terminate()
-            self.current_process = None
+        Returns:
+            Scheduler request for the line, or None if it failed or was
+            dropped before playback
+        """
+        loop = asyncio.get_running_loop()
+        self._start_pipeline(loop)
         
-        # Create new speech task
-        self.current_task = asyncio.create_task(self._generate_and_play(text, urgency, context))
-        await self.current_task
+        job = _Job(text, UrgencyLevel(urgency), context, next(self._sequence), loop.create_future())
+        self._counts["submitted"] += 1
+        self._jobs.add(job)
+        try:
+            await self._queues["synthesize"].put(job.entry)
+            return await job.future
+        finally:
+            self._jobs.discard(job)
         
-    async def _generate_and_play(self, text: str, urgency: UrgencyLevel, context: str):
-        """Generate and play audio for text.
+    def _start_pipeline(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Create the stage queues and tasks on the running loop, once per loop."""
+        if self._loop is loop and not any(task.done() for task in self._tasks):
+            return
+        self._loop = loop
+        self._queues = {stage: asyncio.PriorityQueue(self.queue_size) for stage in STAGES}
+        self._tasks = [
+            loop.create_task(self._worker("synthesize", self._synthesize, "effect"), name="tts-synthesize"),
+            loop.create_task(self._worker("effect", self._process, "play"), name="tts-effect"),
+            loop.create_task(self._play_stage(), name="tts-play"),
+        ]
+        
+    async def _worker(self, stage: str, func, next_stage: str) -> None:
+        """Run a blocking stage on its executor for each line, then pass the line on.
         
         Args:
-            text: Text to speak
-            urgency: Urgency level for effects
-            context: Context for SSML template
+            stage: Stage name
+            func: Blocking function taking and updating a job
+            next_stage: Stage the line goes to next
         """
-        try:
-            # Create temp files
-            temp_pcm = self.temp_dir / f"{hash(text)}.pcm"
-            temp_wav = self.temp_dir / f"{hash(text)}.wav"
-            
-            # Generate speech using existing pipeline
-            self.polly.generate_speech(
-                text,
-                output_path=str(temp_pcm),
-                urgency=urgency.value,
-                context=context
-            )
-            
-            # Set effect urgency
-            self.effect.set_urgency(urgency)
-            
-            # Process with effects (this handles sample rate conversion)
-            self.effect.process_file(
-                str(temp_pcm),
-                str(temp_wav)
-            )
-            
-            # Clean up PCM file
-            temp_pcm.unlink()
-            
-            # Queue WAV for playback
-            self.audio_queue.put(temp_wav)
-            logger.debug(f"Queued audio for text: {text[:30]}...")
-            
-        except Exception as e:
-            logger.error(f"Error generating speech: {str(e)}")
-            
-    def _process_audio_queue(self):
-        """Process and play queued audio."""
+        loop = asyncio.get_running_loop()
+        queue = self._queues[stage]
         while True:
+            _, _, job = await queue.get()
             try:
-                # Get next audio file
-                audio_file = self.audio_queue.get()
-                
-                # Play audio using system player
-                self.is_speaking = True
-                self.current_process = subprocess.Popen(['afplay', str(audio_file)])
-                self.current_process.wait()
-                self.current_process = None
-                self.is_speaking = False
-                
-                # Clean up temp file
-                audio_file.unlink()
-                
+                start = self._begin(stage, job)
+                await loop.run_in_executor(self._executors[stage], func, job)
+                self._end(stage, job, start)
             except Exception as e:
-                logger.error(f"Error processing audio queue: {str(e)}")
+                logger.error(f"Speech {stage} failed for '{job.text[:30]}': {str(e)}")
+                self._counts["failed"] += 1
+                job.resolve(None)
+                continue
+            finally:
+                queue.task_done()
+            await self._queues[next_stage].put(job.entry)
+        
+    async def _play_stage(self) -> None:
+        """Hand processed lines to the scheduler and watch them play."""
+        queue = self._queues["play"]
+        while True:
+            _, _, job = await queue.get()
+            try:
+                start = self._begin("play", job)
                 
+                # The line's max age counts from when it was spoken, not from
+                # when it reached playback
+                max_age = self.scheduler.max_age.get(job.urgency)
+                if max_age:
+                    remaining = max_age - (start - job.submitted)
+                    if remaining <= 0:
+                        logger.debug(f"Dropped stale speech before playback: {job.text[:30]}")
+                        self._counts["dropped"] += 1
+                        job.resolve(None)
+                        continue
+                    max_age = remaining
+                    
+                request = self.scheduler.submit(
+                    job.audio, job.urgency, self.effect.output_rate(self.polly.sample_rate),
+                    text=job.text, max_age=max_age
+                )
+                asyncio.get_running_loop().create_task(self._watch(job, request, start))
+            finally:
+                queue.task_done()
+        
+    async def _watch(self, job: _Job, request: SpeechRequest, start: float) -> None:
+        """Wait for a line to finish and record when its audio started."""
+        await asyncio.get_running_loop().run_in_executor(None, request.wait)
+        if request.started is not None:
+            self._counts["played"] += 1
+            self._end("play", job, start, request.started)
+            first_audio = request.started - job.submitted
+            self._first_audio[0] += 1
+            self._first_audio[1] += first_audio
+            self._first_audio[2] = max(self._first_audio[2], first_audio)
+        else:
+            self._counts["dropped"] += 1
+        job.resolve(request)
+        
+    def _begin(self, stage: str, job: _Job) -> float:
+        """Record the time a line waited for a stage and return its start time."""
+        now = time.monotonic()
+        self._stage_stats[stage][3] += now - job.queued
+        return now
+        
+    def _end(self, stage: str, job: _Job, start: float, end: Optional[float] = None) -> None:
+        """Record the time a line spent in a stage."""
+        end = end if end is not None else time.monotonic()
+        stats = self._stage_stats[stage]
+        stats[0] += 1
+        stats[1] += end - start
+        stats[2] = max(stats[2], end - start)
+        job.queued = end
+        
+    def _synthesize(self, job: _Job) -> None:
+        """Synthesize a line to float samples. Runs on the synthesis thread."""
+        pcm_data = self.polly.generate_speech(
+            job.text,
+            urgency=job.urgency.value,
+            context=job.context
+        )
+        if not isinstance(pcm_data, bytes):
+            raise ValueError("Expected bytes from TTS backend")
+        job.audio = np.frombuffer(pcm_data, dtype=np.int16).astype(np.float32) / 32768.0
+        
+    def _process(self, job: _Job) -> None:
+        """Apply the Stormtrooper effect to a line. Runs on the effect thread."""
+        job.audio = self.effect.process_array(
+            job.audio, self.polly.sample_rate, urgency=job.urgency, seed=effect_seed(job.text, job.urgency)
+        )
+        
+    def metrics(self) -> Dict[str, Any]:
+        """Get pipeline metrics.
+        
+        Returns:
+            Dictionary with line counts and, per stage, the lines handled,
+            mean and longest time in the stage and mean time queued before
+            it, in milliseconds. Time in the play stage runs until the audio
+            starts. Also the mean and longest time from speak() to audio,
+            the current stage queue depths and the scheduler's metrics
+        """
+        metrics: Dict[str, Any] = dict(self._counts)
+        for stage, (count, total, longest, queued) in self._stage_stats.items():
+            metrics[f"{stage}_count"] = count
+            metrics[f"{stage}_mean_ms"] = total / count * 1000 if count else 0.0
+            metrics[f"{stage}_max_ms"] = longest * 1000
+            metrics[f"{stage}_queue_mean_ms"] = queued / count * 1000 if count else 0.0
+            queue = self._queues.get(stage)
+            metrics[f"{stage}_queue_depth"] = queue.qsize() if queue is not None else 0
+        count, total, longest = self._first_audio
+        metrics["first_audio_mean_ms"] = total / count * 1000 if count else 0.0
+        metrics["first_audio_max_ms"] = longest * 1000
+        metrics["scheduler"] = self.scheduler.metrics()
+        return metrics
+        
     def close(self):
         """Clean up resources."""
-        if self.current_task is not None:
-            self.current_task.cancel()
-            
-        if self.current_process is not None:
-            self.current_process.terminate()
-            
-        # Clean up temp directory
-        for file in self.temp_dir.glob("*.*"):
-            try:
-                file.unlink()
-            except:
-                pass
-        try:
-            self.temp_dir.rmdir()
-        except:
-            pass
-            
-        logger.info("Closed real-time TTS system") 
\ No newline at end of file
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            for task in self._tasks:
+                task.cancel()
+            for job in list(self._jobs):
+                job.resolve(None)
+        self._tasks = []
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.scheduler.close()
+        self.player.close()
+        logger.info("Closed real-time TTS system")
@@ -0,0 +1,200 @@
+"""Parallel rendering of Stormtrooper effect assets.
+
+Each clip is independent and CPU-bound, so library rebuilds spread chunks of
+files across a process pool. Every worker keeps its own StormtrooperEffect and
+batch-processes its chunk, results are reported in input order, and a failure
+in one file never affects the others. Each worker also has its own filter
+cache, so its lookups are counted per chunk and added up for the run.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import soundfile as sf
+from loguru import logger
+
+from src.quotes import UrgencyLevel
+from .effects import StormtrooperEffect, EffectParams
+
+@dataclass
+class RenderJob:
+    """A single file to render with Stormtrooper effects."""
+
+    input_path: Path
+    output_path: Optional[Path] = None
+    urgency: Optional[Union[UrgencyLevel, str]] = None
+    seed: Optional[int] = None
+
+@dataclass
+class RenderResult:
+    """Outcome of rendering a single file."""
+
+    job: RenderJob
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    audio_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file rendered successfully."""
+        return self.output_path is not None
+
+# Per-process effect instance used by pool workers
+_worker_effect: Optional[StormtrooperEffect] = None
+
+def _init_worker(params: Optional[EffectParams]) -> None:
+    """Create the effect processor for a pool worker.
+
+    Args:
+        params: Effect parameters shared by all workers
+    """
+    global _worker_effect
+    _worker_effect = StormtrooperEffect(params)
+
+def _render_chunk(jobs: Sequence[RenderJob], effect: Optional[StormtrooperEffect] = None) -> List[RenderResult]:
+    """Render a chunk of files with one batched effect run.
+
+    If the batched run raises, the jobs are retried one at a time.
+
+    Args:
+        jobs: Files to render
+        effect: Effect processor, defaults to the pool worker's instance
+
+    Returns:
+        One result per job, in order
+    """
+    effect = effect or _worker_effect or StormtrooperEffect()
+    results = []
+    try:
+        outputs = effect.process_files(
+            [job.input_path for job in jobs],
+            [job.output_path for job in jobs],
+            urgency=[job.urgency for job in jobs],
+            seed=[job.seed for job in jobs]
+        )
+    except Exception as e:
+        if len(jobs) == 1:
+            return [RenderResult(jobs[0], error=str(e))]
+        # Retry one job at a time so only the file that failed is lost
+        logger.warning(f"Chunk of {len(jobs)} files failed, rendering one by one: {str(e)}")
+        return [result for job in jobs for result in _render_chunk([job], effect)]
+
+    for job, output in zip(jobs, outputs):
+        if output is None:
+            results.append(RenderResult(job, error="processing failed"))
+            continue
+        try:
+            audio_seconds = sf.info(output).duration
+        except Exception:
+            audio_seconds = 0.0
+        results.append(RenderResult(job, output_path=output, audio_seconds=audio_seconds))
+    return results
+
+def _render_counted(
+    jobs: Sequence[RenderJob],
+    effect: Optional[StormtrooperEffect] = None
+) -> Tuple[List[RenderResult], Dict[str, int]]:
+    """Render a chunk of files and count the filter cache lookups it made.
+
+    Args:
+        jobs: Files to render
+        effect: Effect processor, defaults to the pool worker's instance
+
+    Returns:
+        One result per job in order, and the filter cache hits and misses
+    """
+    effect = effect or _worker_effect or StormtrooperEffect()
+    cache = effect.filter_cache
+    hits, misses = cache.hits, cache.misses
+    results = _render_chunk(jobs, effect)
+    return results, {"hits": cache.hits - hits, "misses": cache.misses - misses}
+
+def _chunks(jobs: Sequence[RenderJob], size: int) -> Iterator[List[RenderJob]]:
+    """Split jobs into consecutive chunks."""
+    for start in range(0, len(jobs), size):
+        yield list(jobs[start:start + size])
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Resolve a ``--jobs`` value to a worker count.
+
+    Args:
+        jobs: Requested number of workers. 0 or None uses all CPU cores
+
+    Returns:
+        Number of worker processes to use
+    """
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+def render_files(
+    jobs: Sequence[RenderJob],
+    n_jobs: int = 1,
+    params: Optional[EffectParams] = None,
+    effect: Optional[StormtrooperEffect] = None,
+    chunk_size: int = 4
+) -> List[RenderResult]:
+    """Render files with Stormtrooper effects, optionally in parallel.
+
+    Args:
+        jobs: Files to render
+        n_jobs: Number of worker processes. 1 renders in this process
+        params: Effect parameters for pool workers
+        effect: Effect processor to use when rendering in this process
+        chunk_size: Number of files each worker batch-processes at once
+
+    Returns:
+        One result per job, in input order
+    """
+    results: List[RenderResult] = []
+    total = len(jobs)
+    start = time.perf_counter()
+    filter_stats = {"hits": 0, "misses": 0}
+
+    def report(counted: Tuple[List[RenderResult], Dict[str, int]]) -> None:
+        chunk_results, chunk_stats = counted
+        for name, count in chunk_stats.items():
+            filter_stats[name] += count
+        for result in chunk_results:
+            results.append(result)
+            name = Path(result.job.input_path).name
+            if result.ok:
+                logger.info(f"[{len(results)}/{total}] Processed: {name} -> {Path(result.output_path).name}")
+            else:
+                logger.error(f"[{len(results)}/{total}] Failed to process {name}: {result.error}")
+
+    chunks = list(_chunks(jobs, max(1, chunk_size)))
+    if n_jobs <= 1 or len(chunks) <= 1:
+        effect = effect or StormtrooperEffect(params)
+        for chunk in chunks:
+            report(_render_counted(chunk, effect))
+    else:
+        workers = min(n_jobs, len(chunks))
+        logger.info(f"Rendering {total} files with {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(params,)) as pool:
+            # map() yields in submission order, keeping progress ordered
+            for counted in pool.map(_render_counted, chunks):
+                report(counted)
+
+    log_throughput(results, time.perf_counter() - start)
+    logger.info(f"Filter cache: {filter_stats['hits']} hits, {filter_stats['misses']} misses")
+    return results
+
+def log_throughput(results: Sequence[RenderResult], elapsed: float) -> None:
+    """Log a throughput summary for a render run.
+
+    Args:
+        results: Render results
+        elapsed: Wall-clock time of the run in seconds
+    """
+    rendered = [result for result in results if result.ok]
+    audio_seconds = sum(result.audio_seconds for result in rendered)
+    elapsed = max(elapsed, 1e-9)
+    logger.info(
+        f"Rendered {len(rendered)}/{len(results)} clips in {elapsed:.2f}s: "
+        f"{len(rendered) / elapsed:.2f} clips/s, "
+        f"{audio_seconds / elapsed:.2f} audio-seconds/s"
+    )
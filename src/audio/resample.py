@@ -0,0 +1,166 @@
+"""Rational polyphase resampling.
+
+``scipy.signal.resample`` transforms the whole clip with one FFT, which is
+slow for lengths with large prime factors and treats the clip as periodic,
+so it rings where the end wraps around to the start. Converting between
+rates with a small rational ratio (16000 -> 44100 is 441/160, 44100 -> 48000
+is 160/147) is cheaper and edge-clean with a polyphase FIR filter. The
+anti-aliasing filter for each rate pair is designed once and kept in the
+shared filter cache.
+"""
+
+from math import gcd
+from typing import Optional, Tuple
+import numpy as np
+import numpy.typing as npt
+from scipy import signal
+
+from .filter_cache import FilterCache, get_filter_cache
+
+# Filter half-length per unit of the larger resampling factor, as in SciPy
+HALF_LEN_FACTOR = 10
+
+# Kaiser window shape parameter, as in SciPy's resample_poly default
+KAISER_BETA = 5.0
+
+def rate_ratio(src_rate: int, dst_rate: int) -> Tuple[int, int]:
+    """Reduce a rate conversion to its up and down factors.
+
+    Args:
+        src_rate: Source sample rate (Hz)
+        dst_rate: Target sample rate (Hz)
+
+    Returns:
+        Tuple of (up, down) factors with no common divisor
+    """
+    src_rate, dst_rate = int(src_rate), int(dst_rate)
+    if src_rate <= 0 or dst_rate <= 0:
+        raise ValueError("Sample rates must be positive")
+    divisor = gcd(src_rate, dst_rate)
+    return dst_rate // divisor, src_rate // divisor
+
+def resample_filter(src_rate: int, dst_rate: int, filter_cache: Optional[FilterCache] = None) -> np.ndarray:
+    """Get the anti-aliasing FIR filter for a rate pair.
+
+    Args:
+        src_rate: Source sample rate (Hz)
+        dst_rate: Target sample rate (Hz)
+        filter_cache: Optional filter coefficient cache. Defaults to the
+                     shared on-disk cache
+
+    Returns:
+        Lowpass FIR coefficients of odd length, unscaled
+    """
+    up, down = rate_ratio(src_rate, dst_rate)
+    max_rate = max(up, down)
+    half_len = HALF_LEN_FACTOR * max_rate
+    cache = filter_cache or get_filter_cache()
+    return cache.design(
+        "resample", src_rate, (dst_rate, half_len, KAISER_BETA),
+        lambda: signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', KAISER_BETA))
+    )
+
+def resample(data: np.ndarray, src_rate: int, dst_rate: int, filter_cache: Optional[FilterCache] = None) -> np.ndarray:
+    """Resample a whole clip with a polyphase filter.
+
+    Args:
+        data: Audio data, samples along the first axis
+        src_rate: Source sample rate (Hz)
+        dst_rate: Target sample rate (Hz)
+        filter_cache: Optional filter coefficient cache
+
+    Returns:
+        Resampled audio in the input's floating-point dtype
+    """
+    data = np.asarray(data)
+    dtype = data.dtype if np.issubdtype(data.dtype, np.floating) else np.dtype(np.float32)
+    if int(src_rate) == int(dst_rate):
+        return data.astype(dtype, copy=False)
+
+    up, down = rate_ratio(src_rate, dst_rate)
+    window = resample_filter(src_rate, dst_rate, filter_cache)
+    return signal.resample_poly(data, up, down, axis=0, window=window).astype(dtype, copy=False)
+
+class StreamingResampler:
+    """Stateful polyphase resampler for audio arriving in chunks.
+
+    Concatenating the output of process() for every chunk followed by
+    flush() gives the same samples as resample() on the whole clip. Only the
+    input needed by the filter for the next output samples is kept between
+    calls, so memory use is bounded by the chunk size plus the filter length.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, dtype: npt.DTypeLike = np.float32,
+                 filter_cache: Optional[FilterCache] = None):
+        """Initialize the resampler.
+
+        Args:
+            src_rate: Source sample rate (Hz)
+            dst_rate: Target sample rate (Hz)
+            dtype: Output sample dtype
+            filter_cache: Optional filter coefficient cache
+        """
+        self.src_rate = int(src_rate)
+        self.dst_rate = int(dst_rate)
+        self.up, self.down = rate_ratio(src_rate, dst_rate)
+        self.dtype = np.dtype(dtype)
+
+        # Same filter alignment as scipy.signal.resample_poly
+        h = resample_filter(src_rate, dst_rate, filter_cache) * self.up
+        half_len = (len(h) - 1) // 2
+        pre_pad = self.down - half_len % self.down
+        self._pre_remove = (half_len + pre_pad) // self.down
+        self._h = np.concatenate([np.zeros(pre_pad), h, np.zeros(self.up)]).astype(self.dtype)
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop buffered input so the next chunk starts a new clip."""
+        self._buffer = np.zeros(0, dtype=self.dtype)
+        self._start = 0      # Absolute input index of the buffer start, a multiple of down
+        self._received = 0   # Input samples received
+        self._emitted = 0    # Output samples emitted
+
+    def _emit(self, end: int) -> np.ndarray:
+        """Compute outputs up to (not including) an absolute output index."""
+        if end <= self._emitted or not len(self._buffer):
+            return np.zeros(0, dtype=self.dtype)
+
+        # Output n sits at upfirdn index n - offset for a buffer starting at _start
+        offset = self._start * self.up // self.down - self._pre_remove
+        filtered = signal.upfirdn(self._h, self._buffer, self.up, self.down)
+        out = filtered[self._emitted - offset:end - offset].astype(self.dtype, copy=False)
+        self._emitted = end
+
+        # Keep only the input the filter still needs for the next output
+        first_needed = ((end + self._pre_remove) * self.down - len(self._h) + self.up) // self.up
+        start = max(self._start, (max(first_needed, 0) // self.down) * self.down)
+        self._buffer = self._buffer[start - self._start:]
+        self._start = start
+        return out
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Resample the next chunk of a clip.
+
+        Args:
+            chunk: Mono input samples
+
+        Returns:
+            All output samples that no longer depend on future input
+        """
+        chunk = np.asarray(chunk, dtype=self.dtype)
+        self._buffer = np.concatenate([self._buffer, chunk])
+        self._received += len(chunk)
+        ready = (self._received * self.up - 1) // self.down - self._pre_remove + 1
+        return self._emit(ready)
+
+    def flush(self) -> np.ndarray:
+        """Finish the clip, treating the input as ending here.
+
+        Returns:
+            Remaining output samples. The resampler is reset afterwards
+        """
+        total = -(-self._received * self.up // self.down)
+        self._buffer = np.concatenate([self._buffer, np.zeros(len(self._h) // self.up + 1, dtype=self.dtype)])
+        out = self._emit(total)
+        self.reset()
+        return out
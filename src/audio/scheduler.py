@@ -0,0 +1,386 @@
+"""Urgency-aware scheduling of speech playback."""
+
+import heapq
+import itertools
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from loguru import logger
+
+from src.quotes import UrgencyLevel
+from .mixer import Voice
+from .player import AudioPlayer
+
+# Lower value plays first
+PRIORITY = {
+    UrgencyLevel.HIGH: 0,
+    UrgencyLevel.MEDIUM: 1,
+    UrgencyLevel.LOW: 2,
+}
+
+# Seconds a line may wait before it is stale and dropped, None for no limit
+# and 0 to drop it unless it can play at once
+DEFAULT_MAX_AGE: Dict[UrgencyLevel, Optional[float]] = {
+    UrgencyLevel.HIGH: None,
+    UrgencyLevel.MEDIUM: 10.0,
+    UrgencyLevel.LOW: 3.0,
+}
+
+class EqualPriorityPolicy(str, Enum):
+    """What to do with a line of the same priority as the one playing."""
+    QUEUE = "queue"      # Play it after the current line
+    PREEMPT = "preempt"  # Cut the current line short
+    DROP = "drop"        # Discard it
+
+class RequestState(str, Enum):
+    """Lifecycle of a speech request."""
+    QUEUED = "queued"
+    PLAYING = "playing"
+    FINISHED = "finished"
+    PREEMPTED = "preempted"
+    DROPPED = "dropped"
+
+class SpeechRequest:
+    """A line submitted to the scheduler, and the caller's handle on it."""
+
+    def __init__(
+        self,
+        source: Union[str, Path, np.ndarray],
+        urgency: UrgencyLevel,
+        sample_rate: Optional[int],
+        text: str,
+        max_age: Optional[float],
+        sequence: int
+    ):
+        """Initialize the request.
+
+        Args:
+            source: Path to an audio file, or audio data
+            urgency: Urgency of the line
+            sample_rate: Sample rate of array data
+            text: Text of the line, for logging
+            max_age: Seconds the line may wait before it is dropped
+            sequence: Submission order, breaking ties between equal priorities
+        """
+        self.source = source
+        self.urgency = UrgencyLevel(urgency)
+        self.sample_rate = sample_rate
+        self.text = text
+        self.max_age = max_age
+        self.sequence = sequence
+        self.state = RequestState.QUEUED
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.voice: Optional[Voice] = None
+        self._done = threading.Event()
+
+    @property
+    def priority(self) -> int:
+        """Scheduling priority, lower plays first."""
+        return PRIORITY[self.urgency]
+
+    @property
+    def wait_time(self) -> float:
+        """Seconds between submission and the start of playback, or until now."""
+        end = self.started if self.started is not None else time.monotonic()
+        return end - self.submitted
+
+    @property
+    def done(self) -> bool:
+        """Whether the line has finished, was preempted or was dropped."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the line is done.
+
+        Args:
+            timeout: Optional timeout in seconds
+
+        Returns:
+            True if the line is done, False on timeout
+        """
+        return self._done.wait(timeout)
+
+    def _finish(self, state: RequestState) -> None:
+        """Move to a final state and wake any waiters."""
+        self.state = state
+        self._done.set()
+
+    def __repr__(self) -> str:
+        return f"SpeechRequest(urgency={self.urgency.value!r}, state={self.state.value!r}, text={self.text[:30]!r})"
+
+class SpeechScheduler:
+    """Plays speech one line at a time in order of urgency.
+
+    Lines wait in a priority queue keyed on urgency, then submission order.
+    A HIGH line preempts a lower priority line mid-clip with a short
+    crossfade. Lines of the same priority as the one playing are queued,
+    preempt it or are dropped, depending on the equal-priority policy. A
+    queued line older than the max age for its urgency is stale and is
+    dropped instead of played, so a burst of motion events does not leave a
+    backlog of outdated lines.
+    """
+
+    def __init__(
+        self,
+        player: AudioPlayer,
+        equal_policy: Union[EqualPriorityPolicy, str] = EqualPriorityPolicy.QUEUE,
+        max_age: Optional[Dict[UrgencyLevel, Optional[float]]] = None,
+        max_queue: int = 8,
+        preempt_fade: float = 0.05,
+        poll_interval: float = 0.01,
+        name: str = "speech"
+    ):
+        """Initialize the scheduler and start its dispatch thread.
+
+        Args:
+            player: Player the lines are played on
+            equal_policy: Handling of lines with the same priority as the
+                         one playing
+            max_age: Seconds a line of each urgency may wait, None for no
+                    limit and 0 to play at once or drop. Defaults to
+                    DEFAULT_MAX_AGE
+            max_queue: Maximum queued lines, the least urgent are dropped
+            preempt_fade: Crossfade time in seconds when a line is preempted
+            poll_interval: How often to check whether the current line has
+                          finished, in seconds
+            name: Voice label used for speech on the player
+        """
+        self.player = player
+        self.equal_policy = EqualPriorityPolicy(equal_policy)
+        self.max_age = dict(DEFAULT_MAX_AGE)
+        if max_age is not None:
+            self.max_age.update(max_age)
+        self.max_queue = max_queue
+        self.preempt_fade = preempt_fade
+        self.poll_interval = poll_interval
+        self.name = name
+
+        self._queue: List[Tuple[int, int, SpeechRequest]] = []
+        self._current: Optional[SpeechRequest] = None
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._counts = {
+            "submitted": 0,
+            "played": 0,
+            "finished": 0,
+            "preempted": 0,
+            "dropped_stale": 0,
+            "dropped_policy": 0,
+            "dropped_overflow": 0,
+            "failed": 0,
+        }
+        self._max_depth = 0
+        self._waits: Dict[UrgencyLevel, List[float]] = {level: [0, 0.0, 0.0] for level in UrgencyLevel}
+
+        self._thread = threading.Thread(target=self._run, name="speech-scheduler", daemon=True)
+        self._thread.start()
+
+    @property
+    def current(self) -> Optional[SpeechRequest]:
+        """Line currently playing, if any."""
+        with self._cond:
+            return self._current
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of lines waiting to play."""
+        with self._cond:
+            return len(self._queue)
+
+    def submit(
+        self,
+        source: Union[str, Path, np.ndarray],
+        urgency: Union[UrgencyLevel, str] = UrgencyLevel.MEDIUM,
+        sample_rate: Optional[int] = None,
+        text: str = "",
+        max_age: Optional[float] = None
+    ) -> SpeechRequest:
+        """Submit a line for playback.
+
+        Args:
+            source: Path to an audio file, or audio data in the range [-1, 1]
+            urgency: Urgency of the line
+            sample_rate: Sample rate of array data, ignored for files
+            text: Text of the line, for logging
+            max_age: Optional override of the max age for the urgency
+
+        Returns:
+            Request handle. It is already done if the line was dropped
+        """
+        urgency = UrgencyLevel(urgency)
+        with self._cond:
+            request = SpeechRequest(
+                source, urgency, sample_rate, text,
+                max_age if max_age is not None else self.max_age.get(urgency),
+                next(self._sequence)
+            )
+            self._counts["submitted"] += 1
+
+            current = self._current
+            if (self.equal_policy == EqualPriorityPolicy.DROP and current is not None
+                    and current.priority == request.priority):
+                self._drop(request, "dropped_policy")
+                return request
+            if request.max_age == 0 and (current is not None or self._queue):
+                # Play now or not at all
+                self._drop(request, "dropped_stale")
+                return request
+
+            heapq.heappush(self._queue, (request.priority, request.sequence, request))
+            if len(self._queue) > self.max_queue:
+                # Drop the least urgent, most recent line
+                worst = max(self._queue)
+                self._queue.remove(worst)
+                heapq.heapify(self._queue)
+                self._drop(worst[2], "dropped_overflow")
+            self._max_depth = max(self._max_depth, len(self._queue))
+            self._cond.notify()
+        return request
+
+    def _drop(self, request: SpeechRequest, reason: str) -> None:
+        """Drop a line without playing it. Called with the lock held."""
+        self._counts[reason] += 1
+        request._finish(RequestState.DROPPED)
+        logger.debug(f"Dropped speech ({reason}): {request.text[:30]}")
+
+    def _preempts(self, request: SpeechRequest, current: SpeechRequest) -> bool:
+        """Whether a queued line should cut the current one short."""
+        if request.priority == current.priority:
+            return self.equal_policy == EqualPriorityPolicy.PREEMPT
+        return request.urgency == UrgencyLevel.HIGH and request.priority < current.priority
+
+    def _run(self) -> None:
+        """Dispatch loop, starting the next line when the current one ends or is preempted."""
+        while True:
+            with self._cond:
+                request = self._next()
+                while request is None and not self._closed:
+                    self._cond.wait(self.poll_interval if self._current is not None else None)
+                    request = self._next()
+                if request is None:
+                    return
+
+            # Decoding and resampling can take a while, so they run without
+            # the lock and never hold up submit()
+            loaded = self.player.load(request.source, request.sample_rate)
+
+            with self._cond:
+                self._start(request, loaded)
+
+    def _next(self) -> Optional[SpeechRequest]:
+        """Retire the current line if it ended, drop stale lines and pick the next one.
+
+        Called with the lock held.
+
+        Returns:
+            Line to start, removed from the queue, or None if nothing should
+            start yet
+        """
+        if self._closed:
+            return None
+        now = time.monotonic()
+        current = self._retire()
+
+        # Stale lines are dropped rather than played late
+        fresh = []
+        for entry in self._queue:
+            request = entry[2]
+            if request.max_age and now - request.submitted > request.max_age:
+                self._drop(request, "dropped_stale")
+            else:
+                fresh.append(entry)
+        if len(fresh) != len(self._queue):
+            heapq.heapify(fresh)
+            self._queue = fresh
+
+        if self._queue:
+            request = self._queue[0][2]
+            if current is None or self._preempts(request, current):
+                heapq.heappop(self._queue)
+                return request
+        return None
+
+    def _retire(self) -> Optional[SpeechRequest]:
+        """Finish the current line if its voice has ended. Called with the lock held.
+
+        Returns:
+            Line still playing, if any
+        """
+        current = self._current
+        if current is not None and (current.voice is None or current.voice.done):
+            self._counts["finished"] += 1
+            current._finish(RequestState.FINISHED)
+            current = self._current = None
+        return current
+
+    def _start(self, request: SpeechRequest, loaded: Optional[Tuple[np.ndarray, int]]) -> None:
+        """Start playing a loaded line, preempting the current one. Called with the lock held.
+
+        The current line is only finished once the new voice is playing, so
+        a line that fails to start leaves it playing as before.
+        """
+        if self._closed:
+            self._drop(request, "dropped_policy")
+            return
+        request.started = time.monotonic()
+        stats = self._waits[request.urgency]
+        stats[0] += 1
+        stats[1] += request.wait_time
+        stats[2] = max(stats[2], request.wait_time)
+
+        # The current line may have ended on its own while this one loaded
+        current = self._retire()
+        crossfade = self.preempt_fade if current is not None else 0.0
+        if loaded is not None:
+            request.voice = self.player.play(*loaded, name=self.name, crossfade=crossfade)
+        if request.voice is None:
+            self._counts["failed"] += 1
+            request._finish(RequestState.DROPPED)
+            return
+        if current is not None:
+            self._counts["preempted"] += 1
+            current._finish(RequestState.PREEMPTED)
+            logger.info(f"Preempting {current.urgency.value} speech with {request.urgency.value}")
+        self._counts["played"] += 1
+        request.state = RequestState.PLAYING
+        self._current = request
+
+    def metrics(self) -> Dict[str, Union[int, float]]:
+        """Get scheduler metrics.
+
+        Returns:
+            Dictionary with request counts, current and maximum queue
+            depth, and the mean and maximum wait before playback per urgency
+        """
+        with self._cond:
+            metrics: Dict[str, Union[int, float]] = dict(self._counts)
+            metrics["queue_depth"] = len(self._queue)
+            metrics["max_queue_depth"] = self._max_depth
+            for level, (count, total, longest) in self._waits.items():
+                metrics[f"wait_{level.value}_mean"] = total / count if count else 0.0
+                metrics[f"wait_{level.value}_max"] = longest
+            return metrics
+
+    def clear(self) -> None:
+        """Drop all queued lines, leaving the current one playing."""
+        with self._cond:
+            for _, _, request in self._queue:
+                self._drop(request, "dropped_policy")
+            self._queue = []
+
+    def close(self) -> None:
+        """Drop queued lines, stop the current one and end the dispatch thread."""
+        self.clear()
+        with self._cond:
+            self._closed = True
+            if self._current is not None:
+                self._current._finish(RequestState.PREEMPTED)
+                self._current = None
+            self._cond.notify()
+        self.player.stop(self.name)
+        self._thread.join(timeout=1.0)
@@ -79,7 +79,7 @@ class VoiceTester:
                 # Convert PCM to WAV using soundfile
                 import soundfile as sf
                 import numpy as np
-                from scipy import signal
+                from src.audio.resample import resample
                 
                 # Read PCM data as int16
                 audio_data = np.frombuffer(response['AudioStream'].read(), dtype=np.int16)
@@ -87,7 +87,7 @@ class VoiceTester:
                 audio_data = audio_data.astype(np.float32) / 32768.0
                 
                 # Resample to 44.1kHz for better quality
-                audio_data = signal.resample(audio_data, int(len(audio_data) * 44100 / 16000))
+                audio_data = resample(audio_data, 16000, 44100)
                 
                 # Save as WAV
                 sf.write(str(output_file), audio_data, 44100, format='WAV', subtype='PCM_16')
@@ -0,0 +1,306 @@
+"""Text-to-speech backends.
+
+Everything that synthesizes speech goes through the TTSBackend protocol, so
+the TTS, effect and playback pipeline runs the same on Polly or on the
+offline LocalTTSBackend. The backend is chosen with the
+TROOPER_TTS_BACKEND environment variable ('polly' or 'local'), or by name
+from configuration.
+"""
+
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Protocol, Sequence, runtime_checkable
+import numpy as np
+from loguru import logger
+from scipy import signal
+
+from .polly import PollyClient, get_polly_client
+from .polly_batch import SynthesisRequest, SynthesisResult
+
+# Environment variables selecting and tuning the backend
+BACKEND_ENV = "TROOPER_TTS_BACKEND"
+LATENCY_ENV = "TROOPER_TTS_LATENCY"
+SPEED_ENV = "TROOPER_TTS_SPEED"
+
+# Vowel formant frequencies (Hz) for the local backend, F1 to F3
+VOWEL_FORMANTS = {
+    'a': (730, 1090, 2440),
+    'e': (530, 1840, 2480),
+    'i': (270, 2290, 3010),
+    'o': (570, 840, 2410),
+    'u': (300, 870, 2240),
+    'y': (270, 2290, 3010),
+}
+FORMANT_BANDWIDTHS = (90, 110, 170)
+
+@runtime_checkable
+class TTSBackend(Protocol):
+    """Speech synthesis used by the audio pipeline.
+
+    Audio is mono 16-bit little-endian PCM at ``sample_rate``.
+    """
+
+    @property
+    def sample_rate(self) -> int:
+        """Sample rate of the returned PCM (Hz)."""
+        ...
+
+    def generate_speech(self, text: str, output_path: Optional[str] = None,
+                        urgency: str = 'medium', context: str = 'patrol') -> bytes | str:
+        """Synthesize a line, returning PCM or the path it was saved to."""
+        ...
+
+    def generate_speech_stream(self, text: str, urgency: str = 'medium', context: str = 'patrol',
+                               chunk_size: int = 4096) -> Iterator[bytes]:
+        """Synthesize a line, yielding PCM chunks as they become available."""
+        ...
+
+    def synthesize_many(
+        self,
+        requests: Sequence[SynthesisRequest],
+        max_workers: int = 4,
+        rate: float = 5.0,
+        max_retries: int = 6,
+        on_result: Optional[Callable[[SynthesisResult], None]] = None
+    ) -> List[SynthesisResult]:
+        """Synthesize many lines, returning results in request order."""
+        ...
+
+class LocalTTSBackend:
+    """Offline backend producing formant-like speech, for benchmarks and tests.
+
+    Each line becomes a voiced buzz shaped by the formants of its vowels,
+    one syllable per vowel group with pauses between words, so it exercises
+    the effects like speech does. The same line always gives the same
+    audio. A fixed latency before the first audio and a synthesis speed
+    stand in for the network and the service.
+    """
+
+    def __init__(self, latency: float = 0.0, speed: Optional[float] = None, sample_rate: int = 16000):
+        """Initialize the backend.
+
+        Args:
+            latency: Seconds before the first audio of each line
+            speed: Seconds of audio produced per second, None for instant
+            sample_rate: Sample rate of the returned PCM (Hz)
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self.latency = latency
+        self.speed = speed
+        self._sample_rate = sample_rate
+        self.voice_id = "Local"
+
+    @property
+    def sample_rate(self) -> int:
+        """Sample rate of the returned PCM (Hz)."""
+        return self._sample_rate
+
+    def generate_speech(self, text: str, output_path: Optional[str] = None,
+                        urgency: str = 'medium', context: str = 'patrol') -> bytes | str:
+        """Generate speech from text.
+
+        Args:
+            text: The text to convert to speech
+            output_path: Optional path to save the audio file
+            urgency: Urgency level, raises the pitch when high
+            context: Context, part of what seeds the voice
+
+        Returns:
+            Raw PCM audio data if no output_path is provided,
+            otherwise returns the path to the saved file as string
+        """
+        audio_data = b"".join(self.generate_speech_stream(text, urgency, context, chunk_size=1 << 30))
+        if output_path:
+            path = Path(output_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(audio_data)
+            return str(path)
+        return audio_data
+
+    def generate_speech_stream(self, text: str, urgency: str = 'medium', context: str = 'patrol',
+                               chunk_size: int = 4096) -> Iterator[bytes]:
+        """Generate speech from text, yielding chunks at the configured speed.
+
+        Args:
+            text: The text to convert to speech
+            urgency: Urgency level, raises the pitch when high
+            context: Context, part of what seeds the voice
+            chunk_size: Bytes per chunk
+
+        Yields:
+            Raw PCM chunks, each a whole number of 16-bit samples
+        """
+        start = time.perf_counter()
+        pcm = self.render(text, urgency, context)
+        chunk_size = max(2, chunk_size - chunk_size % 2)
+
+        for offset in range(0, len(pcm), chunk_size):
+            chunk = pcm[offset:offset + chunk_size]
+            # Deliver each chunk no sooner than the simulated service would
+            ready = self.latency
+            if self.speed is not None:
+                ready += (offset + len(chunk)) / 2 / self._sample_rate / self.speed
+            delay = ready - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+            yield chunk
+
+    def synthesize_many(
+        self,
+        requests: Sequence[SynthesisRequest],
+        max_workers: int = 4,
+        rate: float = 5.0,
+        max_retries: int = 6,
+        on_result: Optional[Callable[[SynthesisResult], None]] = None
+    ) -> List[SynthesisResult]:
+        """Synthesize many lines concurrently.
+
+        Args:
+            requests: Lines to synthesize
+            max_workers: Concurrent lines
+            rate: Unused, the local backend is not rate limited
+            max_retries: Unused, the local backend does not fail
+            on_result: Optional callback run in the calling thread as each
+                      line completes
+
+        Returns:
+            One result per request, in order
+        """
+        def synthesize(request: SynthesisRequest) -> SynthesisResult:
+            start = time.perf_counter()
+            audio = self.generate_speech(request.text, urgency=request.urgency, context=request.context)
+            return SynthesisResult(request, audio=audio, attempts=1, seconds=time.perf_counter() - start)
+
+        results: List[Optional[SynthesisResult]] = [None] * len(requests)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="local-tts") as executor:
+            futures = {executor.submit(synthesize, request): i for i, request in enumerate(requests)}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                if on_result is not None:
+                    on_result(result)
+        return [result for result in results if result is not None]
+
+    def render(self, text: str, urgency: str = 'medium', context: str = 'patrol') -> bytes:
+        """Render a line to PCM immediately, without simulated latency.
+
+        Args:
+            text: Text of the line
+            urgency: Urgency level, raises the pitch when high
+            context: Context, part of what seeds the voice
+
+        Returns:
+            Raw 16-bit PCM audio data
+        """
+        digest = hashlib.sha256(f"{text}|{urgency}|{context}".encode()).digest()
+        rng = np.random.default_rng(int.from_bytes(digest[:8], "little"))
+        sr = self._sample_rate
+        f0 = {'high': 140.0, 'low': 100.0}.get(urgency, 120.0)
+
+        segments = [np.zeros(int(0.05 * sr), dtype=np.float32)]
+        for word in re.findall(r"[a-z']+|[.,!?;:]", text.lower()):
+            if not word[0].isalpha():
+                # Punctuation is a pause
+                segments.append(np.zeros(int(0.2 * sr), dtype=np.float32))
+                continue
+            for vowels in re.findall(r"[aeiouy]+", word) or ['a']:
+                duration = rng.uniform(0.12, 0.2)
+                segments.append(self._syllable(VOWEL_FORMANTS[vowels[0]], f0 * rng.uniform(0.9, 1.1), duration, rng))
+            segments.append(np.zeros(int(0.06 * sr), dtype=np.float32))
+
+        audio = np.concatenate(segments)
+        peak = np.max(np.abs(audio))
+        if peak > 0:
+            audio *= 0.5 / peak
+        return (audio * 32767).astype('<i2').tobytes()
+
+    def _syllable(self, formants: tuple, f0: float, duration: float, rng: np.random.Generator) -> np.ndarray:
+        """Render one voiced syllable.
+
+        Args:
+            formants: Formant frequencies (Hz)
+            f0: Starting pitch (Hz), falling slightly over the syllable
+            duration: Length in seconds
+            rng: Random generator for the breath noise
+
+        Returns:
+            Syllable audio
+        """
+        sr = self._sample_rate
+        n = int(duration * sr)
+
+        # Glottal pulse train with a falling pitch, plus a little breath
+        pitch = f0 * np.linspace(1.0, 0.9, n)
+        phase = np.cumsum(pitch / sr)
+        source = (np.diff(np.floor(phase), prepend=0.0) > 0).astype(np.float32)
+        source += 0.02 * rng.standard_normal(n).astype(np.float32)
+
+        # Parallel two-pole formant resonators
+        out = np.zeros(n, dtype=np.float32)
+        for freq, bandwidth in zip(formants, FORMANT_BANDWIDTHS):
+            if freq >= sr / 2:
+                continue
+            r = np.exp(-np.pi * bandwidth / sr)
+            a = [1.0, -2 * r * np.cos(2 * np.pi * freq / sr), r * r]
+            out += signal.lfilter([1 - r], a, source).astype(np.float32)
+
+        # Smooth attack and release
+        return out * np.hanning(n).astype(np.float32) ** 0.5
+
+def create_tts_backend(
+    name: Optional[str] = None,
+    max_pool_connections: int = 10,
+    latency: Optional[float] = None,
+    speed: Optional[float] = None
+) -> TTSBackend:
+    """Create a TTS backend by name.
+
+    Args:
+        name: 'polly' or 'local'. Defaults to the TROOPER_TTS_BACKEND
+             environment variable, then 'polly'
+        max_pool_connections: Polly HTTP connections, for batch synthesis
+        latency: Local backend latency in seconds. Defaults to
+                TROOPER_TTS_LATENCY, then none
+        speed: Local backend speed in seconds of audio per second. Defaults
+              to TROOPER_TTS_SPEED, then instant
+
+    Returns:
+        TTS backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = (name or os.getenv(BACKEND_ENV) or 'polly').lower()
+    if name == 'polly':
+        return PollyClient(max_pool_connections=max_pool_connections)
+    if name == 'local':
+        if latency is None:
+            latency = float(os.getenv(LATENCY_ENV, "0"))
+        if speed is None and os.getenv(SPEED_ENV):
+            speed = float(os.environ[SPEED_ENV])
+        backend = LocalTTSBackend(latency=latency, speed=speed)
+        logger.info(f"Using local TTS backend (latency {latency:g}s, speed {speed or 'instant'})")
+        return backend
+    raise ValueError(f"Unknown TTS backend: {name}")
+
+_backends: Dict[str, TTSBackend] = {}
+
+def get_tts_backend(name: Optional[str] = None) -> TTSBackend:
+    """Get a process-wide TTS backend.
+
+    Args:
+        name: 'polly' or 'local'. Defaults to the TROOPER_TTS_BACKEND
+             environment variable, then 'polly'
+
+    Returns:
+        Shared TTS backend. Polly is the shared Polly client
+    """
+    name = (name or os.getenv(BACKEND_ENV) or 'polly').lower()
+    if name not in _backends:
+        _backends[name] = get_polly_client() if name == 'polly' else create_tts_backend(name)
+    return _backends[name]
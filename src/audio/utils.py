@@ -1,7 +1,11 @@
 """Utility functions for audio processing."""
 
+import os
+import struct
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple, Union
+import numpy as np
+import soundfile as sf
 from src.quotes import Quote
 
 def generate_filename(voice: str, quote: Quote, index: int) -> str:
@@ -19,4 +23,92 @@ def generate_filename(voice: str, quote: Quote, index: int) -> str:
     clean_text = "_".join(quote.text.split()[:3]).lower()
     clean_text = "".join(c for c in clean_text if c.isalnum() or c == "_")
     
-    return f"{voice}_neural_{quote.category.value}_{quote.context}_{index:03d}_{clean_text}.wav" 
\ No newline at end of file
+    return f"{voice}_neural_{quote.category.value}_{quote.context}_{index:03d}_{clean_text}.wav"
+
+def write_audio_atomic(path: Union[str, Path], data: np.ndarray, sample_rate: int, subtype: str = 'PCM_16') -> Path:
+    """Write a WAV file atomically via a temporary file and rename.
+    
+    Readers never see a partially written file, and an interrupted write
+    leaves any previous version of the file in place.
+    
+    Args:
+        path: Destination path
+        data: Audio data to write
+        sample_rate: Sample rate of the audio data
+        subtype: Soundfile subtype for the WAV data
+        
+    Returns:
+        Destination path
+    """
+    path = Path(path)
+    temp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp{path.suffix}")
+    try:
+        sf.write(str(temp_path), data, sample_rate, format='WAV', subtype=subtype)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return path
+
+# WAVE format tags for integer PCM
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def map_wav(path: Union[str, Path]) -> Optional[Tuple[np.memmap, int]]:
+    """Memory-map the samples of a 16-bit PCM WAV file without decoding it.
+    
+    The data chunk is mapped read-only as little-endian int16, so samples are
+    paged in from the file as they are played instead of being read and
+    converted up front. A file replaced with write_audio_atomic() does not
+    affect an existing mapping.
+    
+    Args:
+        path: Path to the WAV file
+        
+    Returns:
+        Tuple of (samples, sample_rate), with samples of shape (frames,) for
+        mono or (frames, channels), or None if the file is not a 16-bit PCM WAV
+    """
+    try:
+        with open(path, 'rb') as f:
+            # Empty or truncated files are left to the regular decoder
+            header = f.read(12)
+            if len(header) < 12:
+                return None
+            riff, _, wave = struct.unpack('<4sI4s', header)
+            if riff != b'RIFF' or wave != b'WAVE':
+                return None
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                chunk_id, size = struct.unpack('<4sI', header)
+                if chunk_id == b'fmt ':
+                    fmt = f.read(size)
+                    if size % 2:
+                        f.seek(1, os.SEEK_CUR)
+                elif chunk_id == b'data':
+                    offset = f.tell()
+                    break
+                else:
+                    # Chunks are padded to an even size
+                    f.seek(size + size % 2, os.SEEK_CUR)
+    except OSError:
+        return None
+    
+    if fmt is None or len(fmt) < 16:
+        return None
+    tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+    if tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        # The real format tag leads the sub-format GUID
+        tag = struct.unpack('<H', fmt[24:26])[0]
+    if tag != WAVE_FORMAT_PCM or bits != 16 or channels < 1:
+        return None
+    
+    # Writers that could not seek may leave the size unset, map to the end
+    frames = min(size, os.path.getsize(path) - offset) // (2 * channels)
+    if frames <= 0:
+        return None
+    shape = (frames,) if channels == 1 else (frames, channels)
+    return np.memmap(path, dtype='<i2', mode='r', offset=offset, shape=shape), sample_rate
@@ -0,0 +1,5 @@
+"""Shared AWS sessions and clients."""
+
+from .clients import ClientRegistry, get_client_registry, get_client
+
+__all__ = ['ClientRegistry', 'get_client_registry', 'get_client']
@@ -0,0 +1,169 @@
+"""Process-wide registry of lazily created AWS clients."""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+import boto3
+from botocore.config import Config
+from loguru import logger
+
+# Defaults for the trooper AWS account
+DEFAULT_PROFILE = 'trooper'
+DEFAULT_REGION = 'us-east-1'
+
+class ClientRegistry:
+    """Creates AWS sessions and clients on first use and shares them.
+    
+    Building a boto3 session and client takes hundreds of milliseconds and
+    several megabytes on the Pi, so each is built once per process and
+    reused, along with the client's HTTP connection pool. Nothing is built
+    until a client is requested, and prewarm() builds clients on a
+    background thread ahead of time.
+    """
+    
+    def __init__(self, profile_name: str = DEFAULT_PROFILE, region_name: str = DEFAULT_REGION):
+        """Initialize the registry. No sessions or clients are created yet.
+        
+        Args:
+            profile_name: Default AWS profile name
+            region_name: Default AWS region
+        """
+        self.profile_name = profile_name
+        self.region_name = region_name
+        self._sessions: Dict[Tuple[str, str], boto3.Session] = {}
+        self._clients: Dict[Tuple[str, str, str, Optional[int]], Tuple[Any, int]] = {}
+        self._counts = {"sessions": 0, "clients": 0, "hits": 0}
+        # Sessions are not thread-safe, so clients are built one at a time
+        self._lock = threading.RLock()
+    
+    def session(self, profile_name: Optional[str] = None, region_name: Optional[str] = None) -> boto3.Session:
+        """Get the session for a profile and region, creating it on first use.
+        
+        Args:
+            profile_name: AWS profile name, defaults to the registry's
+            region_name: AWS region, defaults to the registry's
+            
+        Returns:
+            Shared boto3 session
+        """
+        key = (profile_name or self.profile_name, region_name or self.region_name)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = boto3.Session(profile_name=key[0], region_name=key[1])
+                self._sessions[key] = session
+                self._counts["sessions"] += 1
+            return session
+    
+    def client(
+        self,
+        service: str,
+        profile_name: Optional[str] = None,
+        region_name: Optional[str] = None,
+        max_pool_connections: int = 10,
+        max_attempts: Optional[int] = None
+    ) -> Any:
+        """Get the client for a service, creating it on first use.
+        
+        Clients with different max_attempts are cached separately.
+        
+        Args:
+            service: AWS service name, e.g. 'polly'
+            profile_name: AWS profile name, defaults to the registry's
+            region_name: AWS region, defaults to the registry's
+            max_pool_connections: HTTP connections the client needs. A
+                                 cached client with a smaller pool is
+                                 replaced by a larger one
+            max_attempts: Total attempts per request, including the first,
+                         for callers that retry on their own. Defaults to
+                         the botocore retry settings
+            
+        Returns:
+            Shared boto3 client
+        """
+        key = (service, profile_name or self.profile_name, region_name or self.region_name, max_attempts)
+        with self._lock:
+            cached = self._clients.get(key)
+            if cached is not None and cached[1] >= max_pool_connections:
+                self._counts["hits"] += 1
+                return cached[0]
+            
+            start = time.perf_counter()
+            retries = {"total_max_attempts": max_attempts} if max_attempts is not None else None
+            client = self.session(key[1], key[2]).client(
+                service, config=Config(max_pool_connections=max_pool_connections, retries=retries)
+            )
+            self._clients[key] = (client, max_pool_connections)
+            self._counts["clients"] += 1
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.debug(f"Created {service} client in {elapsed_ms:.0f} ms")
+            return client
+    
+    def prewarm(self, services: Iterable[str], **kwargs: Any) -> threading.Thread:
+        """Create clients on a background thread so first use does not wait.
+        
+        A caller asking for a client while it is being built waits for it
+        rather than building a second one.
+        
+        Args:
+            services: AWS service names
+            **kwargs: Arguments passed to client()
+            
+        Returns:
+            The started daemon thread
+        """
+        services = list(services)
+        
+        def warm() -> None:
+            for service in services:
+                try:
+                    self.client(service, **kwargs)
+                except Exception as e:
+                    logger.warning(f"Failed to pre-warm {service} client: {str(e)}")
+        
+        thread = threading.Thread(target=warm, name="aws-prewarm", daemon=True)
+        thread.start()
+        return thread
+    
+    def stats(self) -> Dict[str, int]:
+        """Get registry statistics.
+        
+        Returns:
+            Dictionary with the sessions and clients created and the number
+            of requests served by an existing client
+        """
+        with self._lock:
+            return dict(self._counts)
+    
+    def clear(self) -> None:
+        """Forget all sessions and clients, e.g. after credentials change."""
+        with self._lock:
+            self._sessions.clear()
+            self._clients.clear()
+
+_default_registry: Optional[ClientRegistry] = None
+_default_lock = threading.Lock()
+
+def get_client_registry() -> ClientRegistry:
+    """Get the process-wide client registry.
+    
+    Returns:
+        Shared ClientRegistry instance
+    """
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = ClientRegistry()
+        return _default_registry
+
+def get_client(service: str, **kwargs: Any) -> Any:
+    """Get a shared client from the process-wide registry.
+    
+    Args:
+        service: AWS service name, e.g. 'polly'
+        **kwargs: Arguments passed to ClientRegistry.client()
+        
+    Returns:
+        Shared boto3 client
+    """
+    return get_client_registry().client(service, **kwargs)
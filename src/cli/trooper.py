@@ -42,6 +42,9 @@ Examples:
   # Generate without playing:
   trooper say --no-play --keep 'All clear'
   
+  # Start speaking before the whole line is downloaded:
+  trooper say --stream 'This is a routine patrol report. Nothing unusual to report.'
+  
 Note: If your text contains special characters, wrap it in single quotes (')
       For Windows users, use double quotes (") instead.
 """
@@ -95,6 +98,12 @@ Note: If your text contains special characters, wrap it in single quotes (')
         help="Keep generated audio files"
     )
     
+    say_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Start playing while speech is still being downloaded"
+    )
+    
     return parser
 
 def handle_say(args: argparse.Namespace) -> int:
@@ -114,7 +123,8 @@ def handle_say(args: argparse.Namespace) -> int:
             context=args.context,
             play_immediately=not args.no_play,
             cleanup=not args.keep,
-            volume=args.volume
+            volume=args.volume,
+            stream=args.stream
         )
         
         # Print output path if keeping file
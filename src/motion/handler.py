@@ -8,6 +8,8 @@ from loguru import logger
 
 from src.quotes import QuoteManager, QuoteCategory, UrgencyLevel, Quote
 from src.audio import StormtrooperEffect, AudioPlayer
+from src.audio.clip_cache import ClipCache
+from src.audio.scheduler import SpeechScheduler, SpeechRequest
 from .strategy import ResponseStrategy
 from .constants import MotionDirection
 
@@ -17,13 +19,19 @@ class MotionHandler:
     def __init__(
         self,
         quotes_file: Optional[Path] = None,
-        config_file: Optional[Path] = None
+        config_file: Optional[Path] = None,
+        clip_cache_bytes: int = 32 * 1024 * 1024
     ):
         """Initialize the motion handler.
         
+        The clips for high urgency responses are decoded and pinned in the
+        clip cache here, so alerts never wait on the SD card.
+        
         Args:
             quotes_file: Optional path to quotes YAML file
             config_file: Optional path to motion response config file
+            clip_cache_bytes: Memory budget for decoded response clips, at
+                             most half of which is pinned alert clips
         """
         # Set default paths if not provided
         if quotes_file is None:
@@ -34,11 +42,15 @@ class MotionHandler:
         # Initialize components
         self.quote_manager = QuoteManager(quotes_file)
         self.response_strategy = ResponseStrategy(config_file)
-        self.player = AudioPlayer()
+        self.clip_cache = ClipCache(max_bytes=clip_cache_bytes)
+        self.player = AudioPlayer(clip_cache=self.clip_cache)
+        self.scheduler = SpeechScheduler(self.player)
+        self._pin_alerts()
         
         # Track state
         self.is_responding = False
         self.last_direction: Optional[MotionDirection] = None
+        self.playback: Optional[SpeechRequest] = None
         
     def _text_to_filename(self, text: str) -> str:
         """Convert quote text to a filename-safe format.
@@ -54,6 +66,13 @@ class MotionHandler:
         # Replace spaces with underscores and limit length
         return '_'.join(safe.split())[:30]
         
+    def _pin_alerts(self) -> None:
+        """Decode the audio of every high urgency quote into the clip cache and pin it."""
+        paths = set()
+        for quote in self.quote_manager.get_quotes(urgency=UrgencyLevel.HIGH.value, exclude_recent=False):
+            paths.update(self._matching_audio(quote))
+        self.clip_cache.preload(sorted(paths), self.player.device.sample_rate, pin=True)
+        
     def _find_matching_audio(self, quote: Quote) -> Optional[Path]:
         """Find the best matching audio file for a quote.
         
@@ -63,6 +82,19 @@ class MotionHandler:
         Returns:
             Path to best matching audio file, or None if no match found
         """
+        matches = self._matching_audio(quote)
+        return random.choice(matches) if matches else None
+        
+    def _matching_audio(self, quote: Quote) -> List[Path]:
+        """Find the audio files that best match a quote.
+        
+        Args:
+            quote: Quote to find audio for
+            
+        Returns:
+            Files matching the most specific pattern that matches any, or
+            an empty list
+        """
         audio_dir = Path("assets/audio/polly_raw")
         
         # Convert quote text to filename format
@@ -85,12 +117,16 @@ class MotionHandler:
             if matches:
                 # Log which pattern matched
                 logger.debug(f"Found audio match using pattern: {pattern}")
-                return random.choice(matches)
+                return matches
                 
-        return None
+        return []
         
     def handle_motion(self, direction: MotionDirection) -> None:
-        """Handle detected motion and play appropriate response.
+        """Handle detected motion and schedule an appropriate response.
+        
+        The response goes to the speech scheduler, which plays it by
+        urgency: HIGH responses cut off lower ones, and responses that wait
+        too long are dropped. The handle is kept in ``playback``.
         
         Args:
             direction: Direction motion was detected from
@@ -144,9 +180,11 @@ class MotionHandler:
                 logger.error(f"No matching audio file found for quote: {quote.text}")
                 return
                 
-            # Play the audio
-            logger.debug(f"Playing audio file: {audio_file.name}")
-            self.player.play_file(str(audio_file))
+            # Queue the audio for playback without blocking
+            logger.debug(f"Scheduling audio file: {audio_file.name}")
+            self.playback = self.scheduler.submit(str(audio_file), quote.urgency, text=quote.text)
+            logger.debug(f"Clip cache: {self.clip_cache.stats()}")
+            logger.debug(f"Speech scheduler: {self.scheduler.metrics()}")
             
         finally:
             self.is_responding = False 
\ No newline at end of file
@@ -1,16 +1,47 @@
 """Pytest configuration and fixtures."""
 
+import io
 import os
+import threading
+import time
 import pytest
 from pathlib import Path
-from typing import Generator
+from types import SimpleNamespace
+from typing import Any, Dict, Generator, List, Optional, Type
+import boto3
+import sounddevice as sd
 import soundfile as sf
 import numpy as np
+from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
+from src.audio import device, effects, filter_cache, output_cache, polly_cache
+from src.audio.mixer import Voice
+
 # Load test environment variables
 load_dotenv(".env.test", override=True)
 
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the process-wide caches at a temporary directory.
+    
+    Keeps tests from writing filters, effect banks, processed audio and
+    Polly responses into assets/audio/cache.
+    
+    Args:
+        tmp_path: Pytest temporary directory fixture
+        monkeypatch: Pytest monkeypatch fixture
+        
+    Returns:
+        Temporary cache directory
+    """
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(filter_cache, "_default_cache", filter_cache.FilterCache(cache_dir / "filters.npz"))
+    monkeypatch.setattr(effects, "DEFAULT_BANK_DIR", cache_dir)
+    monkeypatch.setattr(output_cache, "_default_cache", output_cache.OutputCache(cache_dir / "processed"))
+    monkeypatch.setattr(polly_cache, "_default_cache", polly_cache.PollyCache(cache_dir / "polly"))
+    return cache_dir
+
 @pytest.fixture
 def test_audio_file(tmp_path: Path) -> Generator[Path, None, None]:
     """Create a test audio file.
@@ -67,4 +98,228 @@ def test_config_dir(tmp_path: Path) -> Generator[Path, None, None]:
     # Cleanup
     for file in config_dir.glob("*"):
         file.unlink()
-    config_dir.rmdir() 
\ No newline at end of file
+    config_dir.rmdir()
+
+class LocalPollyBackend:
+    """Stand-in for the Polly client with the same synthesize_speech() call.
+    
+    Returns a short tone per request after a simulated network latency and
+    throttles requests beyond a configured rate with the same ClientError
+    Polly raises. Counters record calls and throttles.
+    """
+    
+    def __init__(self, latency: float = 0.05, max_rate: Optional[float] = None, sample_rate: int = 16000):
+        """Initialize the backend.
+        
+        Args:
+            latency: Seconds per request
+            max_rate: Requests per second above which requests are
+                     throttled, None for no limit
+            sample_rate: Sample rate of the returned PCM
+        """
+        self.latency = latency
+        self.max_rate = max_rate
+        self.sample_rate = sample_rate
+        self.calls = 0
+        self.throttles = 0
+        self.peak_concurrency = 0
+        self._active = 0
+        self._recent: List[float] = []
+        self._lock = threading.Lock()
+    
+    def synthesize_speech(self, **kwargs: Any) -> Dict[str, Any]:
+        """Synthesize a placeholder tone for the request.
+        
+        Args:
+            **kwargs: Polly synthesize_speech arguments
+        
+        Returns:
+            Response with an ``AudioStream`` of 16-bit PCM
+        
+        Raises:
+            ClientError: With ThrottlingException when over the rate limit
+        """
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            self._recent = [t for t in self._recent if now - t < 1.0]
+            if self.max_rate is not None and len(self._recent) >= self.max_rate:
+                self.throttles += 1
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                    "SynthesizeSpeech"
+                )
+            self._recent.append(now)
+            self._active += 1
+            self.peak_concurrency = max(self.peak_concurrency, self._active)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self._active -= 1
+        
+        # Length and pitch follow the text, so different lines differ
+        text = kwargs.get("Text", "")
+        t = np.arange(int(self.sample_rate * (0.2 + 0.01 * len(text)))) / self.sample_rate
+        tone = 0.3 * np.sin(2 * np.pi * (150 + len(text) % 100) * t)
+        pcm = (tone * 32767).astype('<i2').tobytes()
+        return {"AudioStream": io.BytesIO(pcm)}
+
+@pytest.fixture
+def local_polly() -> Type[LocalPollyBackend]:
+    """Stand-in Polly client class, for PollyClient(client=...).
+    
+    Returns:
+        LocalPollyBackend, called with its settings to build a backend
+    """
+    return LocalPollyBackend
+
+class FakeAWSClient:
+    """Stand-in boto3 client recording its settings and Polly requests."""
+    
+    def __init__(self, service: str, config: Any = None) -> None:
+        self.service = service
+        self.pool = config.max_pool_connections if config is not None else None
+        self.retries = config.retries if config is not None else None
+        self.thread = threading.current_thread().name
+        self.requests: List[Dict[str, Any]] = []
+    
+    def synthesize_speech(self, **kwargs: Any) -> Dict[str, Any]:
+        """Record the request and return fixed PCM."""
+        self.requests.append(kwargs)
+        return {"AudioStream": io.BytesIO(b"\x01\x00" * 800)}
+
+class FakeSession:
+    """Stand-in boto3 session counting sessions and the clients built from them."""
+    
+    created = 0
+    
+    def __init__(self, **kwargs: Any) -> None:
+        type(self).created += 1
+        self.kwargs = kwargs
+    
+    def client(self, service: str, config: Any = None) -> FakeAWSClient:
+        # Client construction is slow on the Pi
+        time.sleep(0.05)
+        return FakeAWSClient(service, config)
+
+@pytest.fixture
+def fake_boto(monkeypatch: pytest.MonkeyPatch) -> Type[FakeSession]:
+    """Replace boto3 sessions with FakeSession, with its count reset.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+        
+    Returns:
+        FakeSession, whose created attribute counts sessions
+    """
+    FakeSession.created = 0
+    monkeypatch.setattr(boto3, "Session", FakeSession)
+    return FakeSession
+
+class FakePlayer:
+    """Stand-in AudioPlayer recording clips instead of playing them.
+    
+    Voices play until stopped, or finish at once with finish=True. A
+    crossfade stops the voices already playing, and "missing.wav" fails
+    to load.
+    """
+    
+    def __init__(self, finish: bool = False) -> None:
+        self.device = SimpleNamespace(sample_rate=44100)
+        self.finish = finish
+        self.voices: List[Voice] = []
+        self.crossfades: List[float] = []
+        self.played: List[tuple] = []
+    
+    def start(self) -> None:
+        pass
+    
+    def load(self, source: Any, sample_rate: Optional[int] = None) -> Optional[tuple]:
+        if isinstance(source, str) and source == "missing.wav":
+            return None
+        return source, sample_rate
+    
+    def play(self, data: Any, sample_rate: Optional[int], name: str = "speech",
+             crossfade: float = 0.0, **kwargs: Any) -> Voice:
+        if crossfade:
+            for voice in self.voices:
+                voice.stop()
+        voice = Voice(np.zeros(10), name=name)
+        if self.finish:
+            voice.stop()
+        self.voices.append(voice)
+        self.crossfades.append(crossfade)
+        self.played.append((len(data), sample_rate))
+        return voice
+    
+    def stop(self, name: Optional[str] = None, fade: float = 0.0) -> None:
+        for voice in self.voices:
+            voice.stop()
+    
+    def close(self) -> None:
+        pass
+
+class FakeOutputStream:
+    """Stand-in sd.OutputStream that runs its callback only when pumped."""
+    
+    latency = 0.0
+    
+    def __init__(self, callback: Any = None, blocksize: int = 512, channels: int = 1,
+                 dtype: str = "float32", **kwargs: Any) -> None:
+        self.callback = callback
+        self.blocksize = blocksize
+        self.channels = channels
+        self.dtype = dtype
+        self.active = False
+        self.closed = False
+    
+    def start(self) -> None:
+        self.active = True
+    
+    def stop(self) -> None:
+        self.active = False
+    
+    def close(self) -> None:
+        self.active = False
+        self.closed = True
+    
+    def pump(self, blocks: int = 1) -> None:
+        """Run the callback for some blocks, as PortAudio would."""
+        for _ in range(blocks):
+            out = np.zeros((self.blocksize, self.channels), dtype=self.dtype)
+            self.callback(out, self.blocksize, None, None)
+
+@pytest.fixture
+def fake_sounddevice(monkeypatch: pytest.MonkeyPatch) -> Type[FakeOutputStream]:
+    """Replace PortAudio with a 44.1 kHz device and FakeOutputStream.
+    
+    The process-wide device is reset, so players made in the test probe
+    the fake device.
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+        
+    Returns:
+        FakeOutputStream
+    """
+    def query_devices(device=None, kind=None) -> Dict[str, Any]:
+        return {"name": "Fake Audio", "max_output_channels": 2, "default_samplerate": 44100.0}
+    
+    monkeypatch.setattr(sd, "query_devices", query_devices)
+    monkeypatch.setattr(sd, "check_output_settings", lambda **kwargs: None)
+    monkeypatch.setattr(sd, "default", SimpleNamespace(device=(None, 0), samplerate=None, channels=(None, 1)))
+    monkeypatch.setattr(sd, "_terminate", lambda: None, raising=False)
+    monkeypatch.setattr(sd, "_initialize", lambda: None, raising=False)
+    monkeypatch.setattr(sd, "OutputStream", FakeOutputStream)
+    monkeypatch.setattr(device, "_default_device", None)
+    return FakeOutputStream
+
+@pytest.fixture
+def fake_player() -> Type[FakePlayer]:
+    """Stand-in player class, for the scheduler and real-time TTS.
+    
+    Returns:
+        FakePlayer, called with its settings to build a player
+    """
+    return FakePlayer
@@ -0,0 +1,44 @@
+"""Tests for the shared AWS client registry."""
+
+import pytest
+
+from src.ai.lex_client import LexClient
+from src.audio.polly import PollyClient
+from src.aws import ClientRegistry
+
+@pytest.fixture
+def registry(fake_boto) -> ClientRegistry:
+    return ClientRegistry()
+
+def test_clients_are_lazy_and_shared(registry: ClientRegistry, fake_boto) -> None:
+    """Nothing is built until first use, then sessions and clients are reused."""
+    polly = PollyClient(registry=registry, use_cache=False)
+    lex = LexClient("bot", "alias", registry=registry)
+    assert fake_boto.created == 0 and registry.stats()["clients"] == 0
+    
+    assert polly.polly is PollyClient(registry=registry, use_cache=False).polly
+    assert lex.client.service == "lexv2-runtime"
+    assert fake_boto.created == 1
+    assert registry.stats() == {"sessions": 1, "clients": 2, "hits": 1}
+    
+    # A caller needing more connections gets a larger pool
+    assert registry.client("polly", max_pool_connections=32).pool == 32
+    assert registry.client("polly").pool == 32
+
+def test_prewarm_builds_in_background(registry: ClientRegistry) -> None:
+    """Pre-warmed clients are built off the calling thread and reused after."""
+    thread = registry.prewarm(["polly", "lexv2-runtime"])
+    client = registry.client("polly")
+    thread.join(timeout=1.0)
+    
+    assert client.thread == "aws-prewarm"
+    assert registry.stats()["clients"] == 2
+
+def test_batch_client_leaves_retries_to_the_caller(registry: ClientRegistry) -> None:
+    """synthesize_many() gets its own single-attempt client, so throttling reaches its token bucket."""
+    polly = PollyClient(registry=registry, use_cache=False)
+    
+    assert polly.polly.retries is None
+    assert polly.batch_polly.retries == {"total_max_attempts": 1}
+    assert polly.batch_polly is not polly.polly
+    assert registry.stats()["clients"] == 2
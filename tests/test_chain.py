@@ -0,0 +1,86 @@
+"""Tests for the composable effect chain."""
+
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.audio import StormtrooperEffect, EffectChain, ChainReport
+from src.audio import chain as chain_module
+from src.audio.chain import STAGES, EffectStage
+
+def test_default_chain_runs_every_stage_and_reports(test_audio_file: Path) -> None:
+    """Each stage is timed in order, and allocations are traced on request."""
+    data, sample_rate = sf.read(str(test_audio_file), dtype='float32')
+    effect = StormtrooperEffect(chain=EffectChain(trace_memory=True))
+    
+    report = ChainReport()
+    out = effect.process_array(data, sample_rate, report=report)
+    
+    assert [stage.name for stage in report.stages] == list(STAGES)
+    assert all(stage.ms >= 0 and stage.calls == 1 for stage in report.stages)
+    assert all(stage.bytes_allocated is not None for stage in report.stages)
+    assert report.slowest() is not None
+    assert np.max(np.abs(out)) <= 1.0
+
+def test_memory_tracing_without_reset_peak(test_audio_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """On Python 3.8, without tracemalloc.reset_peak(), stages still report allocations."""
+    monkeypatch.setattr(chain_module, "_HAS_RESET_PEAK", False)
+    data, sample_rate = sf.read(str(test_audio_file), dtype='float32')
+    effect = StormtrooperEffect(chain=EffectChain(trace_memory=True))
+    
+    report = ChainReport()
+    effect.process_array(data, sample_rate, report=report)
+    
+    assert all(stage.bytes_allocated is not None for stage in report.stages)
+
+def test_chain_config_disables_and_reorders_stages(test_audio_file: Path) -> None:
+    """Stages can be disabled or reordered from configuration."""
+    data, sample_rate = sf.read(str(test_audio_file), dtype='float32')
+    chain = EffectChain.from_config({"stages": [
+        "normalize", {"name": "eq", "enabled": False}, "modulation", "resonance", "limit",
+    ]})
+    effect = StormtrooperEffect(chain=chain)
+    
+    report = ChainReport()
+    out = effect.process_array(data, sample_rate, report=report)
+    
+    assert chain.names == ["normalize", "modulation", "resonance", "limit"]
+    assert [stage.name for stage in report.stages] == chain.names
+    # No radio effects, so no clicks or static are added
+    assert out.shape == data.shape
+    
+    with pytest.raises(ValueError):
+        EffectChain.from_config(["normalize", "reverb"])
+
+def test_batch_splits_chain_around_batchable_stages() -> None:
+    """Batches run per-clip stages on each clip and batch the voice stages once per group."""
+    rng = np.random.default_rng(3)
+    clips = [rng.standard_normal(n).astype(np.float32) * 0.2 for n in (8000, 8500, 9000)]
+    effect = StormtrooperEffect()
+    data = clips[0].copy()
+    
+    random.seed(0)
+    report = ChainReport()
+    effect.process_batch(clips, sample_rate=16000, report=report)
+    calls = {stage.name: stage.calls for stage in report.stages}
+    
+    assert calls["normalize"] == 3
+    assert calls["eq"] == 1
+    assert calls["limit"] == 3
+    np.testing.assert_array_equal(clips[0], data)
+
+def test_reports_are_per_call(test_audio_file: Path) -> None:
+    """Each call records into its own report, and stages must implement apply."""
+    data, sample_rate = sf.read(str(test_audio_file), dtype='float32')
+    effect = StormtrooperEffect()
+    first, second = ChainReport(), ChainReport()
+    
+    effect.process_array(data, sample_rate, report=first)
+    effect.process_array(data[:1000], sample_rate, report=second)
+    
+    assert all(stage.calls == 1 for stage in first.stages + second.stages)
+    with pytest.raises(TypeError):
+        EffectStage()
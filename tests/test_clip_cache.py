@@ -0,0 +1,62 @@
+"""Tests for the decoded clip cache."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from src.audio.clip_cache import ClipCache
+
+def _write(path: Path, seconds: float, sample_rate: int = 16000) -> Path:
+    """Write a short tone."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    sf.write(path, 0.5 * np.sin(2 * np.pi * 440 * t), sample_rate)
+    return path
+
+def test_clip_cache_decodes_once_at_device_rate(tmp_path: Path) -> None:
+    """Clips are decoded and resampled once, then served from memory until the file changes."""
+    path = _write(tmp_path / "a.wav", 0.5)
+    cache = ClipCache()
+    
+    first = cache.get(path, 44100)
+    second = cache.get(path, 44100)
+    
+    assert first is second
+    assert first.dtype == np.float32
+    assert len(first) == 22050
+    assert cache.stats()["hits"] == 1 and cache.stats()["hit_rate"] == 0.5
+    
+    # A re-rendered file is decoded again
+    _write(path, 0.25)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert len(cache.get(path, 44100)) == 11025
+    assert cache.stats()["misses"] == 2
+
+def test_clip_cache_evicts_lru_but_keeps_pinned(tmp_path: Path) -> None:
+    """Eviction removes least recently used clips and skips pinned ones."""
+    paths = [_write(tmp_path / f"{name}.wav", 0.25) for name in "abc"]
+    cache = ClipCache(max_bytes=2 * 4000 * 2, dtype=np.int16)
+    
+    cache.pin(paths[0], 16000)
+    cache.get(paths[1], 16000)
+    cache.get(paths[2], 16000)
+    
+    assert (paths[0], 16000) in cache
+    assert (paths[1], 16000) not in cache
+    assert (paths[2], 16000) in cache
+    assert cache.get(paths[0], 16000).dtype == np.int16
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["pinned"] == 1
+
+def test_pinned_clips_are_capped(tmp_path: Path) -> None:
+    """Pinning stops at max_pinned_bytes, so unpinned clips keep room in the budget."""
+    paths = [_write(tmp_path / f"{name}.wav", 0.25) for name in "abc"]
+    cache = ClipCache(max_bytes=4 * 4000 * 2, dtype=np.int16)
+    
+    cache.preload(paths, 16000, pin=True)
+    
+    stats = cache.stats()
+    assert stats["pinned"] == 2 and stats["pinned_bytes"] == 2 * 4000 * 2
+    assert not cache.pin(paths[2], 16000)
+    assert cache.pin(paths[0], 16000)
@@ -0,0 +1,46 @@
+"""Tests for the shared output device manager."""
+
+import pytest
+import sounddevice as sd
+
+from src.audio.device import AudioDevice
+
+@pytest.fixture
+def fake_device(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """Replace PortAudio queries with a counting 48 kHz-only device."""
+    calls = {"query": 0, "rates": [48000, 16000]}
+    
+    def query_devices(device=None, kind=None):
+        calls["query"] += 1
+        return {"name": "USB Audio", "max_output_channels": 2, "default_samplerate": 48000.0}
+    
+    def check_output_settings(device=None, channels=None, dtype=None, extra_settings=None, samplerate=None):
+        if int(samplerate) not in calls["rates"]:
+            raise sd.PortAudioError("Invalid sample rate")
+    
+    monkeypatch.setattr(sd, "query_devices", query_devices)
+    monkeypatch.setattr(sd, "check_output_settings", check_output_settings)
+    monkeypatch.setattr(sd, "_terminate", lambda: None, raising=False)
+    monkeypatch.setattr(sd, "_initialize", lambda: None, raising=False)
+    return calls
+
+def test_device_probes_once_and_picks_supported_rate(fake_device: dict) -> None:
+    """Capabilities are cached, and an unsupported preferred rate falls back to a supported one."""
+    device = AudioDevice()
+    device.system = "Linux"
+    
+    assert device.sample_rate == 48000
+    assert device.capabilities.sample_rates == (48000, 16000)
+    assert device.device_id == 0
+    device.probe()
+    assert device.probes == 1 and fake_device["query"] == 1
+    
+    # A replaced device is picked up by a re-probe
+    fake_device["rates"] = [44100]
+    assert device.reprobe().sample_rate == 44100
+    assert device.probes == 2 and device.generation == 1
+
+def test_choose_rate_prefers_multiples() -> None:
+    """Rates that are multiples of the target win over merely close ones."""
+    assert AudioDevice._choose_rate(44100, (48000, 22050)) == 22050
+    assert AudioDevice._choose_rate(44100, (48000, 16000)) == 48000
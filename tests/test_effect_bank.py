@@ -0,0 +1,43 @@
+"""Tests for the pre-rendered radio effect bank."""
+
+from pathlib import Path
+
+import numpy as np
+
+from src.audio import EffectParams
+from src.audio.effect_bank import EffectBank
+from src.quotes import URGENCY_EFFECTS
+
+def test_bank_renders_variants_per_urgency_level() -> None:
+    """Every urgency level gets its own variants scaled by URGENCY_EFFECTS."""
+    bank = EffectBank(EffectParams(urgency_levels=True), 16000, variants=4)
+    
+    for level, overrides in URGENCY_EFFECTS.items():
+        assert len(bank.clicks[level]) == 4
+        assert len(bank.statics[level]) == 4
+        peak = max(np.max(np.abs(click)) for click in bank.clicks[level])
+        assert peak <= overrides["click_volume"] * (1 + overrides["click_variation"])
+        picked = bank.click(level)
+        assert any(picked is click for click in bank.clicks[level])
+
+def test_bank_keeps_base_levels_by_default() -> None:
+    """Without the urgency_levels opt-in every level uses the base click volume."""
+    params = EffectParams()
+    bank = EffectBank(params, 16000, variants=4)
+    
+    for level in URGENCY_EFFECTS:
+        peak = max(np.max(np.abs(click)) for click in bank.clicks[level])
+        assert peak > max(overrides["click_volume"] for overrides in URGENCY_EFFECTS.values()) * 2
+        assert peak <= params.click_volume * (1 + params.click_variation)
+
+def test_bank_is_reloaded_from_cache(tmp_path: Path) -> None:
+    """A second bank with the same parameters loads the cached variants."""
+    first = EffectBank(EffectParams(), 16000, variants=4, cache_dir=tmp_path)
+    second = EffectBank(EffectParams(), 16000, variants=4, cache_dir=tmp_path)
+    changed = EffectBank(EffectParams(click_freq=1500.0), 16000, variants=4, cache_dir=tmp_path)
+    
+    assert first.path == second.path
+    assert changed.path != first.path
+    for level in URGENCY_EFFECTS:
+        for ours, theirs in zip(first.statics[level], second.statics[level]):
+            np.testing.assert_array_equal(ours, theirs)
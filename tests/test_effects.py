@@ -0,0 +1,189 @@
+"""Tests for Stormtrooper audio effects."""
+
+import random
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+from scipy import signal
+
+from src.audio import StormtrooperEffect, EffectParams
+
+def _seed(value: int = 1234) -> None:
+    """Seed both random sources used by the radio effects."""
+    random.seed(value)
+    np.random.seed(value)
+
+def test_stream_blocks_match_single_block(test_audio_file: Path) -> None:
+    """Filter state carried across blocks gives the same output as one block."""
+    data, sample_rate = sf.read(str(test_audio_file))
+    effect = StormtrooperEffect()
+    
+    _seed()
+    stream = effect.stream(sample_rate)
+    whole = np.concatenate([stream.process_block(data), stream.flush()])
+    
+    _seed()
+    stream = effect.stream(sample_rate, block_size=512)
+    blocks = np.concatenate(list(stream.process(np.array_split(data, 37))))
+    
+    assert whole.shape == blocks.shape
+    np.testing.assert_allclose(blocks, whole, atol=1e-9)
+
+def test_stream_output_is_bounded(test_audio_file: Path) -> None:
+    """Streaming output stays within full scale without global normalization."""
+    data, sample_rate = sf.read(str(test_audio_file))
+    stream = StormtrooperEffect(EffectParams(sample_rate=sample_rate)).stream()
+    
+    out = np.concatenate(list(stream.process([data])))
+    
+    assert np.max(np.abs(out)) <= 1.0
+    assert len(out) > len(data)
+
+def test_process_batch_matches_single_clip_processing() -> None:
+    """Batched clips match clips processed one at a time, away from the edges."""
+    sample_rate = 16000
+    rng = np.random.default_rng(7)
+    clips = [rng.standard_normal(length) for length in (8000, 9000, 16000, 4000)]
+    effect = StormtrooperEffect()
+    
+    _seed()
+    batched = effect.process_batch(clips, sample_rate=sample_rate)
+    
+    _seed()
+    effect.sample_rate = sample_rate
+    single = [effect._process_audio(clip) for clip in clips]
+    
+    click = int(effect.params.click_duration * sample_rate)
+    for clip, got, want in zip(clips, batched, single):
+        # Static length is random, compare the voice region only
+        assert len(got) > len(clip) + 2 * click
+        region = slice(click + 800, click + len(clip) - 800)
+        np.testing.assert_allclose(got[region], want[region], atol=2e-3)
+
+def test_process_files_isolates_failures(tmp_path: Path, test_audio_file: Path) -> None:
+    """A missing input does not stop the other files from being processed."""
+    missing = tmp_path / "missing.wav"
+    outputs = [tmp_path / "a.wav", tmp_path / "b.wav"]
+    
+    results = StormtrooperEffect().process_files([test_audio_file, missing], outputs)
+    
+    assert results == [str(outputs[0]), None]
+    assert outputs[0].exists()
+
+def test_process_files_retries_failed_batch_per_file(tmp_path: Path, test_audio_file: Path) -> None:
+    """A file that breaks its batch fails alone, the rest of the group is saved."""
+    outputs = [tmp_path / "a.wav", tmp_path / "b.wav", tmp_path / "c.wav"]
+    
+    results = StormtrooperEffect().process_files([test_audio_file] * 3, outputs, urgency=['low', 'bogus', 'high'])
+    
+    assert results == [str(outputs[0]), None, str(outputs[2])]
+    assert outputs[0].exists() and outputs[2].exists()
+
+def test_float32_policy_matches_float64_within_tolerance(test_audio_file: Path) -> None:
+    """The float32 pipeline stays within 1e-3 of the float64 reference.
+    
+    Output is normalized to full scale, so 1e-3 is about -60 dBFS, well below
+    the 16-bit output's audible error and the radio static added on top.
+    """
+    data, sample_rate = sf.read(str(test_audio_file))
+    
+    outputs = {}
+    for dtype in ("float64", "float32"):
+        effect = StormtrooperEffect(EffectParams(dtype=dtype))
+        effect.sample_rate = sample_rate
+        _seed()
+        outputs[dtype] = effect._process_audio(data)
+        
+    assert outputs["float32"].dtype == np.float32
+    assert outputs["float64"].dtype == np.float64
+    np.testing.assert_allclose(outputs["float32"], outputs["float64"], atol=1e-3)
+
+def test_float32_policy_applies_to_stream_and_files(tmp_path: Path, test_audio_file: Path) -> None:
+    """Streaming and batched paths keep the configured dtype end to end."""
+    effect = StormtrooperEffect()
+    data, sample_rate = sf.read(str(test_audio_file), dtype="float32")
+    
+    blocks = list(effect.stream(sample_rate).process([data]))
+    batched = effect.process_batch([data, data[:30000]], sample_rate=sample_rate)
+    
+    assert all(block.dtype == np.float32 for block in blocks)
+    assert all(clip.dtype == np.float32 for clip in batched)
+
+def test_fft_engine_is_spectrally_equivalent_to_iir() -> None:
+    """The fused FFT EQ matches the IIR chain's spectrum within 1.5 dB.
+    
+    The FFT engine is zero-phase while the resonators in the IIR chain are
+    not, so only magnitude spectra are compared, over the bins within 40 dB
+    of the spectral peak.
+    """
+    sample_rate = 44100
+    noise = np.random.default_rng(3).standard_normal(4 * sample_rate)
+    spectra = {}
+    for engine in ("iir", "fft"):
+        effect = StormtrooperEffect(EffectParams(engine=engine))
+        effect.sample_rate = sample_rate
+        eq = effect._apply_voice_eq(noise.astype(effect.dtype))
+        _, spectra[engine] = signal.welch(eq, sample_rate, nperseg=4096)
+        
+    significant = spectra["iir"] > spectra["iir"].max() * 1e-4
+    diff_db = 10 * np.log10(spectra["fft"][significant] / spectra["iir"][significant])
+    assert np.max(np.abs(diff_db)) < 1.5
+
+def test_fft_engine_processes_files_and_batches(test_audio_file: Path) -> None:
+    """The FFT engine works through the whole-clip and batched paths."""
+    data, sample_rate = sf.read(str(test_audio_file), dtype="float32")
+    effect = StormtrooperEffect(EffectParams(engine="fft"))
+    
+    batched = effect.process_batch([data, data[:20000]], sample_rate=sample_rate)
+    
+    assert [len(clip) > n for clip, n in zip(batched, (len(data), 20000))] == [True, True]
+    assert all(np.max(np.abs(clip)) <= 1.0 for clip in batched)
+
+def test_process_pcm_matches_process_array(test_audio_file: Path) -> None:
+    """PCM bytes in and out give the same audio as the array path."""
+    data, sample_rate = sf.read(str(test_audio_file), dtype='int16')
+    effect = StormtrooperEffect()
+    
+    _seed()
+    pcm = effect.process_pcm(data.tobytes(), sample_rate)
+    _seed()
+    expected = effect.process_array(data.astype(np.float32) / 32768.0, sample_rate)
+    
+    assert isinstance(pcm, bytes)
+    out = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+    assert out.shape == expected.shape
+    np.testing.assert_allclose(out, expected, atol=2 / 32768)
+
+def test_native_rate_processing_upsamples_once() -> None:
+    """Voice stages run at the source rate and the output comes out at output_rate."""
+    rng = np.random.default_rng(11)
+    clip = rng.standard_normal(16000).astype(np.float32) * 0.2
+    effect = StormtrooperEffect(EffectParams(output_rate=44100))
+    
+    out = effect.process_array(clip, 16000, seed=1)
+    
+    bank = effect.effect_bank(44100)
+    voice = -(-len(clip) * 44100 // 16000)
+    click = len(bank.clicks["medium"][0])
+    assert effect.output_rate(16000) == 44100
+    assert len(out) - 2 * click - voice in {len(static) for static in bank.statics["medium"]}
+    # The upsampled rate is carried by the call, not left on the effect
+    assert effect.sample_rate == EffectParams().sample_rate
+    
+    # Streaming gives the same voice length at the output rate
+    stream = effect.stream(16000, seed=1)
+    streamed = np.concatenate(list(stream.process(np.array_split(clip, 9))))
+    assert len(streamed) - 2 * click - voice in {len(static) for static in bank.statics["medium"]}
+
+def test_stream_makeup_gain_does_not_hard_clip() -> None:
+    """Positive output gain is limited softly rather than flattening peaks."""
+    sample_rate = 16000
+    t = np.arange(sample_rate) / sample_rate
+    tone = np.sin(2 * np.pi * 1000 * t)
+    stream = StormtrooperEffect(EffectParams(output_gain_db=12.0)).stream(sample_rate)
+    
+    out = stream.process_block(tone)
+    
+    assert np.max(np.abs(out)) < 1.0
+    assert np.max(np.abs(out)) > 0.5
@@ -0,0 +1,44 @@
+"""Tests for the filter coefficient cache."""
+
+from pathlib import Path
+
+from src.audio.filter_cache import FilterCache
+from src.audio import StormtrooperEffect
+
+def test_repeated_designs_hit_cache() -> None:
+    """The same design is computed once and then served from the cache."""
+    cache = FilterCache()
+    
+    first = cache.bandpass(6, 500.0, 2500.0, 44100)
+    second = cache.bandpass(6, 500.0, 2500.0, 44100)
+    cache.bandpass(6, 500.0, 2500.0, 16000)
+    
+    assert first is second
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 2}
+
+def test_close_parameters_get_distinct_designs() -> None:
+    """Parameters that agree to six significant digits are still separate keys."""
+    cache = FilterCache()
+    
+    first = cache.peak(1000.0, 5.0, 44100)
+    second = cache.peak(1000.0004, 5.0, 44100)
+    
+    assert first is not second
+    assert cache.stats()["entries"] == 2
+
+def test_cache_persists_to_disk(tmp_path: Path, test_audio_file: Path) -> None:
+    """A new cache loaded from disk skips filter design entirely."""
+    # Save the effect bank first, so both runs load it rather than render it
+    StormtrooperEffect(filter_cache=FilterCache()).process_file(test_audio_file, tmp_path / "out.wav")
+    
+    path = tmp_path / "filters.npz"
+    cache = FilterCache(path)
+    StormtrooperEffect(filter_cache=cache).process_file(test_audio_file, tmp_path / "out.wav")
+    designed = cache.stats()["misses"]
+    
+    cold = FilterCache(path)
+    StormtrooperEffect(filter_cache=cold).process_file(test_audio_file, tmp_path / "out.wav")
+    
+    assert designed > 0
+    assert cold.stats()["misses"] == 0
+    assert cold.stats()["hits"] >= designed
@@ -0,0 +1,170 @@
+"""Tests for the callback mixer."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.audio.mixer import Mixer, Voice
+from src.audio.utils import map_wav
+
+def _add(mixer: Mixer, data: np.ndarray, **kwargs) -> Voice:
+    """Add a voice without opening an output stream."""
+    voice = Voice(np.asarray(data, dtype=mixer.dtype), **kwargs)
+    mixer._voices.append(voice)
+    return voice
+
+def test_mix_sums_voices_with_gain() -> None:
+    """Voices are summed with their own gain and dropped when finished."""
+    mixer = Mixer(16000, block_size=4)
+    speech = _add(mixer, np.full(6, 0.5), gain=0.5, name="speech")
+    click = _add(mixer, np.full(2, 0.2), name="click")
+    
+    first = mixer.mix(4).copy()
+    second = mixer.mix(4).copy()
+    
+    np.testing.assert_allclose(first, [0.45, 0.45, 0.25, 0.25])
+    np.testing.assert_allclose(second, [0.25, 0.25, 0.0, 0.0])
+    assert click.done and speech.done
+    assert mixer.voices == []
+
+def test_mix_loops_clips_and_clips_output() -> None:
+    """Looping voices wrap around until stopped, and the sum is clipped."""
+    mixer = Mixer(16000, block_size=5)
+    ambient = _add(mixer, [0.1, 0.2], loop=True, name="ambient")
+    _add(mixer, np.ones(5), gain=2.0)
+    
+    np.testing.assert_allclose(mixer.mix(5), [1.0] * 5)
+    np.testing.assert_allclose(mixer.mix(5), [0.2, 0.1, 0.2, 0.1, 0.2])
+    
+    mixer.stop_all("ambient")
+    np.testing.assert_allclose(mixer.mix(5), 0.0)
+    assert ambient.wait(0)
+
+def test_enqueue_chains_clips_sample_exactly() -> None:
+    """Queued clips start on the sample after the previous one ends."""
+    mixer = Mixer(16000, block_size=4)
+    mixer.start = lambda: None  # Mix by hand, no output stream
+    first = mixer.enqueue(np.full(3, 0.1), name="speech")
+    second = mixer.enqueue(np.full(2, 0.2), name="speech")
+    third = mixer.enqueue(np.full(3, 0.3), name="speech")
+    
+    out = np.concatenate([mixer.mix(4).copy() for _ in range(3)])
+    
+    np.testing.assert_allclose(out, [0.1, 0.1, 0.1, 0.2, 0.2, 0.3, 0.3, 0.3, 0, 0, 0, 0])
+    assert first.done and second.done and third.done
+    assert third.elapsed == 3 / 16000
+
+def test_cancel_skips_to_queued_clip() -> None:
+    """Cancelling a playing clip starts the next queued one in its place."""
+    mixer = Mixer(16000, block_size=2)
+    mixer.start = lambda: None
+    first = mixer.enqueue(np.full(10, 0.1), name="speech")
+    second = mixer.enqueue(np.full(2, 0.5), name="speech")
+    
+    mixer.mix(2)
+    first.cancel()
+    
+    np.testing.assert_allclose(mixer.mix(2), [0.5, 0.5])
+    assert first.position == 2 and first.done
+    assert second.done
+
+def test_voice_is_done_once_output_latency_has_passed() -> None:
+    """A mixed-out voice only reports done after its last sample has played."""
+    mixer = Mixer(16000, block_size=4)
+    mixer.latency_frames = 6
+    voice = _add(mixer, np.full(4, 0.1))
+    
+    mixer.mix(4)
+    assert voice.ended and not voice.done and mixer.voices == []
+    mixer.mix(4)
+    mixer.mix(4)
+    assert not voice.done
+    mixer.mix(4)
+    assert voice.done
+
+def test_failed_stream_start_removes_voice() -> None:
+    """A voice is not left in the mix when the output stream cannot start."""
+    mixer = Mixer(16000, block_size=4)
+    
+    def fail() -> None:
+        raise RuntimeError("no device")
+    mixer.start = fail
+    
+    with pytest.raises(RuntimeError):
+        mixer.play(np.ones(4))
+    with pytest.raises(RuntimeError):
+        mixer.enqueue(np.ones(4), name="speech")
+    assert mixer.voices == []
+
+def test_int16_stream_plays_memory_mapped_wav(tmp_path: Path) -> None:
+    """A PCM_16 WAV is mapped without decoding and mixed into an int16 stream with gain."""
+    path = tmp_path / "clip.wav"
+    samples = (np.arange(-3000, 3000, 100)).astype(np.int16)
+    sf.write(path, samples, 16000, subtype='PCM_16')
+    sf.write(tmp_path / "float.wav", samples / 32768, 16000, subtype='FLOAT')
+    
+    mapped, rate = map_wav(path)
+    assert isinstance(mapped, np.memmap) and rate == 16000
+    np.testing.assert_array_equal(mapped, samples)
+    assert map_wav(tmp_path / "float.wav") is None
+    
+    # Empty and truncated files fall back to decoding instead of raising
+    (tmp_path / "empty.wav").write_bytes(b"")
+    (tmp_path / "short.wav").write_bytes(path.read_bytes()[:10])
+    assert map_wav(tmp_path / "empty.wav") is None
+    assert map_wav(tmp_path / "short.wav") is None
+    
+    mixer = Mixer(16000, block_size=len(samples), dtype=np.int16)
+    mixer.start = lambda: None
+    voice = mixer.play(mapped, gain=0.5)
+    assert np.shares_memory(voice.data, mapped)
+    
+    outdata = np.zeros((len(samples), 1), dtype=np.int16)
+    mixer._callback(outdata, len(samples), None, None)
+    np.testing.assert_allclose(outdata[:, 0], samples * 0.5 * 32767 / 32768, atol=1)
+
+def test_gain_ramps_and_ducking_apply_per_sample() -> None:
+    """Gain changes ramp linearly, and background voices duck while speech plays."""
+    mixer = Mixer(1000, block_size=4)
+    mixer.start = lambda: None
+    mixer.set_ducking({"ambient": 0.5}, ramp=0.004)
+    ambient = mixer.play(np.ones(100), name="ambient", loop=True)
+    
+    ambient.set_gain(0.5, ramp=0.004)
+    np.testing.assert_allclose(mixer.mix(4), [0.875, 0.75, 0.625, 0.5])
+    assert ambient.level == 0.5
+    
+    speech = mixer.play(np.zeros(6), name="speech")
+    np.testing.assert_allclose(mixer.mix(4), 0.5 * np.array([0.75, 0.5, 0.5, 0.5]))
+    mixer.mix(4)
+    assert speech.done
+    # Released once speech has finished
+    np.testing.assert_allclose(mixer.mix(4), 0.5 * np.array([0.75, 1.0, 1.0, 1.0]))
+
+def test_crossfade_fades_out_preempted_voice() -> None:
+    """A preempting clip fades in while the old one fades out and stops, dropping its queue."""
+    mixer = Mixer(1000, block_size=4)
+    mixer.start = lambda: None
+    old = mixer.enqueue(np.full(20, 0.4), name="speech")
+    queued = mixer.enqueue(np.full(20, 0.4), name="speech")
+    new = mixer.play(np.full(20, 0.8), name="speech", crossfade=0.004)
+    
+    np.testing.assert_allclose(mixer.mix(4), [0.5, 0.6, 0.7, 0.8])
+    assert old.done and queued.done and not new.done
+    np.testing.assert_allclose(mixer.mix(4), 0.8)
+
+def test_enqueue_skips_fading_and_looping_queues() -> None:
+    """Queued clips join the newest playing queue, never a fading or looping one."""
+    mixer = Mixer(1000, block_size=4)
+    mixer.start = lambda: None
+    ambient = mixer.play(np.full(8, 0.1), name="ambient", loop=True)
+    after_loop = mixer.enqueue(np.full(4, 0.2), name="ambient")
+    old = mixer.enqueue(np.full(20, 0.4), name="speech")
+    new = mixer.play(np.full(20, 0.8), name="speech", crossfade=0.004)
+    queued = mixer.enqueue(np.full(4, 0.5), name="speech")
+    
+    assert ambient.next is None and after_loop in mixer.voices
+    assert old.next is None
+    assert new.next is queued
@@ -0,0 +1,71 @@
+"""Tests for seeded effects and the processed audio cache."""
+
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from src.audio import StormtrooperEffect, EffectParams, OutputCache, ChainReport, effect_seed
+from src.quotes import URGENCY_EFFECTS
+from src.audio.disk_cache import DiskCache
+
+def test_seeded_renders_are_deterministic(test_audio_file: Path) -> None:
+    """The same seed gives identical output, and the seed derives from text and urgency."""
+    data, sample_rate = sf.read(str(test_audio_file), dtype='float32')
+    effect = StormtrooperEffect()
+    seed = effect_seed("Move along.", "high")
+    
+    first = effect.process_array(data, sample_rate, urgency="high", seed=seed)
+    second = effect.process_array(data, sample_rate, urgency="high", seed=seed)
+    
+    np.testing.assert_array_equal(first, second)
+    assert seed == effect_seed("Move along.", "high")
+    assert seed != effect_seed("Move along.", "low")
+    assert seed != effect_seed("Halt!", "high")
+
+def test_output_cache_serves_repeat_renders(tmp_path: Path, test_audio_file: Path) -> None:
+    """A repeat seeded render is read from the cache instead of processed."""
+    data, sample_rate = sf.read(str(test_audio_file), dtype='float32')
+    cache = OutputCache(tmp_path)
+    effect = StormtrooperEffect(output_cache=cache)
+    
+    first = effect.process_array(data, sample_rate, seed=7)
+    report = ChainReport()
+    second = effect.process_array(data, sample_rate, seed=7, report=report)
+    
+    np.testing.assert_array_equal(first, second)
+    assert cache.stats()["hits"] == 1
+    assert report.stages == []
+    
+    # Other seeds and unseeded renders are not served from the cache
+    effect.process_array(data, sample_rate, seed=8)
+    effect.process_array(data, sample_rate)
+    assert cache.stats()["hits"] == 1
+    assert len(cache) == 2
+
+def test_output_cache_key_covers_urgency_levels_and_bank(monkeypatch, test_audio_file: Path) -> None:
+    """Changing URGENCY_EFFECTS or the effect bank contents changes the key."""
+    data, _ = sf.read(str(test_audio_file), dtype='float32')
+    params = EffectParams()
+    key = OutputCache.key(data, 44100, params, "high", 7, ["radio_effects"], "bank-a")
+    
+    assert OutputCache.key(data, 44100, params, "high", 7, ["radio_effects"], "bank-b") != key
+    monkeypatch.setitem(URGENCY_EFFECTS["low"], "click_volume", 0.5)
+    assert OutputCache.key(data, 44100, params, "high", 7, ["radio_effects"], "bank-a") != key
+
+def test_disk_cache_evicts_least_recently_used_by_bytes(tmp_path: Path) -> None:
+    """Entries are evicted oldest-use first once the byte budget is exceeded."""
+    cache = DiskCache(tmp_path, max_bytes=250)
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    assert cache.get("a") == b"a" * 100
+    
+    cache.put("c", b"c" * 100)
+    
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.total_bytes == 200
+    assert not cache.put("d", b"d" * 300)
+    
+    # A new instance indexes the entries left on disk
+    assert len(DiskCache(tmp_path, max_bytes=250)) == 2
@@ -0,0 +1,39 @@
+"""Tests for the audio player."""
+
+import numpy as np
+
+from src.audio import AudioPlayer
+from src.audio.device import AudioDevice
+from src.audio.mixer import Voice
+
+def test_wait_gives_up_on_stalled_playback(fake_sounddevice) -> None:
+    """A voice that never finishes times out after its length plus the margin and is stopped."""
+    player = AudioPlayer()
+    player.WAIT_MARGIN = 0.05
+    voice = Voice(np.zeros(160, dtype=np.float32), sample_rate=16000)
+    
+    assert not player.wait(voice)
+    assert voice.done
+
+def test_reprobe_replaces_other_players_mixers(fake_sounddevice) -> None:
+    """A re-probe by one player makes every player on the device open a new mixer."""
+    device = AudioDevice()
+    first, second = AudioPlayer(device=device), AudioPlayer(device=device)
+    mixer = second._get_mixer()
+    
+    device.reprobe()
+    assert second._get_mixer() is not mixer
+    assert first._get_mixer() is first._get_mixer()
+
+def test_volume_change_keeps_fade_out(fake_sounddevice) -> None:
+    """Changing the volume while a looping voice fades out does not revive it."""
+    player = AudioPlayer()
+    voice = player.play(np.full(1600, 0.1, dtype=np.float32), 16000, name="ambient", loop=True)
+    assert voice is not None
+    
+    player.stop("ambient", fade=0.05)
+    player.set_volume(9)
+    # 0.1s of output, twice the fade
+    player.mixer._stream.pump(9)
+    assert voice.done
+    player.close()
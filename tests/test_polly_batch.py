@@ -0,0 +1,51 @@
+"""Tests for concurrent batch synthesis."""
+
+from pathlib import Path
+
+from src.audio.polly import PollyClient
+from src.audio.polly_batch import SynthesisRequest, TokenBucket, backoff_delay
+from src.audio.polly_cache import PollyCache
+
+def _requests(count: int) -> list:
+    return [SynthesisRequest(f"Line {i} move along", output_path=Path(f"{i}.wav")) for i in range(count)]
+
+def test_batch_completes_under_throttling_in_order(tmp_path: Path, local_polly) -> None:
+    """Throttled requests are retried and every result comes back in input order."""
+    backend = local_polly(latency=0.01, max_rate=20)
+    polly = PollyClient(cache=PollyCache(tmp_path), client=backend, max_pool_connections=8)
+    requests = _requests(30)
+    seen = []
+    
+    results = polly.synthesize_many(requests, max_workers=8, rate=40, on_result=seen.append)
+    
+    assert all(result.ok for result in results)
+    assert [result.request for result in results] == requests
+    assert len(seen) == len(requests)
+    assert backend.throttles > 0
+    assert backend.calls == len(requests) + backend.throttles
+    assert 1 < backend.peak_concurrency <= 8
+
+def test_rerun_is_served_from_cache(tmp_path: Path, local_polly) -> None:
+    """A second run over the same lines makes no requests."""
+    backend = local_polly(latency=0.0)
+    polly = PollyClient(cache=PollyCache(tmp_path), client=backend)
+    requests = _requests(5)
+    
+    first = polly.synthesize_many(requests[:3])
+    calls = backend.calls
+    second = polly.synthesize_many(requests)
+    
+    assert not any(result.cached for result in first)
+    assert [result.cached for result in second] == [True, True, True, False, False]
+    assert backend.calls == calls + 2
+    assert second[0].audio == first[0].audio
+
+def test_rate_limiter_adapts() -> None:
+    """Throttling halves the rate, success recovers it, and backoff stays in bounds."""
+    bucket = TokenBucket(rate=8)
+    bucket.throttled()
+    assert bucket.rate == 4
+    for _ in range(10):
+        bucket.succeeded()
+    assert bucket.rate == 8
+    assert all(0 <= backoff_delay(attempt, base=0.1, cap=1.0) <= 1.0 for attempt in range(10))
@@ -0,0 +1,38 @@
+"""Tests for the Polly response cache."""
+
+from pathlib import Path
+
+from src.audio.polly import PollyClient
+from src.audio.polly_cache import PollyCache
+from src.aws import ClientRegistry
+
+def test_repeat_phrases_come_from_cache(tmp_path: Path, fake_boto) -> None:
+    """Identical requests are synthesized once; voice changes are separate entries."""
+    cache = PollyCache(tmp_path)
+    client = PollyClient(cache=cache, registry=ClientRegistry())
+    
+    first = client.generate_speech("Stop right there!", urgency="high")
+    second = client.generate_speech("Stop right there!", urgency="high")
+    assert first == second
+    assert len(client.polly.requests) == 1
+    
+    client.set_voice("Stephen")
+    client.generate_speech("Stop right there!", urgency="high")
+    assert len(client.polly.requests) == 2
+    
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["bytes_saved"] == len(first) and stats["entries"] == 2
+    
+    # The cache survives a restart
+    assert len(PollyCache(tmp_path)) == 2
+
+def test_speech_stream_yields_whole_samples_and_caches(tmp_path: Path, fake_boto) -> None:
+    """Streamed chunks split on sample boundaries, and a fully read stream is cached."""
+    client = PollyClient(cache=PollyCache(tmp_path), registry=ClientRegistry())
+    
+    chunks = list(client.generate_speech_stream("Move along.", chunk_size=333))
+    assert len(chunks) > 1
+    assert all(len(chunk) % 2 == 0 for chunk in chunks)
+    assert b"".join(chunks) == client.generate_speech("Move along.")
+    assert len(client.polly.requests) == 1
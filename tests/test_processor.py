@@ -0,0 +1,37 @@
+"""Tests for the text-to-speech processing pipeline."""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.audio.mixer import Voice
+from src.audio.processor import process_and_play_text
+from src.audio.tts import LocalTTSBackend
+
+class _Player:
+    """Queues a stopped voice for the first block only, and records waits."""
+    
+    def __init__(self) -> None:
+        self.device = SimpleNamespace(sample_rate=44100)
+        self.queued = []
+        self.waited = []
+    
+    def enqueue(self, data, sample_rate=None, volume=None, **kwargs):
+        self.queued.append(volume)
+        if len(self.queued) > 1:
+            return None
+        voice = Voice(np.zeros(10))
+        voice.stop()
+        return voice
+    
+    def wait(self, voice, duration=None) -> bool:
+        self.waited.append(voice)
+        return True
+
+def test_streaming_waits_on_last_queued_block() -> None:
+    """Blocks that fail to queue do not drop the wait, and the volume applies per call."""
+    player = _Player()
+    
+    assert process_and_play_text("Move along.", polly=LocalTTSBackend(), player=player, stream=True, volume=8) is None
+    assert len(player.queued) > 1 and set(player.queued) == {8}
+    assert len(player.waited) == 1 and player.waited[0] is not None
@@ -0,0 +1,67 @@
+"""Tests for the pipelined real-time TTS."""
+
+import asyncio
+import time
+from pathlib import Path
+
+from src.audio.output_cache import OutputCache
+from src.audio.realtime import RealtimeStormtrooperTTS
+from src.audio.scheduler import RequestState
+from src.audio.tts import LocalTTSBackend
+from src.quotes import UrgencyLevel
+
+def test_pipeline_plays_lines_without_blocking_the_loop(tmp_path: Path, fake_player) -> None:
+    """Blocking synthesis stays off the event loop and every stage is measured."""
+    player = fake_player(finish=True)
+    tts = RealtimeStormtrooperTTS(backend=LocalTTSBackend(latency=0.1), player=player,
+                                  output_cache=OutputCache(tmp_path))
+    
+    async def run() -> float:
+        longest_gap = 0.0
+        
+        async def tick() -> None:
+            nonlocal longest_gap
+            last = time.monotonic()
+            while True:
+                await asyncio.sleep(0.005)
+                now = time.monotonic()
+                longest_gap = max(longest_gap, now - last)
+                last = now
+        
+        ticker = asyncio.create_task(tick())
+        requests = await asyncio.gather(*(tts.speak(f"Move along number {i}.") for i in range(3)))
+        ticker.cancel()
+        assert all(request is not None and request.state == RequestState.FINISHED for request in requests)
+        return longest_gap
+    
+    try:
+        assert asyncio.run(run()) < 0.05
+        assert all(rate == 44100 for _, rate in player.played) and len(player.played) == 3
+        
+        metrics = tts.metrics()
+        assert metrics["played"] == 3 and metrics["failed"] == 0
+        for stage in ("synthesize", "effect", "play"):
+            assert metrics[f"{stage}_count"] == 3
+        assert metrics["synthesize_mean_ms"] >= 100
+        # Later lines waited behind the first at the synthesis stage
+        assert metrics["synthesize_queue_mean_ms"] > 50
+        assert metrics["first_audio_max_ms"] >= 300
+    finally:
+        tts.close()
+
+def test_urgent_line_overtakes_queued_lines(tmp_path: Path, fake_player) -> None:
+    """A HIGH line waiting for synthesis goes ahead of routine lines queued before it."""
+    tts = RealtimeStormtrooperTTS(backend=LocalTTSBackend(latency=0.05), player=fake_player(finish=True),
+                                  queue_size=4, output_cache=OutputCache(tmp_path))
+    
+    async def run() -> list:
+        low = [asyncio.create_task(tts.speak(f"Routine check {i}.", UrgencyLevel.LOW)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        high = asyncio.create_task(tts.speak("Halt!", UrgencyLevel.HIGH))
+        return await asyncio.gather(*low, high)
+    
+    try:
+        first, second, third, high = asyncio.run(run())
+        assert first.started < high.started < second.started < third.started
+    finally:
+        tts.close()
@@ -0,0 +1,54 @@
+"""Tests for parallel asset rendering."""
+
+import shutil
+from pathlib import Path
+
+from src.audio import StormtrooperEffect
+from src.audio.filter_cache import FilterCache
+from src.audio.render import RenderJob, render_files, _render_chunk, _render_counted
+
+class _BadFileEffect(StormtrooperEffect):
+    """Effect whose process_files raises whenever a file named bad is included."""
+
+    def process_files(self, input_paths, *args, **kwargs):
+        if any(Path(path).stem == "bad" for path in input_paths):
+            raise RuntimeError("bad file")
+        return super().process_files(input_paths, *args, **kwargs)
+
+def test_parallel_render_keeps_order_and_isolates_failures(tmp_path: Path, test_audio_file: Path) -> None:
+    """Results come back in input order and a bad file does not stop the rest."""
+    inputs = []
+    for i in range(5):
+        path = tmp_path / f"clip_{i}.wav"
+        shutil.copy(test_audio_file, path)
+        inputs.append(path)
+    inputs.insert(2, tmp_path / "missing.wav")
+    jobs = [RenderJob(path, tmp_path / f"{path.stem}_out.wav", "high") for path in inputs]
+    
+    results = render_files(jobs, n_jobs=2, chunk_size=2)
+    
+    assert [result.job for result in results] == jobs
+    assert [result.ok for result in results] == [True, True, False, True, True, True]
+    assert all(result.audio_seconds > 1.0 for result in results if result.ok)
+    assert not list(tmp_path.glob(".*.tmp*"))
+
+def test_failed_chunk_is_retried_job_by_job(tmp_path: Path, test_audio_file: Path) -> None:
+    """An exception from the batched run only fails the job that caused it."""
+    inputs = [test_audio_file, tmp_path / "bad.wav", test_audio_file]
+    jobs = [RenderJob(path, tmp_path / f"out_{i}.wav") for i, path in enumerate(inputs)]
+    
+    results = _render_chunk(jobs, _BadFileEffect())
+    
+    assert [result.job for result in results] == jobs
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[1].error == "bad file"
+
+def test_chunks_count_their_filter_cache_lookups(tmp_path: Path, test_audio_file: Path) -> None:
+    """Each chunk reports the lookups it made, so worker caches can be added up."""
+    effect = StormtrooperEffect(filter_cache=FilterCache())
+    
+    _, first = _render_counted([RenderJob(test_audio_file, tmp_path / "a.wav")], effect)
+    _, second = _render_counted([RenderJob(test_audio_file, tmp_path / "b.wav")], effect)
+    
+    assert first["misses"] > 0
+    assert second["misses"] == 0 and second["hits"] > 0
@@ -0,0 +1,39 @@
+"""Tests for polyphase resampling."""
+
+import numpy as np
+import pytest
+
+from src.audio.resample import StreamingResampler, rate_ratio, resample
+
+def test_rate_ratio_reduces_common_pairs() -> None:
+    """Common conversions reduce to small rational factors."""
+    assert rate_ratio(16000, 44100) == (441, 160)
+    assert rate_ratio(44100, 48000) == (160, 147)
+    with pytest.raises(ValueError):
+        rate_ratio(0, 44100)
+
+@pytest.mark.parametrize("src_rate,dst_rate", [(16000, 44100), (44100, 48000), (48000, 16000)])
+def test_streaming_matches_whole_clip(src_rate: int, dst_rate: int) -> None:
+    """Chunked resampling gives the same samples as resampling the whole clip."""
+    clip = np.random.default_rng(5).standard_normal(src_rate // 3 + 7).astype(np.float32)
+    whole = resample(clip, src_rate, dst_rate)
+    
+    resampler = StreamingResampler(src_rate, dst_rate)
+    chunks = [resampler.process(chunk) for chunk in np.array_split(clip, 23)]
+    streamed = np.concatenate(chunks + [resampler.flush()])
+    
+    assert whole.dtype == np.float32
+    assert len(whole) == -(-len(clip) * dst_rate // src_rate)
+    np.testing.assert_allclose(streamed, whole, atol=1e-5)
+
+def test_resample_preserves_tone_without_edge_ringing() -> None:
+    """A tone keeps its frequency and the clip edges stay quiet."""
+    t = np.arange(16000) / 16000
+    tone = (np.sin(2 * np.pi * 440 * t) * np.hanning(len(t))).astype(np.float32)
+    
+    out = resample(tone, 16000, 44100)
+    
+    spectrum = np.abs(np.fft.rfft(out))
+    assert abs(np.argmax(spectrum) * 44100 / len(out) - 440) < 2
+    assert np.max(np.abs(out[:100])) < 1e-3
+    assert np.max(np.abs(out[-100:])) < 1e-3
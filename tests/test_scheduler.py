@@ -0,0 +1,77 @@
+"""Tests for the urgency-aware speech scheduler."""
+
+import time
+from typing import Callable
+
+from src.audio.scheduler import RequestState, SpeechScheduler
+from src.quotes import UrgencyLevel
+
+def _until(condition: Callable[[], bool], timeout: float = 1.0) -> bool:
+    """Wait for the dispatch thread to reach a state."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.002)
+    return True
+
+def test_high_preempts_and_queue_follows_urgency(fake_player) -> None:
+    """HIGH cuts lower lines short, then queued lines play most urgent first."""
+    player = fake_player()
+    scheduler = SpeechScheduler(player, poll_interval=0.005)
+    try:
+        low = scheduler.submit("low.wav", UrgencyLevel.LOW)
+        assert _until(lambda: low.state == RequestState.PLAYING)
+        
+        medium = scheduler.submit("medium.wav", UrgencyLevel.MEDIUM)
+        high = scheduler.submit("high.wav", UrgencyLevel.HIGH)
+        assert _until(lambda: high.state == RequestState.PLAYING)
+        assert low.state == RequestState.PREEMPTED and player.crossfades[-1] > 0
+        assert medium.state == RequestState.QUEUED
+        
+        high.voice.stop()
+        assert _until(lambda: medium.state == RequestState.PLAYING)
+        assert high.state == RequestState.FINISHED
+        
+        metrics = scheduler.metrics()
+        assert metrics["preempted"] == 1 and metrics["played"] == 3
+        assert metrics["max_queue_depth"] == 2 and metrics["queue_depth"] == 0
+    finally:
+        scheduler.close()
+
+def test_stale_and_policy_drops(fake_player) -> None:
+    """Stale lines are dropped, and the drop policy discards equal-priority lines."""
+    player = fake_player()
+    scheduler = SpeechScheduler(player, equal_policy="drop", poll_interval=0.005,
+                                max_age={UrgencyLevel.LOW: 0.02})
+    try:
+        first = scheduler.submit("a.wav", UrgencyLevel.MEDIUM)
+        assert _until(lambda: first.state == RequestState.PLAYING)
+        second = scheduler.submit("b.wav", UrgencyLevel.MEDIUM)
+        stale = scheduler.submit("c.wav", UrgencyLevel.LOW)
+        assert second.done and second.state == RequestState.DROPPED
+        assert stale.wait(1.0) and stale.state == RequestState.DROPPED
+        assert first.state == RequestState.PLAYING
+        
+        metrics = scheduler.metrics()
+        assert metrics["dropped_policy"] == 1 and metrics["dropped_stale"] == 1
+    finally:
+        scheduler.close()
+
+def test_failed_preemption_keeps_current_line(fake_player) -> None:
+    """A line that cannot start leaves the one it would have preempted playing."""
+    player = fake_player()
+    scheduler = SpeechScheduler(player, poll_interval=0.005)
+    try:
+        low = scheduler.submit("low.wav", UrgencyLevel.LOW)
+        assert _until(lambda: low.state == RequestState.PLAYING)
+        
+        high = scheduler.submit("missing.wav", UrgencyLevel.HIGH)
+        assert high.wait(1.0) and high.state == RequestState.DROPPED
+        assert low.state == RequestState.PLAYING and scheduler.current is low
+        assert not low.voice.done
+        
+        metrics = scheduler.metrics()
+        assert metrics["failed"] == 1 and metrics["preempted"] == 0
+    finally:
+        scheduler.close()
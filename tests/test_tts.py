@@ -0,0 +1,67 @@
+"""Tests for the TTS backends."""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.audio.effects import StormtrooperEffect
+from src.audio.polly import PollyClient
+from src.audio.polly_batch import SynthesisRequest
+from src.audio.tts import LocalTTSBackend, TTSBackend, create_tts_backend
+
+def test_local_backend_is_deterministic_speech_like_pcm() -> None:
+    """Same line, same audio; chunks are whole samples that join to the full line."""
+    backend = LocalTTSBackend()
+    assert isinstance(backend, TTSBackend)
+    assert isinstance(PollyClient(use_cache=False), TTSBackend)
+    
+    pcm = backend.generate_speech("Move along. Move along.")
+    assert pcm == backend.generate_speech("Move along. Move along.")
+    assert pcm != backend.generate_speech("Move along. Move along.", urgency="high")
+    
+    chunks = list(backend.generate_speech_stream("Move along. Move along.", chunk_size=1001))
+    assert all(len(chunk) % 2 == 0 for chunk in chunks)
+    assert b"".join(chunks) == pcm
+    
+    audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    assert 1.0 < len(audio) / backend.sample_rate < 4.0
+    assert 0.4 < np.max(np.abs(audio)) <= 0.5
+    
+    # Voiced energy sits in the speech band
+    spectrum = np.abs(np.fft.rfft(audio)) ** 2
+    freqs = np.fft.rfftfreq(len(audio), 1 / backend.sample_rate)
+    assert spectrum[(freqs > 100) & (freqs < 3500)].sum() > 0.9 * spectrum.sum()
+    
+    # And runs through the effect chain
+    processed = StormtrooperEffect().process_array(audio, backend.sample_rate)
+    assert np.all(np.isfinite(processed))
+
+def test_local_backend_simulates_latency_and_speed() -> None:
+    """The first chunk waits for the latency, the rest arrive at the set speed."""
+    backend = LocalTTSBackend(latency=0.1, speed=10.0)
+    start = time.perf_counter()
+    chunks = backend.generate_speech_stream("Halt!", chunk_size=1600)
+    next(chunks)
+    first = time.perf_counter() - start
+    total_bytes = 1600 + sum(len(chunk) for chunk in chunks)
+    total = time.perf_counter() - start
+    
+    assert 0.1 <= first < 0.2
+    assert total >= 0.1 + total_bytes / 2 / backend.sample_rate / 10.0 - 0.01
+    
+    results = backend.synthesize_many([SynthesisRequest("Halt!"), SynthesisRequest("Stop!")], max_workers=2)
+    assert [result.request.text for result in results] == ["Halt!", "Stop!"]
+    assert all(result.ok for result in results)
+
+def test_backend_selected_by_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    """TROOPER_TTS_BACKEND picks the backend and its tuning variables apply."""
+    monkeypatch.setenv("TROOPER_TTS_BACKEND", "local")
+    monkeypatch.setenv("TROOPER_TTS_LATENCY", "0.25")
+    backend = create_tts_backend()
+    assert isinstance(backend, LocalTTSBackend)
+    assert backend.latency == 0.25 and backend.speed is None
+    
+    assert isinstance(create_tts_backend("polly"), PollyClient)
+    with pytest.raises(ValueError):
+        create_tts_backend("festival")